@@ -1,5 +1,6 @@
 import os
 import shutil
+import time
 import numpy as np
 import flopy
 from flopy.utils.util_array import Util2d, Util3d, Transient2d, Transient3d
@@ -138,6 +139,93 @@ def test_util2d():
     return
 
 
+def test_util2d_load_txt():
+    fname = os.path.join(out_dir, 'load_txt.dat')
+    ml = flopy.modflow.Modflow()
+    data = np.arange(-60, 60, dtype=np.float32).reshape(8, 15) * 1.5
+
+    # fixed format with rows that wrap and numbers that touch, followed
+    # by a line that is not part of the array
+    u2d = Util2d(ml, (8, 15), np.float32, data, "test")
+    with open(fname, 'w') as f:
+        f.write(u2d.array2string((8, 15), data,
+                                 python_format=[7, "{0:8.1f}"]))
+        f.write('next line\n')
+    with open(fname, 'r') as f:
+        a1 = Util2d.load_txt((8, 15), f, np.float32, "(7F8.1)")
+        assert f.readline() == 'next line\n'
+    assert np.array_equal(a1, data)
+
+    # free format with commas and a varying number of values per line
+    idata = np.arange(12, dtype=np.int32).reshape(3, 4)
+    with open(fname, 'w') as f:
+        f.write('0, 1, 2\n3 4 5 6 7\n8,9,10,11\nnext line\n')
+    with open(fname, 'r') as f:
+        a2 = Util2d.load_txt((3, 4), f, np.int32, "(FREE)")
+        assert f.readline() == 'next line\n'
+    assert np.array_equal(a2, idata)
+    assert a2.dtype == np.int32
+
+    # too few values and values that cannot be cast raise exceptions
+    for fmtin in ["(FREE)", "(10I3)"]:
+        with open(fname, 'w') as f:
+            f.write('  1  2  3\n')
+        try:
+            Util2d.load_txt((2, 2), fname, np.int32, fmtin)
+            raise AssertionError('short array not detected')
+        except Exception as e:
+            assert 'values found' in str(e)
+        with open(fname, 'w') as f:
+            f.write('  1  2  x  4\n')
+        try:
+            Util2d.load_txt((2, 2), fname, np.int32, fmtin)
+            raise AssertionError('invalid value not detected')
+        except Exception as e:
+            assert 'unable to cast' in str(e)
+    return
+
+
+def test_util2d_array2string():
+    # float values are written with one python format call per row
+    data = np.array([0., -0., 1., -1.5, 0.125, 2.5, 1e-4, 1e-5, 123456.5,
+                     999999.5, 9999995., 1.e30, -3.4e38, 1e-40, np.inf,
+                     np.nan, 1. / 3., -2. / 3., 12.34567, 1e7],
+                    dtype=np.float32).reshape(4, 5)
+    for fmt in ["{0:15.6E}", "{0:15.6G}", "{0:12.4e}", "{0:10.2g}",
+                "{0:10.3f}"]:
+        for npl in [1, 2, 5]:
+            s = ''
+            for i in range(4):
+                for j in range(5):
+                    s += fmt.format(data[i, j])
+                    if (j + 1) % npl == 0 and j != 0:
+                        s += '\n'
+                if 5 % npl != 0:
+                    s += '\n'
+            assert Util2d.array2string((4, 5), data,
+                                       python_format=[npl, fmt]) == s
+
+    idata = np.array([[0, -1, 12], [345, -6789, 2 ** 31 - 1]],
+                     dtype=np.int32)
+    s = Util2d.array2string((2, 3), idata, python_format=[2, "{0:5d}"])
+    assert s == '    0   -1\n   12\n  345-6789\n2147483647\n'
+    s = Util2d.array2string((2, 3), idata, fortran_format="(FREE)")
+    assert s == ''.join(['{0:10d}'.format(v) for v in idata[0]]) + '\n' + \
+        ''.join(['{0:10d}'.format(v) for v in idata[1]]) + '\n'
+    s = Util2d.array2string((3,), np.array([1., 2., 3.]),
+                            fortran_format="(2E10.3)")
+    assert s == ' 1.000E+00 2.000E+00\n 3.000E+00\n'
+
+    # a float value with an integer format is reported
+    try:
+        Util2d.array2string((1, 2), np.ones((1, 2)),
+                            python_format=[2, "{0:10d}"])
+        raise AssertionError('invalid format not detected')
+    except Exception as e:
+        assert 'error writing array value' in str(e)
+    return
+
+
 def stress_util2d(ml, nlay, nrow, ncol):
     dis = flopy.modflow.ModflowDis(ml, nlay=nlay, nrow=nrow, ncol=ncol)
     hk = np.ones((nlay, nrow, ncol))
@@ -248,6 +336,314 @@ def stress_util2d_for_joe_the_file_king(ml, nlay, nrow, ncol):
     assert np.array_equal(ml.lpf.hk.array, ml1.lpf.hk.array)
 
 
+def test_util2d_lazy():
+    ws = os.path.join(out_dir, 'lazy')
+    ml = flopy.modflow.Modflow('lazy', model_ws=ws)
+    nlay, nrow, ncol = 3, 10, 12
+    flopy.modflow.ModflowDis(ml, nlay, nrow, ncol)
+    flopy.modflow.ModflowBas(ml)
+    hk = np.random.random((nlay, nrow, ncol)).astype(np.float32)
+    flopy.modflow.ModflowLpf(ml, hk=hk, vka=hk * 0.1)
+    ml.write_input()
+
+    ml1 = flopy.modflow.Modflow.load('lazy.nam', model_ws=ws, check=False)
+    ml2 = flopy.modflow.Modflow.load('lazy.nam', model_ws=ws, check=False,
+                                     lazy=True)
+    assert isinstance(ml2.array_cache, flopy.utils.ArrayCache)
+    # the lpf arrays are only parsed when they are used
+    ncached = len(ml2.array_cache)
+    assert np.array_equal(ml1.lpf.hk.array, ml2.lpf.hk.array)
+    assert len(ml2.array_cache) == ncached + nlay
+    assert np.array_equal(ml1.lpf.vka.array, ml2.lpf.vka.array)
+
+    # arrays are parsed again after they are removed from the cache
+    hk = ml1.lpf.hk.array
+    ml2.array_cache.maxsize = hk[0].nbytes
+    assert np.array_equal(ml2.lpf.hk[0].array, hk[0])
+    assert np.array_equal(ml2.lpf.hk[1].array, hk[1])
+    assert len(ml2.array_cache) == 1
+    assert ml2.array_cache.nbytes == hk[0].nbytes
+    assert np.array_equal(ml2.lpf.hk[0].array, hk[0])
+
+    # unchanged arrays are written with the original text
+    ml2.lpf.hk[1][0, 0] = 5.0
+    ws2 = os.path.join(ws, 'lazy')
+    ml2.change_model_ws(ws2)
+    ml2.write_input()
+    txt1 = open(os.path.join(ws, 'lazy.lpf')).readlines()
+    txt2 = open(os.path.join(ws2, 'lazy.lpf')).readlines()
+    assert len(txt1) == len(txt2)
+    ndiff = len([l1 for l1, l2 in zip(txt1, txt2)
+                 if l1.split('#')[0] != l2.split('#')[0]])
+    # control record and first row of hk layer 2
+    assert ndiff == 2
+    ml3 = flopy.modflow.Modflow.load('lazy.nam', model_ws=ws2, check=False)
+    hk[1, 0, 0] = 5.0
+    assert np.array_equal(ml3.lpf.hk.array, hk)
+    assert np.array_equal(ml3.lpf.vka.array, ml1.lpf.vka.array)
+
+    # the text is read again from the file when it is not cached, so a
+    # lazily loaded model can be written to the files it was loaded from
+    ml4 = flopy.modflow.Modflow.load('lazy.nam', model_ws=ws2, check=False,
+                                     lazy=True)
+    ml4.array_cache.maxsize = 0
+    assert np.array_equal(ml4.lpf.hk.array, hk)
+    ml4.write_input()
+    assert open(os.path.join(ws2, 'lazy.lpf')).readlines() == txt2
+    assert np.array_equal(ml4.lpf.hk.array, hk)
+    assert np.array_equal(ml4.lpf.vka.array, ml1.lpf.vka.array)
+
+
+def test_util2d_array_cache():
+    ml = flopy.modflow.Modflow(model_ws=out_dir)
+    flopy.modflow.ModflowDis(ml, nlay=1, nrow=10, ncol=10)
+    arr = np.arange(100, dtype=np.float32).reshape(10, 10)
+    u2d = flopy.utils.Util2d(ml, arr.shape, np.float32, arr, 'test')
+    # .array is a copy that can be changed
+    a = u2d.array
+    assert a.flags.writeable
+    assert np.array_equal(a, arr)
+    a += 1
+    assert np.array_equal(u2d.array, arr)
+    # without a multiplier, the effective array is a read-only view of the
+    # value
+    a = u2d._get_effective_array()
+    assert not a.flags.writeable
+    assert np.may_share_memory(a, arr)
+    # changes of the value in place are seen with a multiplier
+    u2d.cnstnt = 2.0
+    arr[0, 0] = 5.0
+    assert u2d.array[0, 0] == 10.0
+    assert u2d._get_effective_array()[0, 0] == 10.0
+    assert u2d[0, 0] == 10.0
+
+    # the effective array of a constant is built once
+    u2d = flopy.utils.Util2d(ml, arr.shape, np.float32, 3.0, 'test')
+    a = u2d._get_effective_array()
+    assert u2d._get_effective_array() is a
+    assert not a.flags.writeable
+    assert u2d.array is not a
+    # changing the multiplier builds it again
+    u2d.cnstnt = 2.0
+    assert u2d._get_effective_array() is not a
+    assert np.all(u2d.array == 6.0)
+
+
+def test_write_input_binary():
+    ws = os.path.join(out_dir, 'binary')
+    ml = flopy.modflow.Modflow('binary', model_ws=ws)
+    nlay, nrow, ncol = 3, 10, 12
+    flopy.modflow.ModflowDis(ml, nlay, nrow, ncol, botm=[-1., -2., -3.])
+    flopy.modflow.ModflowBas(ml, ibound=np.ones((nlay, nrow, ncol),
+                                                dtype=np.int))
+    hk = np.random.random((nlay, nrow, ncol)).astype(np.float32)
+    flopy.modflow.ModflowLpf(ml, hk=hk, vka=0.1)
+    ml.write_input(array_format='binary')
+
+    # only the non-constant real arrays are written as binary files
+    fnames = sorted([f for f in os.listdir(ws) if f.endswith('.bin')])
+    assert fnames == ['hk_layer_1.bin', 'hk_layer_2.bin', 'hk_layer_3.bin']
+    lines = open(os.path.join(ws, 'binary.lpf')).readlines()
+    assert len([l for l in lines if '(BINARY)' in l]) == nlay
+
+    # unchanged arrays are not written again
+    mtimes = [os.path.getmtime(os.path.join(ws, f)) for f in fnames]
+    time.sleep(0.1)
+    ml.lpf.hk[1][0, 0] = 5.0
+    ml.write_input(array_format='binary')
+    changed = [f for f, t in zip(fnames, mtimes)
+               if os.path.getmtime(os.path.join(ws, f)) != t]
+    assert changed == ['hk_layer_2.bin']
+
+    ml2 = flopy.modflow.Modflow.load('binary.nam', model_ws=ws, check=False)
+    hk[1, 0, 0] = 5.0
+    assert np.array_equal(ml2.lpf.hk.array, hk)
+    assert np.array_equal(ml2.bas6.ibound.array, ml.bas6.ibound.array)
+
+
+def test_write_input_incremental():
+    ws = os.path.join(out_dir, 'incremental')
+    ml = flopy.modflow.Modflow('incremental', model_ws=ws,
+                               external_path='ref')
+    nlay, nrow, ncol = 2, 10, 12
+    flopy.modflow.ModflowDis(ml, nlay, nrow, ncol, nper=2)
+    flopy.modflow.ModflowBas(ml)
+    hk = np.random.random((nlay, nrow, ncol)).astype(np.float32)
+    flopy.modflow.ModflowLpf(ml, hk=hk)
+    flopy.modflow.ModflowWel(ml, stress_period_data={0: [[0, 1, 1, -1.],
+                                                         [1, 2, 2, -2.]]})
+    flopy.modflow.ModflowPcg(ml)
+    ml.write_input()
+    assert not any([p.dirty for p in ml.packagelist])
+
+    def get_mtimes():
+        mtimes = {}
+        for pth in [ws, os.path.join(ws, 'ref')]:
+            for f in os.listdir(pth):
+                if os.path.isfile(os.path.join(pth, f)):
+                    mtimes[f] = os.path.getmtime(os.path.join(pth, f))
+        return mtimes
+
+    def write_changed():
+        mtimes = get_mtimes()
+        time.sleep(0.1)
+        ml.write_input(incremental=True)
+        return sorted([f for f, t in get_mtimes().items()
+                       if mtimes.get(f) != t and f != 'incremental.nam'])
+
+    assert write_changed() == []
+    # only the changed package and external array are written
+    ml.lpf.hk[1][0, 0] = 3.
+    assert ml.lpf.dirty and not ml.dis.dirty
+    assert write_changed() == ['hk_layer_2.ref', 'incremental.lpf']
+    # list data that are changed in place
+    ml.wel.stress_period_data[0]['flux'][0] = -5.
+    assert write_changed() == ['WEL_0000.dat', 'incremental.wel']
+    ml.pcg.hclose = 1e-3
+    assert write_changed() == ['incremental.pcg']
+    # package files that were removed
+    os.remove(os.path.join(ws, 'incremental.dis'))
+    assert write_changed() == ['incremental.dis']
+    # arrays that are changed in place
+    hk[0] *= 3.
+    assert ml.lpf.dirty
+    assert write_changed() == ['hk_layer_1.ref', 'incremental.lpf']
+    # external files are always written without incremental
+    hk[0] *= 3.
+    ml.write_input()
+    ml1 = flopy.modflow.Modflow.load('incremental.nam', model_ws=ws,
+                                     check=False)
+    assert np.allclose(ml1.lpf.hk.array[0], hk[0])
+
+
+def test_write_input_parallel():
+    ws = os.path.join(out_dir, 'parallel')
+    ml = flopy.modflow.Modflow('parallel', model_ws=ws, external_path='ref')
+    nlay, nrow, ncol = 2, 10, 12
+    flopy.modflow.ModflowDis(ml, nlay, nrow, ncol, nper=2)
+    flopy.modflow.ModflowBas(ml)
+    flopy.modflow.ModflowLpf(ml, hk=np.random.random((nlay, nrow, ncol)))
+    flopy.modflow.ModflowRch(ml, rech={0: np.random.random((nrow, ncol))})
+    flopy.modflow.ModflowWel(ml, stress_period_data={0: [[0, 1, 1, -1.]]})
+    flopy.modflow.ModflowPcg(ml)
+    ml.write_input()
+    text = {}
+    for pth in [ws, os.path.join(ws, 'ref')]:
+        for f in os.listdir(pth):
+            if os.path.isfile(os.path.join(pth, f)):
+                text[f] = open(os.path.join(pth, f)).read()
+                os.remove(os.path.join(pth, f))
+
+    # the same files are written by the threads
+    ml.write_input(n_workers=4)
+    for f, t in text.items():
+        pth = os.path.join(ws, f)
+        if not os.path.exists(pth):
+            pth = os.path.join(ws, 'ref', f)
+        assert open(pth).read() == t, f
+
+    # packages that are selected more than once are written once
+    written = []
+    write_file = ml.dis.write_file
+
+    def count_writes(**kwargs):
+        written.append('DIS')
+        write_file(**kwargs)
+
+    ml.dis.write_file = count_writes
+    ml.write_input(SelPackList=['DIS', 'DIS', 'BAS6'], n_workers=4)
+    assert written == ['DIS']
+    del ml.dis.write_file
+
+    # the error of the first package that fails is raised
+    def fail(msg):
+        def write_file(check=False):
+            raise ValueError(msg)
+        return write_file
+
+    ml.rch.write_file = fail('rch')
+    ml.lpf.write_file = fail('lpf')
+    try:
+        ml.write_input(n_workers=4)
+        raise AssertionError('no error raised')
+    except ValueError as e:
+        assert str(e) == 'lpf'
+
+
+def test_write_ensemble():
+    ws = os.path.join(out_dir, 'ensemble')
+    ml = flopy.modflow.Modflow('ensemble', model_ws=ws, external_path='ref')
+    nlay, nrow, ncol = 2, 10, 12
+    flopy.modflow.ModflowDis(ml, nlay, nrow, ncol, nper=2,
+                             botm=np.random.random((nlay, nrow, ncol)))
+    flopy.modflow.ModflowBas(ml)
+    flopy.modflow.ModflowLpf(ml, hk=np.random.random((nlay, nrow, ncol)))
+    flopy.modflow.ModflowWel(ml, stress_period_data={0: [[0, 1, 1, -1.]]})
+    flopy.modflow.ModflowPcg(ml)
+    hks = [np.random.random((nlay, nrow, ncol)) for i in range(3)]
+
+    def modify(m, i):
+        m.lpf.hk = hks[i]
+        if i == 2:
+            m.wel.stress_period_data[0]['flux'][0] = -2.
+
+    def modify_hk(m, i):
+        m.lpf.hk = hks[i]
+
+    wss = [os.path.join(out_dir, 'ensemble_{}'.format(i)) for i in range(3)]
+    written = ml.write_ensemble(wss, modify=modify_hk)
+    assert written == [['LPF'], ['LPF'], ['LPF']]
+    # the second ensemble replaces the files of the first one
+    written = ml.write_ensemble(wss, modify=modify)
+    assert written == [['LPF'], ['LPF'], ['LPF', 'WEL']]
+    assert ml.model_ws == ws
+
+    for i, rws in enumerate(wss):
+        for f in ['ensemble.dis', os.path.join('ref', 'botm_layer_1.ref'),
+                  'ensemble.bas', 'ensemble.pcg']:
+            assert os.path.samefile(os.path.join(ws, f),
+                                    os.path.join(rws, f)), f
+        for f in ['ensemble.lpf', os.path.join('ref', 'hk_layer_1.ref')]:
+            assert not os.path.samefile(os.path.join(ws, f),
+                                        os.path.join(rws, f)), f
+        m = flopy.modflow.Modflow.load('ensemble.nam', model_ws=rws,
+                                       check=False)
+        assert np.allclose(m.lpf.hk.array, hks[i])
+        assert np.allclose(m.dis.botm.array, ml.dis.botm.array)
+        f = os.path.join('ref', 'WEL_0000.dat')
+        flux = float(open(os.path.join(rws, f)).read().split()[-1])
+        assert flux == (-2. if i == 2 else -1.)
+        assert os.path.samefile(os.path.join(ws, f),
+                                os.path.join(rws, f)) == (i != 2)
+
+    # the base workspace still has the base input
+    f = os.path.join(ws, 'ref', 'WEL_0000.dat')
+    assert float(open(f).read().split()[-1]) == -1.
+    assert ml.lpf.dirty and ml.wel.dirty and not ml.dis.dirty
+
+    # copies instead of links
+    written = ml.write_ensemble(wss[:1], link='copy')
+    assert written == [[]]
+    assert not os.path.samefile(os.path.join(ws, 'ensemble.dis'),
+                                os.path.join(wss[0], 'ensemble.dis'))
+
+    # writing the model to a realization replaces the linked files instead
+    # of changing them in the other workspaces
+    files = ['ensemble.dis', os.path.join('ref', 'model_top.ref'),
+             os.path.join('ref', 'WEL_0000.dat')]
+    text = dict([(f, open(os.path.join(ws, f)).read()) for f in files])
+    ml.dis.top = 99.
+    ml.change_model_ws(wss[1])
+    ml.write_input()
+    m = flopy.modflow.Modflow.load('ensemble.nam', model_ws=wss[1],
+                                   check=False)
+    assert np.allclose(m.dis.top.array, 99.)
+    for rws in [ws, wss[2]]:
+        for f in files[:2]:
+            assert open(os.path.join(rws, f)).read() == text[f], f
+    assert open(os.path.join(ws, files[2])).read() == text[files[2]]
+
+
 def test_util2d_external_free():
     model_ws = os.path.join(out_dir, "extra_temp")
     if os.path.exists(model_ws):
@@ -558,6 +954,152 @@ def test_mflist():
     assert flx1.sum() == flx2.sum()
 
 
+def test_mflist_sparse():
+    ml = flopy.modflow.Modflow(model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, 3, 10, 10, 5)
+    sp_data = {0: [[0, 1, 1, 1.0], [1, 1, 2, 2.0], [1, 1, 2, 3.0]],
+               2: 0,
+               3: [[2, 9, 9, 4.0]]}
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data=sp_data)
+    s4d = wel.stress_period_data.sparse_4D_arrays['flux']
+    assert isinstance(s4d, flopy.utils.Sparse4d)
+    assert s4d.shape == (5, 3, 10, 10)
+    # duplicate entries are combined, kper 1 reuses the kper 0 data and
+    # kper 4 reuses the kper 3 data
+    assert s4d.nnz == 6
+    assert np.array_equal(s4d.kper, [0, 0, 1, 1, 3, 4])
+    assert np.array_equal(s4d.k, [0, 1, 0, 1, 2, 2])
+    assert np.array_equal(s4d.values, [1., 5., 1., 5., 4., 4.])
+    assert s4d.min() == 1. and s4d.max() == 5.
+
+    # the dense arrays match the to_array() arrays
+    m4d = wel.stress_period_data.masked_4D_arrays['flux']
+    assert np.allclose(s4d.todense(), m4d, equal_nan=True)
+    for kper in range(ml.nper):
+        arr = wel.stress_period_data.to_array(kper, mask=True)['flux']
+        assert np.allclose(s4d[kper], arr, equal_nan=True)
+        assert np.allclose(m4d[kper], arr, equal_nan=True)
+
+    # sparse and dense arrays give the same stress period data
+    sp1 = flopy.utils.MfList.masked4D_arrays_to_stress_period_data(
+        flopy.modflow.ModflowWel.get_default_dtype(), {'flux': s4d})
+    sp2 = flopy.utils.MfList.masked4D_arrays_to_stress_period_data(
+        flopy.modflow.ModflowWel.get_default_dtype(), {'flux': m4d})
+    for kper in range(ml.nper):
+        for name in ['k', 'i', 'j', 'flux']:
+            assert np.array_equal(sp1[kper][name], sp2[kper][name])
+    s4d2 = flopy.utils.MfList.from_4d(ml, 'WEL', {'flux': s4d})
+    assert np.allclose(s4d2.masked_4D_arrays['flux'], m4d, equal_nan=True)
+
+    # Transient2d from a sparse array
+    m4d = np.zeros((5, 1, 10, 10)) + np.NaN
+    m4d[1] = 2.
+    m4d[3] = np.arange(100).reshape(1, 10, 10)
+    s4d = flopy.utils.Sparse4d.from_dense(m4d)
+    assert s4d.nnz == 200
+    t2d = Transient2d.from_4d(ml, 'rch', {'rech': s4d})
+    assert list(t2d.transient_2ds.keys()) == [1, 3]
+    assert np.array_equal(t2d[3].array, m4d[3, 0])
+    m4d[3, 0, 0, 0] = np.NaN
+    try:
+        Transient2d.from_4d(ml, 'rch',
+                            {'rech': flopy.utils.Sparse4d.from_dense(m4d)})
+        raise AssertionError('partially masked kper should raise')
+    except Exception as e:
+        assert 'masked value found' in str(e)
+
+
+def test_mflist_write_transient():
+    ml = flopy.modflow.Modflow(model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, 10, 10, 10, nper=3)
+    sp_data = {0: [[1, 1, 1, 1.0], [1, 1, 2, 2.0], [1, 1, 3, 3.0]],
+               2: [[1, 2, 4, 4.0]]}
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data=sp_data)
+    data = wel.stress_period_data[0].copy()
+    fname = os.path.join(out_dir, 'write_transient.wel')
+    f = open(fname, 'w')
+    wel.stress_period_data.write_transient(f)
+    # the file handle is left open for the caller
+    assert not f.closed
+    f.write('end\n')
+    f.close()
+    # the stress period data are not changed by writing
+    assert np.array_equal(wel.stress_period_data[0], data)
+    lines = open(fname).readlines()
+    assert len(lines) == 8
+    assert [int(v) for v in lines[1].split()[:3]] == [2, 2, 2]
+    assert [int(v) for v in lines[4].split()[:2]] == [-1, 0]
+    assert [int(v) for v in lines[6].split()[:3]] == [2, 3, 5]
+    assert lines[-1] == 'end\n'
+    return
+
+
+def test_mflist_reuse():
+    ml = flopy.modflow.Modflow('reuse', model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, 3, 10, 10, nper=5)
+    a = [[0, 1, 1, -10.], [1, 2, 2, -20.]]
+    sp_data = {0: a, 1: list(a), 2: [[0, 3, 3, -5.]], 3: a}
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data=sp_data)
+    # every stress period keeps its own data
+    data = wel.stress_period_data.data
+    assert data[1] is not data[0]
+    assert data[3] is not data[0]
+    wel.write_file()
+    fname = os.path.join(out_dir, 'reuse.wel')
+    itmp = [int(line.split()[0]) for line in open(fname)
+            if 'stress period' in line]
+    assert itmp == [2, -1, 1, 2, -1]
+
+    # changing identical stress periods in place only changes one of them
+    a = [[0, 1, 1, -100.]]
+    sp_data = {0: a, 1: list(a), 2: list(a)}
+    wel = flopy.modflow.ModflowWel(ml, stress_period_data=sp_data)
+    wel.stress_period_data.data[2]['flux'] *= 2
+    flux = [wel.stress_period_data[kper]['flux'][0] for kper in range(3)]
+    assert flux == [-100., -100., -200.]
+    wel.write_file()
+    itmp = [int(line.split()[0]) for line in open(fname)
+            if 'stress period' in line]
+    assert itmp == [1, -1, 1, -1, -1]
+    wel2 = flopy.modflow.ModflowWel.load(fname, ml, nper=5, check=False)
+    for kper in range(5):
+        assert np.array_equal(wel2.stress_period_data[kper],
+                              wel.stress_period_data[kper])
+    return
+
+
+def test_mflist_load_list_lines():
+    ml = flopy.modflow.Modflow(model_ws=out_dir)
+    dis = flopy.modflow.ModflowDis(ml, 3, 10, 10, nper=2)
+    fname = os.path.join(out_dir, 'list_lines.wel')
+    with open(fname, 'w') as f:
+        f.write('# free, fixed and mixed format list input\n')
+        f.write('         3        0 AUX IFACE\n')
+        # free format lines with values after the last field
+        f.write('         3         0\n')
+        f.write('1 2 3 -100.0 1. well 1\n')
+        f.write('2 3 4 -2.5e+02 2 well 2\n')
+        f.write('3 4 5 -3.0E2 3\n')
+        # fixed format lines with values that touch
+        f.write('         3         0\n')
+        f.write('         1        10        10-1000000.0       1.0\n')
+        f.write('1 1 1 -1. 0.\n')
+        f.write('         2         9        10 -123456.5       6.0\n')
+    wel = flopy.modflow.ModflowWel.load(fname, ml, check=False)
+    spd = wel.stress_period_data
+    assert np.array_equal(spd[0]['k'], [0, 1, 2])
+    assert np.array_equal(spd[0]['i'], [1, 2, 3])
+    assert np.array_equal(spd[0]['j'], [2, 3, 4])
+    assert np.allclose(spd[0]['flux'], [-100., -250., -300.])
+    assert np.allclose(spd[0]['iface'], [1., 2., 3.])
+    assert np.array_equal(spd[1]['k'], [0, 0, 1])
+    assert np.array_equal(spd[1]['i'], [9, 0, 8])
+    assert np.array_equal(spd[1]['j'], [9, 0, 9])
+    assert np.allclose(spd[1]['flux'], [-1000000., -1., -123456.5])
+    assert np.allclose(spd[1]['iface'], [1., 0., 6.])
+    return
+
+
 def test_how():
     import numpy as np
     import flopy
@@ -588,6 +1130,10 @@ def test_util3d_reset():
 if __name__ == '__main__':
     # test_util3d_reset()
     # test_mflist()
+    # test_mflist_sparse()
+    # test_mflist_write_transient()
+    # test_mflist_load_list_lines()
+    # test_mflist_reuse()
     # test_new_get_file_entry()
     # test_arrayformat()
     # test_util2d_external_free_nomodelws()
@@ -601,5 +1147,12 @@ if __name__ == '__main__':
     # test_transient2d()
     test_transient3d()
     # test_util2d()
+    # test_util2d_load_txt()
+    # test_util2d_array2string()
+    # test_util2d_lazy()
+    # test_util2d_array_cache()
+    # test_write_input_binary()
+    # test_write_input_incremental()
+    # test_write_input_parallel()
     # test_util3d()
     # test_how()
@@ -51,5 +51,90 @@ def test_mflistfile():
     return
 
 
+def test_mflistfile_scan():
+    # budget blocks between many lines of solver output, with windows line
+    # endings and an incomplete block at the end of the file
+    pth = os.path.join('..', 'examples', 'data', 'freyberg')
+    list_file = os.path.join(pth, 'freyberg.gitlist')
+    lines = open(list_file).readlines()
+    head, block = ''.join(lines[:419]), ''.join(lines[419:460])
+    ws = os.path.join('temp', 't011')
+    if not os.path.isdir(ws):
+        os.makedirs(ws)
+    fname = os.path.join(ws, 'scan.list')
+    nstp = 5
+    with open(fname, 'wb') as f:
+        f.write(head.encode('ascii'))
+        for kstp in range(nstp):
+            for j in range(1000):
+                f.write(' Outer Iter.     1  Inner Iter. {:5d}:  Max. DVMAX ='
+                        ' 1.0E-03\r\n'.format(j + 1).encode('ascii'))
+            text = block.replace('TIME STEP    1, STRESS',
+                                 'TIME STEP {:4d}, STRESS'.format(kstp + 1))
+            text = text.replace('TOTAL TIME  10.000',
+                                'TOTAL TIME  {:<6.1f}'.format(10. * (kstp + 1)))
+            text = text.replace('RECHARGE =       6.9500E-02',
+                                'RECHARGE =       {:.4E}'.format(kstp + 1.))
+            f.write(text.replace('\n', '\r\n').encode('ascii'))
+        f.write(block[:block.index('OUT:')].encode('ascii'))
+
+    mflist = flopy.utils.MfListBudget(fname, timeunit='seconds')
+    assert mflist.get_kstpkper() == [(kstp, 0) for kstp in range(nstp)]
+    inc = mflist.get_incremental()
+    assert np.allclose(inc['RECHARGE_IN'], np.arange(1, nstp + 1))
+    assert np.allclose(inc['totim'], 10. * np.arange(1, nstp + 1))
+    assert mflist.get_record_names() == \
+           flopy.utils.MfListBudget(list_file).get_record_names()
+
+
+def test_mflistfile_refresh():
+    # a list file that is written while it is read
+    pth = os.path.join('..', 'examples', 'data', 'freyberg')
+    lines = open(os.path.join(pth, 'freyberg.gitlist')).readlines()
+    head, block = ''.join(lines[:419]), ''.join(lines[419:461])
+    ws = os.path.join('temp', 't011')
+    if not os.path.isdir(ws):
+        os.makedirs(ws)
+    fname = os.path.join(ws, 'refresh.list')
+    blocks = [block.replace('TIME STEP    1, STRESS',
+                            'TIME STEP {:4d}, STRESS'.format(kstp + 1))
+              for kstp in range(4)]
+    text = head + ''.join(blocks)
+    n = [len(head) + len(''.join(blocks[:i])) for i in range(5)]
+
+    # no budget yet
+    with open(fname, 'w') as f:
+        f.write(head)
+    mflist = flopy.utils.MfListBudget(fname)
+    assert not mflist.isvalid()
+    assert mflist.refresh() == 0
+    # a budget without its time summary is not read yet
+    with open(fname, 'a') as f:
+        f.write(text[n[0]:n[0] + block.index('TIME SUMMARY')])
+    assert mflist.refresh() == 0
+    with open(fname, 'a') as f:
+        f.write(text[n[0] + block.index('TIME SUMMARY'):n[1]])
+    assert mflist.refresh() == 1
+    assert mflist.isvalid()
+    with open(fname, 'a') as f:
+        f.write(text[n[1]:n[3] + 100])
+    assert mflist.refresh() == 2
+    with open(fname, 'a') as f:
+        f.write(text[n[3] + 100:])
+    assert mflist.refresh() == 1
+    assert mflist.refresh() == 0
+
+    mflist0 = flopy.utils.MfListBudget(fname)
+    assert mflist.idx_map == mflist0.idx_map
+    assert mflist.get_kstpkper() == [(kstp, 0) for kstp in range(4)]
+    for name in mflist0.get_record_names():
+        assert np.array_equal(mflist.get_incremental()[name],
+                              mflist0.get_incremental()[name])
+        assert np.array_equal(mflist.get_cumulative()[name],
+                              mflist0.get_cumulative()[name])
+
+
 if __name__ == '__main__':
     test_mflistfile()
+    test_mflistfile_scan()
+    test_mflistfile_refresh()
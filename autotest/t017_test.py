@@ -55,6 +55,138 @@ def test_binaryfile_read():
     ts = h.get_ts((0, 7, 5))
     assert np.isclose(ts[0, 1], 26.00697135925293), \
         'time series value ({}) != {}'.format(ts[0, 1], - 26.00697135925293)
+
+    # multiple cells and a time window
+    cells = [(0, 7, 5), (0, 0, 0), (0, 39, 19), (0, 7, 5)]
+    ts = h.get_ts(cells)
+    assert ts.shape == (len(times), len(cells) + 1)
+    for itim, totim in enumerate(times):
+        h0 = h.get_data(totim=totim)
+        for icell, (k, i, j) in enumerate(cells):
+            assert ts[itim, icell + 1] == h0[k, i, j], \
+                'time series value != head value for cell {}'.format((k, i, j))
+    ts = h.get_ts(cells, totim_range=(times[-1], None))
+    assert ts.shape == (1, len(cells) + 1)
+    assert ts[0, 0] == times[-1]
+    return
+
+
+def test_binaryfile_memmap():
+    import os
+    import flopy
+
+    fpth = os.path.join('..', 'examples', 'data', 'freyberg',
+                        'freyberg.githds')
+    h = flopy.utils.HeadFile(fpth)
+    hm = flopy.utils.HeadFile(fpth, memmap=True)
+
+    for totim in h.get_times():
+        h0 = h.get_data(totim=totim)
+        h1 = hm.get_data(totim=totim)
+        assert np.array_equal(h0, h1), \
+            'memory-mapped head read != head read for totim {}'.format(totim)
+        assert not h1.flags.owndata, 'memory-mapped head read is a copy'
+
+    h0 = h.get_alldata()
+    h1 = hm.get_alldata()
+    assert np.allclose(h0, h1, equal_nan=True), \
+        'memory-mapped get_alldata() != get_alldata()'
+    h1 = hm.get_alldata(mflay=0, nodata=None)
+    assert h1.shape == h0[:, 0, :, :].shape
+    assert not h1.flags.owndata, 'memory-mapped get_alldata() is a copy'
+
+    ts0 = h.get_ts((0, 7, 5))
+    ts1 = hm.get_ts((0, 7, 5))
+    assert np.array_equal(ts0, ts1), 'memory-mapped get_ts() != get_ts()'
+    h.close()
+    hm.close()
+    return
+
+
+def test_binaryfile_cache_index():
+    import os
+    import shutil
+    import flopy
+
+    cpth = os.path.join('temp', 't017')
+    if not os.path.isdir(cpth):
+        os.makedirs(cpth)
+    for fname, cls in (('freyberg.githds', flopy.utils.HeadFile),
+                       ('mnw1.gitcbc', flopy.utils.CellBudgetFile)):
+        if cls is flopy.utils.HeadFile:
+            src = os.path.join('..', 'examples', 'data', 'freyberg', fname)
+        else:
+            src = os.path.join('..', 'examples', 'data', 'mf2005_test', fname)
+        fpth = os.path.join(cpth, fname)
+        shutil.copyfile(src, fpth)
+        if os.path.isfile(fpth + '.idx'):
+            os.remove(fpth + '.idx')
+
+        v0 = cls(fpth)
+        v1 = cls(fpth, cache_index=True)
+        assert os.path.isfile(fpth + '.idx'), 'index file was not written'
+        v2 = cls(fpth, cache_index=True)
+        for v in (v1, v2):
+            assert np.array_equal(v0.recordarray, v.recordarray)
+            assert np.array_equal(v0.iposarray, v.iposarray)
+            assert v0.get_times() == v.get_times()
+            assert v0.get_kstpkper() == v.get_kstpkper()
+            if cls is flopy.utils.CellBudgetFile:
+                assert v0.get_unique_record_names() == \
+                       v.get_unique_record_names()
+                assert v0.paknamlist == v.paknamlist
+                text = v.get_unique_record_names()[-1]
+                for t0, t1 in zip(v0.get_data(text=text),
+                                  v.get_data(text=text)):
+                    assert np.array_equal(t0, t1)
+            else:
+                assert np.array_equal(v0.get_alldata(), v.get_alldata())
+            v.close()
+        v0.close()
+    return
+
+
+def test_binaryfile_refresh():
+    import os
+    import flopy
+
+    # a head file that is written while it is read
+    src = os.path.join('..', 'examples', 'data', 'preserve_unitnums',
+                       'testsfr2.hds')
+    cpth = os.path.join('temp', 't017')
+    if not os.path.isdir(cpth):
+        os.makedirs(cpth)
+    fpth = os.path.join(cpth, 'refresh.hds')
+    h0 = flopy.utils.HeadFile(src)
+    nrecords = len(h0.recordarray)
+    reclen = int(h0.iposarray[1] - h0.iposarray[0])
+    data = open(src, 'rb').read()
+    assert len(data) == nrecords * reclen
+
+    # 5 records and the first bytes of the next record
+    with open(fpth, 'wb') as f:
+        f.write(data[:5 * reclen + 10])
+    h = flopy.utils.HeadFile(fpth)
+    hm = flopy.utils.HeadFile(fpth, memmap=True)
+    for v in (h, hm):
+        assert len(v.recordarray) == 5
+        assert v.get_times() == h0.get_times()[:5]
+        assert v.refresh() == 0
+    with open(fpth, 'ab') as f:
+        f.write(data[5 * reclen + 10:8 * reclen])
+    for v in (h, hm):
+        assert v.refresh() == 3
+        assert v.get_times() == h0.get_times()[:8]
+    with open(fpth, 'ab') as f:
+        f.write(data[8 * reclen:])
+    for v in (h, hm):
+        assert v.refresh() == nrecords - 8
+        assert np.array_equal(v.recordarray, h0.recordarray)
+        assert np.array_equal(v.iposarray, h0.iposarray)
+        assert v.get_kstpkper() == h0.get_kstpkper()
+        assert np.array_equal(v.get_alldata(), h0.get_alldata())
+        v.close()
+    h0.close()
     return
 
 
@@ -172,6 +304,45 @@ def test_cellbudgetfile_readrecord_waux():
     return
 
 
+def test_cellbudgetfile_iter_records():
+    import os
+    import flopy
+
+    v = flopy.utils.CellBudgetFile(
+        os.path.join('..', 'examples', 'data', 'mf2005_test',
+                     'test1tr.gitcbc'))
+    kstpkper = v.get_kstpkper()
+
+    # all records in file order
+    n = 0
+    for idx, (header, data) in enumerate(v.iter_records()):
+        assert header == v.recordarray[idx]
+        t = v.get_record(idx)
+        if isinstance(t, list):
+            for t0, t1 in zip(t, data):
+                assert np.array_equal(t0, t1)
+        else:
+            assert np.array_equal(t, data)
+        n += 1
+    assert n == v.get_nrecords()
+
+    # a single record type over a range of time steps
+    t = v.get_data(text='STREAM LEAKAGE')
+    records = list(v.iter_records(text='STREAM LEAKAGE',
+                                  kstpkper_range=(kstpkper[2], kstpkper[5])))
+    assert len(records) == 4, 'iter_records returned {} records'.format(
+        len(records))
+    for (header, data), t0 in zip(records, t[2:6]):
+        assert header['text'].decode().strip() == 'STREAM LEAKAGE'
+        assert np.array_equal(data, t0)
+
+    times = v.get_times()
+    records = list(v.iter_records(text='WELLS',
+                                  totim_range=(times[-2], None)))
+    assert len(records) == 2
+    return
+
+
 def test_binaryfile_writeread():
     import os
     import numpy as np
@@ -238,6 +409,10 @@ if __name__ == '__main__':
     test_binaryfile_writeread()
     test_formattedfile_read()
     test_binaryfile_read()
+    test_binaryfile_memmap()
+    test_binaryfile_cache_index()
+    test_binaryfile_refresh()
     test_cellbudgetfile_read()
     test_cellbudgetfile_readrecord()
     test_cellbudgetfile_readrecord_waux()
+    test_cellbudgetfile_iter_records()
@@ -4,7 +4,7 @@ Test zonbud utility
 import os
 import numpy as np
 from flopy.utils import CellBudgetFile, ZoneBudget, \
-    MfListBudget, read_zbarray, write_zbarray
+    MfListBudget, read_zbarray, write_zbarray, get_zonebudgets
 
 loadpth = os.path.join('..', 'examples', 'data', 'zonbud_examples')
 outpth = os.path.join('temp', 't038')
@@ -180,6 +180,37 @@ def test_zonbud_copy():
     return
 
 
+def test_zonbud_parallel():
+    """
+    t039 Test zonbud computed with multiple processes
+    """
+    cbc_f = os.path.join('..', 'examples', 'data', 'mf2005_test',
+                         'test1tr.gitcbc')
+    zon = np.random.RandomState(0).randint(0, 4, size=(1, 15, 10))
+    zb = ZoneBudget(cbc_f, zon)
+    zb2 = ZoneBudget(cbc_f, zon, n_workers=3)
+    assert np.array_equal(zb.get_budget(), zb2.get_budget()), \
+        'Budgets computed with multiple processes do not match.'
+    return
+
+
+def test_zonbud_multiple_zones():
+    """
+    t039 Test zonbud computed for several zone arrays in one pass
+    """
+    cbc_f = os.path.join('..', 'examples', 'data', 'mf2005_test',
+                         'test1tr.gitcbc')
+    rs = np.random.RandomState(0)
+    zons = [rs.randint(0, n, size=(1, 15, 10)) for n in (2, 4, 6)]
+    zbs = get_zonebudgets(cbc_f, zons)
+    assert len(zbs) == len(zons)
+    for zon, zb in zip(zons, zbs):
+        zb2 = ZoneBudget(cbc_f, zon)
+        assert np.array_equal(zb.get_budget(), zb2.get_budget()), \
+            'Budgets computed in one pass do not match.'
+    return
+
+
 def test_zonbud_readwrite_zbarray():
     """
     t039 Test zonbud read write
@@ -200,4 +231,6 @@ if __name__ == '__main__':
     test_zonbud_math()
     test_zonbud_copy()
     test_zonbud_readwrite_zbarray()
+    test_zonbud_parallel()
+    test_zonbud_multiple_zones()
     test_zonbud_get_record_names()
@@ -0,0 +1,149 @@
+# Test running models with flopy.run_models, using a python script as a
+# stand-in for the model executable
+import os
+import sys
+import shutil
+import flopy
+
+cpth = os.path.join('temp', 't050')
+
+
+def setup_workspace(name):
+    """
+    Create an empty workspace for a test and the stand-in model in it.
+    Returns the workspace and the path of the stand-in model.
+    """
+    pth = os.path.join(cpth, name)
+    # delete the directory if it exists
+    if os.path.isdir(pth):
+        shutil.rmtree(pth)
+    # make the directory
+    os.makedirs(pth)
+
+    exe = os.path.abspath(os.path.join(pth, 'fakemodel.py'))
+    with open(exe, 'w') as f:
+        f.write('#!{}\n'.format(sys.executable))
+        f.write('import sys\n'
+                'import time\n'
+                'nam = open(sys.argv[1]).read().split()\n'
+                'print("fake model " + " ".join(sys.argv[1:]))\n'
+                'sys.stdout.flush()\n'
+                'time.sleep(float(nam[0]))\n'
+                'for kstp in range(1, 3):\n'
+                '    print(" Solving:  Stress period:     1    '
+                'Time step:     {}    Ground-Water Flow Eqn.".format(kstp))\n'
+                '    print(" Outer Iter.  1  Inner Iter.  {}:  '
+                'Max. DC =  0.1".format(kstp + 2))\n'
+                'if nam[1] == "ok":\n'
+                '    print(" Normal termination of simulation")\n'
+                'else:\n'
+                '    print(" failure to converge")\n'
+                '    sys.exit(1)\n')
+    os.chmod(exe, 0o755)
+    return pth, exe
+
+
+def make_run(pth, name, sleep, status):
+    ws = os.path.join(pth, name)
+    os.makedirs(ws)
+    with open(os.path.join(ws, 'model.nam'), 'w') as f:
+        f.write('{} {}\n'.format(sleep, status))
+    return ws
+
+
+def test_run_models():
+    if sys.platform.startswith('win'):
+        return
+    pth, exe = setup_workspace('run_models')
+    ws = [make_run(pth, 'r{}'.format(i), 0.1, 'ok') for i in range(6)]
+    ws.append(make_run(pth, 'fail', 0., 'fail'))
+    ws.append(make_run(pth, 'slow', 30., 'ok'))
+    jobs = [(exe, 'model.nam', w) for w in ws]
+    jobs.append((exe, 'missing.nam', ws[0]))
+    jobs[0] = jobs[0] + (['-x'],)
+    results = flopy.run_models(jobs, n_workers=3, timeout=2.)
+    assert len(results) == len(jobs)
+    for r, w in zip(results[:6], ws[:6]):
+        assert r.success
+        assert r.model_ws == w
+        assert r.returncode == 0
+        assert not r.timed_out
+        assert r.message == 'Normal termination of simulation'
+        assert os.path.isfile(os.path.join(w, 'model.stdout'))
+    assert 'fake model model.nam -x' in open(results[0].logfile).read()
+
+    r = results[6]
+    assert not r.success
+    assert r.returncode == 1
+    assert r.message == 'failure to converge'
+
+    r = results[7]
+    assert not r.success
+    assert r.timed_out
+    assert r.wall_time < 30.
+
+    r = results[8]
+    assert not r.success
+    assert r.returncode is None
+    assert 'namefile' in r.message
+    return
+
+
+def test_run_model():
+    if sys.platform.startswith('win'):
+        return
+    pth, exe = setup_workspace('run_model')
+    ws = make_run(pth, 'single', 0., 'ok')
+    for async_read in [False, True]:
+        success, buff = flopy.run_model(exe, 'model.nam', model_ws=ws,
+                                        silent=True, report=True,
+                                        **{'async': async_read})
+        assert success
+        assert len(buff) == 6
+    return
+
+
+def test_run_model_async():
+    if sys.platform.startswith('win') or sys.version_info < (3, 5):
+        return
+    import asyncio
+    loop = asyncio.get_event_loop()
+
+    pth, exe = setup_workspace('run_model_async')
+    ws = [make_run(pth, 'a{}'.format(i), 0.5, 'ok') for i in range(8)]
+    ws.append(make_run(pth, 'afail', 0., 'fail'))
+    timesteps = []
+    iterations = []
+    runs = [flopy.run_model_async(exe, 'model.nam', model_ws=w, silent=True,
+                                  report=True,
+                                  timestep_callback=lambda kper, kstp:
+                                  timesteps.append((kper, kstp)),
+                                  iteration_callback=lambda outer, inner:
+                                  iterations.append((outer, inner)))
+            for w in ws]
+    results = loop.run_until_complete(asyncio.gather(*runs))
+    assert [success for success, buff in results] == [True] * 8 + [False]
+    assert results[0][1][-1] == ' Normal termination of simulation'
+    assert sorted(set(timesteps)) == [(0, 0), (0, 1)]
+    assert len(timesteps) == 18
+    assert sorted(set(iterations)) == [(1, 3), (1, 4)]
+
+    # read the lines with the async iterator
+    run = flopy.AsyncModelRun(exe, 'model.nam', model_ws=ws[0])
+    lines = []
+    while True:
+        try:
+            lines.append(loop.run_until_complete(run.__anext__()))
+        except StopAsyncIteration:
+            break
+    assert lines[0] == 'fake model model.nam'
+    assert run.kper == 0 and run.kstp == 1
+    assert loop.run_until_complete(run.wait())
+    assert run.returncode == 0
+    return
+
+
+if __name__ == '__main__':
+    test_run_models()
+    test_run_model()
+    test_run_model_async()
@@ -0,0 +1,76 @@
+"""
+Benchmark writing a large Util2d layer as text.
+
+A 1000 x 1000 layer is written with Util2d.array2string in free format and
+in (npl E w.d), (npl G w.d) and (npl I w) formats, and with a reference
+implementation that formats the layer one value at a time (the approach
+used by Util2d.array2string before the array formatter).  The text of
+both must be the same.
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join('..', '..'))
+from flopy.utils.util_array import Util2d
+
+nrow, ncol = 1000, 1000
+
+
+def legacy_array2string(shape, data, column_length, output_fmt):
+    """
+    Format data value by value, adding a line break after every
+    column_length values and at the end of every row.
+    """
+    nrow, ncol = shape
+    if ncol % column_length == 0:
+        linereturnflag = False
+    else:
+        linereturnflag = True
+    s = ""
+    for i in range(nrow):
+        for j in range(ncol):
+            s = s + output_fmt.format(data[i, j])
+            if (j + 1) % column_length == 0.0 and (j != 0 or ncol == 1):
+                s += '\n'
+        if linereturnflag:
+            s += '\n'
+    return s
+
+
+def best_time(f, *args, **kwargs):
+    times = []
+    for i in range(3):
+        t0 = time.time()
+        s = f(*args, **kwargs)
+        times.append(time.time() - t0)
+    return min(times), s
+
+
+if __name__ == '__main__':
+    np.random.seed(0)
+    real = (np.random.lognormal(0., 3., (nrow, ncol)) *
+            np.sign(np.random.standard_normal((nrow, ncol))))
+    real = real.astype(np.float32)
+    real[:, ::7] = 0.
+    integer = np.random.randint(-1, 100, (nrow, ncol)).astype(np.int32)
+
+    cases = [('(FREE)', real, ncol, '{0:15.6E}'),
+             ('(FREE)', integer, ncol, '{0:10d}'),
+             ('(10E15.6)', real, 10, '{0:15.6E}'),
+             ('(7G15.6)', real, 7, '{0:15.6G}'),
+             ('(25I4)', integer, 25, '{0:4d}')]
+    for label, data, npl, fmt in cases:
+        t_legacy, s0 = best_time(legacy_array2string, data.shape, data, npl,
+                                 fmt)
+        t_new, s1 = best_time(Util2d.array2string, data.shape, data,
+                              python_format=[npl, fmt])
+        assert s0 == s1, '{} output differs'.format(label)
+        print('{:>10s} {:>5s}: value by value {:7.3f} s, '
+              'array2string {:7.3f} s, speedup {:5.1f}x'.format(
+              label, data.dtype.name, t_legacy, t_new, t_legacy / t_new))
+    s = Util2d.array2string(real.shape, real, fortran_format='(FREE)')
+    assert s == legacy_array2string(real.shape, real, ncol, '{0:15.6E}')
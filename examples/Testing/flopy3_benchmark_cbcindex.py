@@ -0,0 +1,137 @@
+"""
+Benchmark building the record index of a large cell-by-cell budget file.
+
+A synthetic compact budget file with more than 100,000 records is written
+and the index is built with CellBudgetFile and with a reference
+implementation that reads the headers one small record at a time (the
+approach used by CellBudgetFile before the buffered header scan).
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join('..', '..'))
+import flopy
+from flopy.utils.binaryfile import binaryread
+
+ws = os.path.join('data', 'benchmark_cbcindex')
+fname = os.path.join(ws, 'benchmark.cbc')
+
+nlay, nrow, ncol = 3, 20, 30
+nper = 15000
+auxnames = ['IFACE', 'CONC']
+
+
+def write_cbc(fname, precision='single'):
+    realtype = np.float32 if precision == 'single' else np.float64
+    h1dt = np.dtype([('kstp', 'i4'), ('kper', 'i4'), ('text', 'a16'),
+                     ('ncol', 'i4'), ('nrow', 'i4'), ('nlay', 'i4')])
+    h2dt = np.dtype([('imeth', 'i4'), ('delt', realtype),
+                     ('pertim', realtype), ('totim', realtype)])
+    nrecords = 0
+    with open(fname, 'wb') as f:
+        for kper in range(nper):
+            totim = float(kper + 1)
+            # storage - full 3d array (imeth 1)
+            np.array([(1, kper + 1, '         STORAGE', ncol, nrow, -nlay)],
+                     dtype=h1dt).tofile(f)
+            np.array([(1, 1., 1., totim)], dtype=h2dt).tofile(f)
+            np.ones((nlay, nrow, ncol), dtype=realtype).tofile(f)
+            # constant heads - list (imeth 2)
+            np.array([(1, kper + 1, '   CONSTANT HEAD', ncol, nrow, -nlay)],
+                     dtype=h1dt).tofile(f)
+            np.array([(2, 1., 1., totim)], dtype=h2dt).tofile(f)
+            np.array([10], dtype=np.int32).tofile(f)
+            np.zeros(10, dtype=[('node', 'i4'),
+                                ('q', realtype)]).tofile(f)
+            # wells and drains - list with auxiliary variables (imeth 5)
+            for text in ('           WELLS', '          DRAINS',
+                         ' RIVER LEAKAGE  ', ' HEAD DEP BOUNDS',
+                         '        RECHARGE'):
+                np.array([(1, kper + 1, text, ncol, nrow, -nlay)],
+                         dtype=h1dt).tofile(f)
+                np.array([(5, 1., 1., totim)], dtype=h2dt).tofile(f)
+                np.array([len(auxnames) + 1], dtype=np.int32).tofile(f)
+                for name in auxnames:
+                    f.write('{:16}'.format(name).encode())
+                np.array([4], dtype=np.int32).tofile(f)
+                dt = [('node', 'i4'), ('q', realtype)] + \
+                     [(name, realtype) for name in auxnames]
+                np.zeros(4, dtype=dt).tofile(f)
+            nrecords += 7
+    return nrecords
+
+
+def legacy_index(fname, precision='single'):
+    """
+    Build recordarray and iposarray header by header with small reads.
+    """
+    realtype = np.float32 if precision == 'single' else np.float64
+    ffmt = 'f4' if precision == 'single' else 'f8'
+    h1dt = np.dtype([('kstp', 'i4'), ('kper', 'i4'), ('text', 'a16'),
+                     ('ncol', 'i4'), ('nrow', 'i4'), ('nlay', 'i4')])
+    h2dt0 = np.dtype([('imeth', 'i4'), ('delt', ffmt), ('pertim', ffmt),
+                      ('totim', ffmt)])
+    iposarray = []
+    with open(fname, 'rb') as f:
+        f.seek(0, 2)
+        totalbytes = f.tell()
+        f.seek(0, 0)
+        ipos = 0
+        while ipos < totalbytes:
+            header1 = binaryread(f, h1dt, (1,))
+            nlay = abs(int(header1['nlay'][0]))
+            nrow = int(header1['nrow'][0])
+            ncol = int(header1['ncol'][0])
+            imeth = 0
+            if header1['nlay'][0] < 0:
+                header2 = binaryread(f, h2dt0, (1,))
+                imeth = int(header2['imeth'][0])
+                if imeth == 6:
+                    for i in range(4):
+                        binaryread(f, str, charlen=16)
+            iposarray.append(f.tell())
+            if imeth in (0, 1):
+                nbytes = nrow * ncol * nlay * realtype(1).nbytes
+            elif imeth == 2:
+                nlist = binaryread(f, np.int32)[0]
+                nbytes = nlist * (4 + realtype(1).nbytes)
+            elif imeth in (5, 6):
+                naux = binaryread(f, np.int32)[0] - 1
+                for i in range(naux):
+                    binaryread(f, str, charlen=16)
+                nlist = binaryread(f, np.int32)[0]
+                n = 2 if imeth == 6 else 1
+                nbytes = nlist * (n * 4 + realtype(1).nbytes +
+                                  naux * realtype(1).nbytes)
+            else:
+                nbytes = nrow * ncol * realtype(1).nbytes
+            f.seek(nbytes, 1)
+            ipos = f.tell()
+    return np.array(iposarray, dtype=np.int64)
+
+
+if __name__ == '__main__':
+    if not os.path.isdir(ws):
+        os.makedirs(ws)
+    nrecords = write_cbc(fname)
+    print('{} records in {} ({:.1f} MB)'.format(
+        nrecords, fname, os.path.getsize(fname) / 2. ** 20))
+
+    t0 = time.time()
+    ipos0 = legacy_index(fname)
+    t_legacy = time.time() - t0
+    print('record-by-record header scan: {:8.3f} s'.format(t_legacy))
+
+    t0 = time.time()
+    cbc = flopy.utils.CellBudgetFile(fname)
+    t_new = time.time() - t0
+    print('CellBudgetFile index:         {:8.3f} s'.format(t_new))
+    print('speedup:                      {:8.1f}x'.format(t_legacy / t_new))
+
+    assert cbc.get_nrecords() == nrecords
+    assert np.array_equal(cbc.iposarray, ipos0)
+    cbc.close()
@@ -0,0 +1,87 @@
+"""
+Benchmark reading the budgets of a large MODFLOW list file.
+
+A synthetic list file with the budget of the freyberg example after every
+time step and many lines of solver output in between is written, and the
+budgets are read with MfListBudget.  The time is compared with a reference
+implementation of the line by line scan used by ListBudget before the
+mmap scanner, which reads every line to find the budget blocks and then
+every line again from each block to its time summary.
+
+"""
+from __future__ import print_function
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.join('..', '..'))
+import flopy
+
+ws = os.path.join('data', 'benchmark_listbudget')
+fname = os.path.join(ws, 'benchmark.list')
+src = os.path.join('..', 'data', 'freyberg', 'freyberg.gitlist')
+
+nstp = 2000
+nsolver = 1000
+budgetkey = 'VOLUMETRIC BUDGET FOR ENTIRE MODEL'
+
+
+def write_list(fname):
+    lines = open(src).readlines()
+    head, block = ''.join(lines[:419]), ''.join(lines[419:460])
+    with open(fname, 'w') as f:
+        f.write(head)
+        for kstp in range(nstp):
+            for j in range(nsolver):
+                f.write(' Outer Iter. {:5d}  Inner Iter. {:5d}:  '
+                        'Max. DVMAX = {:12.5E}\n'.format(j // 10 + 1,
+                                                        j % 10 + 1,
+                                                        1. / (j + 1)))
+            f.write(block.replace('TIME STEP    1, STRESS',
+                                  'TIME STEP {:4d}, STRESS'.format(kstp + 1)))
+
+
+def legacy_index(fname):
+    """
+    Find the budget blocks and their time summaries line by line.
+    """
+    idxs = []
+    with open(fname, 'r') as f:
+        while True:
+            seekpoint = f.tell()
+            line = f.readline()
+            if line == '':
+                break
+            if budgetkey in line:
+                idxs.append(seekpoint)
+        for seekpoint in idxs:
+            f.seek(seekpoint)
+            while True:
+                line = f.readline()
+                if line == '' or 'TIME SUMMARY AT END' in line:
+                    break
+    return idxs
+
+
+if __name__ == '__main__':
+    if not os.path.isdir(ws):
+        os.makedirs(ws)
+    write_list(fname)
+    print('{} budgets in {} ({:.1f} MB)'.format(
+        nstp, fname, os.path.getsize(fname) / 2. ** 20))
+
+    t0 = time.time()
+    idxs = legacy_index(fname)
+    t_legacy = time.time() - t0
+    print('line by line scan (index only): {:8.3f} s'.format(t_legacy))
+
+    t0 = time.time()
+    mflist = flopy.utils.MfListBudget(fname)
+    t_new = time.time() - t0
+    print('MfListBudget (index and parse): {:8.3f} s'.format(t_new))
+    print('speedup:                        {:8.1f}x'.format(t_legacy / t_new))
+
+    assert [seekpoint for ts, sp, seekpoint in mflist.idx_map] == idxs
+    assert np.array_equal(mflist.get_incremental()['time_step'],
+                          np.arange(nstp))
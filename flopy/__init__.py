@@ -34,4 +34,7 @@ from . import utils
 from . import plot
 from . import export
 from . import pest
-from .mbase import run_model, which, is_exe
+from .mbase import run_model, run_models, which, is_exe
+import sys as _sys
+if _sys.version_info >= (3, 5):
+    from .mbase_async import run_model_async, AsyncModelRun
@@ -542,10 +542,10 @@ def mflist_helper(f, mfl, **kwargs):
         # f.log("getting 4D masked arrays for {0}".format(base_name))
 
         # for name, array in m4d.items():
-        for name, array in mfl.masked_4D_arrays_itr():
+        for name, s4d in mfl.sparse_4D_arrays.items():
             var_name = base_name + '_' + name
             if isinstance(f, dict):
-                f[var_name] = array
+                f[var_name] = s4d.todense()
                 continue
             f.log("processing {0} attribute".format(name))
 
@@ -559,8 +559,8 @@ def mflist_helper(f, mfl, **kwargs):
             else:
                 attribs = {"long_name": var_name}
             attribs["coordinates"] = "time layer latitude longitude"
-            attribs["min"] = np.nanmin(array)
-            attribs["max"] = np.nanmax(array)
+            attribs["min"] = s4d.min()
+            attribs["max"] = s4d.max()
             if np.isnan(attribs["min"]) or np.isnan(attribs["max"]):
                 raise Exception(
                     "error processing {0}: all NaNs".format(var_name))
@@ -577,9 +577,12 @@ def mflist_helper(f, mfl, **kwargs):
                 f.logger.warn(estr)
                 raise Exception(estr)
 
-            array[np.isnan(array)] = f.fillvalue
             try:
-                var[:] = array
+                # write one stress period at a time from the sparse array
+                for kper in range(s4d.shape[0]):
+                    array = s4d[kper]
+                    array[np.isnan(array)] = f.fillvalue
+                    var[kper] = array
             except Exception as e:
                 estr = "error setting array to variable {0}:\n{1}".format(
                     var_name, str(e))
@@ -11,6 +11,7 @@ import os
 import subprocess as sp
 import shutil
 import threading
+import time
 
 if sys.version_info > (3, 0):
     import queue as Queue
@@ -26,6 +27,83 @@ from .version import __version__
 iconst = 1  # Multiplier for individual array elements in integer and real arrays read by MODFLOW's U2DREL, U1DREL and U2DINT.
 iprn = -1  # Printout flag. If >= 0 then array values read are printed in listing file.
 
+# Serializes the external unit numbers and files added while packages are
+# written in parallel.
+external_lock = threading.RLock()
+
+
+def _write_packages_parallel(model, packages, incremental, n_workers):
+    """
+    Write packages with a pool of threads.
+
+    Parameters
+    ----------
+    model : model object
+        The model the packages belong to.
+    packages : list
+        The packages to write.
+    incremental : bool
+        Only write the packages that were changed.
+    n_workers : int
+        The number of threads.
+
+    """
+    q = Queue.Queue()
+    for i, p in enumerate(packages):
+        q.put((i, p))
+    errors = {}
+
+    def worker():
+        while True:
+            try:
+                i, p = q.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                model._write_package(p, incremental)
+            except BaseException as e:
+                errors[i] = e
+
+    threads = [threading.Thread(target=worker)
+               for i in range(min(n_workers, len(packages)))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[min(errors)]
+
+
+# ioctl request of linux to clone a file (copy-on-write) on file systems
+# that support it, like btrfs and xfs
+_FICLONE = 0x40049409
+
+
+def _clone_file(src, dst, link):
+    """
+    Make dst a hard link ('hardlink'), a copy-on-write clone ('reflink') or
+    a copy ('copy') of src.  src is copied if it can't be linked or cloned.
+
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if link == 'hardlink':
+        try:
+            os.link(src, dst)
+            return
+        except (AttributeError, OSError):
+            pass
+    elif link == 'reflink':
+        try:
+            import fcntl
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return
+        except (ImportError, IOError, OSError):
+            pass
+    shutil.copyfile(src, dst)
+
 
 def is_exe(fpath):
     return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
@@ -146,6 +224,14 @@ class BaseModel(object):
         self.output_binflag = []
         self.output_packages = []
 
+        # cache for the arrays of lazily loaded Util2d instances
+        self.array_cache = None
+
+        # array format used by write_input
+        self._write_array_format = None
+        # True while write_input(incremental=True) is writing the packages
+        self._write_incremental = False
+
         return
 
     # we don't need these - no need for controlled access to array_free_format
@@ -184,8 +270,9 @@ class BaseModel(object):
         Function to encapsulate next_ext_unit attribute
 
         """
-        next_unit = self._next_ext_unit + 1
-        self._next_ext_unit += 1
+        with external_lock:
+            next_unit = self._next_ext_unit + 1
+            self._next_ext_unit += 1
         return next_unit
 
     def export(self, f, **kwargs):
@@ -568,27 +655,28 @@ class BaseModel(object):
             binary or not. (default is False)
 
         """
-        if fname in self.external_fnames:
-            print("BaseModel.add_external() warning: " +
-                  "replacing existing filename {}".format(fname))
-            idx = self.external_fnames.index(fname)
-            self.external_fnames.pop(idx)
-            self.external_units.pop(idx)
-            self.external_binflag.pop(idx)
-            self.external_output.pop(idx)
-        if unit in self.external_units:
-            print("BaseModel.add_external() warning: " +
-                  "replacing existing unit {}".format(unit))
-            idx = self.external_units.index(unit)
-            self.external_fnames.pop(idx)
-            self.external_units.pop(idx)
-            self.external_binflag.pop(idx)
-            self.external_output.pop(idx)
-
-        self.external_fnames.append(fname)
-        self.external_units.append(unit)
-        self.external_binflag.append(binflag)
-        self.external_output.append(output)
+        with external_lock:
+            if fname in self.external_fnames:
+                print("BaseModel.add_external() warning: " +
+                      "replacing existing filename {}".format(fname))
+                idx = self.external_fnames.index(fname)
+                self.external_fnames.pop(idx)
+                self.external_units.pop(idx)
+                self.external_binflag.pop(idx)
+                self.external_output.pop(idx)
+            if unit in self.external_units:
+                print("BaseModel.add_external() warning: " +
+                      "replacing existing unit {}".format(unit))
+                idx = self.external_units.index(unit)
+                self.external_fnames.pop(idx)
+                self.external_units.pop(idx)
+                self.external_binflag.pop(idx)
+                self.external_output.pop(idx)
+
+            self.external_fnames.append(fname)
+            self.external_units.append(unit)
+            self.external_binflag.append(binflag)
+            self.external_output.append(output)
         return
 
     def remove_external(self, fname=None, unit=None):
@@ -903,15 +991,57 @@ class BaseModel(object):
 
         return None
 
-    def write_input(self, SelPackList=False, check=False):
+    def write_input(self, SelPackList=False, check=False, array_format=None,
+                    incremental=False, n_workers=1):
         """
         Write the input.
 
         Parameters
         ----------
         SelPackList : False or list of packages
+        check : bool
+            run the model check before writing (default is False)
+        array_format : str
+            None to write each array as it is set up (default) or 'binary'
+            to write all non-constant 2-D real arrays of MODFLOW models as
+            binary files that are read with OPEN/CLOSE (or EXTERNAL when
+            the model does not use free format arrays).  The binary files
+            are written in the external_path (or model_ws) directory and
+            are only written again if the array changed since the last
+            write_input.
+        incremental : bool
+            only write the packages that were changed since they were last
+            written (see Package.dirty).  Packages that were not written
+            yet are always written.  External array and list files of the
+            packages that are written are only written again if their
+            contents changed. (default is False)
+        n_workers : int
+            The number of threads used to write the package files and their
+            external arrays.  If packages fail to write, the error of the
+            first of them in package order is raised after all packages
+            were written.  Unit numbers of EXTERNAL arrays (models without
+            free format arrays) depend on the order the packages are
+            written in.  Formatting text arrays and lists holds the Python
+            GIL, so threads mostly help when the writing is bound by file
+            output (binary arrays, slow or network file systems).
+            (default is 1)
 
         """
+        if array_format is not None:
+            array_format = array_format.lower()
+            if array_format != 'binary':
+                raise Exception('BaseModel.write_input() error: ' +
+                                'unsupported array_format: ' +
+                                '{}'.format(array_format))
+        self._write_array_format = array_format
+        self._write_incremental = incremental
+        try:
+            self._write_input(SelPackList, check, incremental, n_workers)
+        finally:
+            self._write_array_format = None
+            self._write_incremental = False
+
+    def _write_input(self, SelPackList, check, incremental, n_workers):
         if check:
             # run check prior to writing input
             self.check(f='{}.chk'.format(self.name), verbose=self.verbose,
@@ -921,30 +1051,21 @@ class BaseModel(object):
             print('\nWriting packages:')
 
         if SelPackList == False:
-            for p in self.packagelist:
-                if self.verbose:
-                    print('   Package: ', p.name[0])
-                # prevent individual package checks from running after
-                # model-level package check above
-                # otherwise checks are run twice
-                # or the model level check procedure would have to be split up
-                # or each package would need a check arguemnt,
-                # or default for package level check would have to be False
-                try:
-                    p.write_file(check=False)
-                except TypeError:
-                    p.write_file()
+            packages = list(self.packagelist)
         else:
+            # a package is only written once, even if it is selected by
+            # more than one entry of SelPackList
+            packages = []
             for pon in SelPackList:
                 for i, p in enumerate(self.packagelist):
-                    if pon in p.name:
-                        if self.verbose:
-                            print('   Package: ', p.name[0])
-                        try:
-                            p.write_file(check=False)
-                        except TypeError:
-                            p.write_file()
-                            break
+                    if pon in p.name and \
+                            not any([p is p2 for p2 in packages]):
+                        packages.append(p)
+        if n_workers > 1 and len(packages) > 1:
+            _write_packages_parallel(self, packages, incremental, n_workers)
+        else:
+            for p in packages:
+                self._write_package(p, incremental)
         if self.verbose:
             print(' ')
         # write name file
@@ -952,6 +1073,156 @@ class BaseModel(object):
         # os.chdir(org_dir)
         return
 
+    def _write_package(self, p, incremental):
+        """
+        Write the file of package p, unless incremental is True and the
+        package was not changed since it was last written.
+
+        """
+        if incremental and not p.dirty:
+            if self.verbose:
+                print('   Package: ', p.name[0], '(unchanged)')
+            return
+        if self.verbose:
+            print('   Package: ', p.name[0])
+        # prevent individual package checks from running after
+        # model-level package check above
+        # otherwise checks are run twice
+        # or the model level check procedure would have to be split up
+        # or each package would need a check arguemnt,
+        # or default for package level check would have to be False
+        utils.util_array._LazyText.release(p.fn_path)
+        # replace the package file instead of writing into a file that may
+        # be linked to other workspaces
+        utils.flopy_io._unlink(p.fn_path)
+        try:
+            p.write_file(check=False)
+        except TypeError:
+            p.write_file()
+        p._set_written()
+
+    def write_ensemble(self, workspaces, modify=None, link='hardlink',
+                       n_workers=1):
+        """
+        Write the input of an ensemble of realizations of the model, e.g.
+        for Monte Carlo runs.  The input is written to the model workspace
+        first (see write_input with incremental=True), which is the base
+        workspace of the ensemble.  For each realization, modify is called
+        and the packages that were changed from the base are written to the
+        workspace of the realization.  The files of the other packages and
+        their external arrays and lists are linked from the base workspace,
+        so only the changed input is written.  The model workspace is
+        changed back to the base workspace at the end.
+
+        Parameters
+        ----------
+        workspaces : list of str
+            The workspaces of the realizations.  They are created if they
+            do not exist.
+        modify : function
+            Called as modify(model, i) to change the model for realization
+            i before it is written.  The changes are not undone, so modify
+            should set every value that differs between realizations.
+            (default is None)
+        link : str
+            'hardlink' to hard link the files of the unchanged packages,
+            'reflink' to make copy-on-write clones of them (on linux file
+            systems that support it, like btrfs and xfs) or 'copy' to copy
+            them.  The files are copied if they can't be linked, e.g. if
+            the workspaces are on another file system.  Hard linked files
+            share their contents with the base workspace, so they should
+            not be edited in place. (default is 'hardlink')
+        n_workers : int
+            The number of threads used to write the packages (see
+            write_input). (default is 1)
+
+        Returns
+        -------
+        written : list of lists
+            The names of the packages that were written for each
+            realization.
+
+        Examples
+        --------
+
+        >>> import numpy as np
+        >>> import flopy
+        >>> m = flopy.modflow.Modflow.load('model.nam', model_ws='base')
+        >>> def modify(m, i):
+        ...     m.lpf.hk = np.random.lognormal(size=m.lpf.hk.shape)
+        >>> ws = ['real{:03d}'.format(i) for i in range(100)]
+        >>> written = m.write_ensemble(ws, modify=modify)
+
+        """
+        link = link.lower()
+        if link not in ('hardlink', 'reflink', 'copy'):
+            raise Exception('BaseModel.write_ensemble() error: ' +
+                            'unsupported link: {}'.format(link))
+        base_ws = self.model_ws
+        self.write_input(incremental=True, n_workers=n_workers)
+
+        # the state and the files (relative to the base workspace) of the
+        # packages in the base workspace
+        base = {}
+        for p in self.packagelist:
+            files = [os.path.relpath(fpth, base_ws)
+                     for fpth in p._get_written_files()
+                     if os.path.exists(fpth)]
+            base[id(p)] = (p, p._get_state(workspace=False), files)
+        # other input files of the name file, e.g. added with add_external
+        extra = [fname for fname, output in zip(self.external_fnames,
+                                                self.external_output)
+                 if not output and not os.path.isabs(fname) and
+                 os.path.isfile(os.path.join(base_ws, fname))]
+
+        written = []
+        try:
+            for i, ws in enumerate(workspaces):
+                if modify is not None:
+                    modify(self, i)
+                self.change_model_ws(ws)
+                changed = []
+                unchanged = []
+                for p in self.packagelist:
+                    b = base.get(id(p))
+                    if b is not None and \
+                            b[1] == p._get_state(workspace=False):
+                        unchanged.extend(b[2])
+                    else:
+                        changed.append(p)
+                changed_files = set()
+                for p in changed:
+                    if id(p) in base:
+                        changed_files.update(base[id(p)][2])
+                clone = []
+                for fname in unchanged + extra:
+                    fname = os.path.normpath(fname)
+                    if fname in changed_files or fname in clone or \
+                            fname.startswith(os.pardir):
+                        continue
+                    clone.append(fname)
+                for fname in clone:
+                    dst = os.path.join(ws, fname)
+                    if not os.path.isdir(os.path.dirname(dst)):
+                        os.makedirs(os.path.dirname(dst))
+                    _clone_file(os.path.join(base_ws, fname), dst, link)
+                # the files of the changed packages may be links to the
+                # base workspace left by an earlier ensemble
+                for fname in changed_files:
+                    dst = os.path.join(ws, fname)
+                    if os.path.lexists(dst):
+                        os.remove(dst)
+                if n_workers > 1 and len(changed) > 1:
+                    _write_packages_parallel(self, changed, False, n_workers)
+                else:
+                    for p in changed:
+                        self._write_package(p, False)
+                self.write_name_file()
+                written.append([p.name[0] for p in changed])
+        finally:
+            self.change_model_ws(base_ws)
+        return written
+
     def write_name_file(self):
         """
         Every Package needs its own writenamefile function
@@ -1297,8 +1568,8 @@ def run_model(exe_name, namefile, model_ws='./',
     def q_output(output, q):
         for line in iter(output.readline, b''):
             q.put(line)
-            # time.sleep(1)
-            # output.close()
+        # end of output
+        q.put(None)
 
     # create a list of arguments to pass to Popen
     argv = [exe_name, namefile]
@@ -1342,36 +1613,30 @@ def run_model(exe_name, namefile, model_ws='./',
     last = datetime.now()
     lastsec = 0.
     while True:
-        try:
-            line = q.get_nowait()
-        except Queue.Empty:
-            pass
-        else:
-            if line == '':
-                break
-            line = line.decode().lower().strip()
-            if line != '':
-                now = datetime.now()
-                dt = now - last
-                tsecs = dt.total_seconds() - lastsec
-                line = "(elapsed:{0})-->{1}".format(tsecs, line)
-                lastsec = tsecs + lastsec
-                buff.append(line)
-                if not silent:
-                    print(line)
-                for fword in failed_words:
-                    if fword in line:
-                        success = False
-                        break
-        if proc.poll() is not None:
+        # wait for the next line instead of polling the queue
+        line = q.get()
+        if line is None:
             break
+        line = line.decode().lower().strip()
+        if line != '':
+            now = datetime.now()
+            dt = now - last
+            tsecs = dt.total_seconds() - lastsec
+            line = "(elapsed:{0})-->{1}".format(tsecs, line)
+            lastsec = tsecs + lastsec
+            buff.append(line)
+            if not silent:
+                print(line)
+            for fword in failed_words:
+                if fword in line:
+                    success = False
+                    break
     proc.wait()
     thread.join(timeout=1)
-    buff.extend(proc.stdout.readlines())
     proc.stdout.close()
 
     for line in buff:
-        if normal_msg in line:
+        if any(msg in line for msg in normal_msg):
             print("success")
             success = True
             break
@@ -1379,3 +1644,197 @@ def run_model(exe_name, namefile, model_ws='./',
     if pause:
         input('Press Enter to continue...')
     return success, buff
+
+
+class RunResult(object):
+    """
+    The result of a model run started by run_models.
+
+    Attributes
+    ----------
+    exe_name : str
+        Executable that was run.
+    namefile : str
+        Namefile of the model.
+    model_ws : str
+        Path to the location of the namefile.
+    success : bool
+        True if the normal termination message was found in the output
+        and the run was not stopped by the timeout.
+    returncode : int
+        Return code of the executable (None if it could not be started).
+    wall_time : float
+        Wall time of the run in seconds.
+    timed_out : bool
+        True if the run was stopped because it took longer than the
+        timeout.
+    message : str
+        Termination message: the output line with the normal termination
+        message, or the last line of output if it was not found, or the
+        error that kept the run from starting.
+    logfile : str
+        File with the stdout and stderr of the run.
+
+    """
+
+    def __init__(self, exe_name, namefile, model_ws, logfile=None):
+        self.exe_name = exe_name
+        self.namefile = namefile
+        self.model_ws = model_ws
+        self.logfile = logfile
+        self.success = False
+        self.returncode = None
+        self.wall_time = 0.
+        self.timed_out = False
+        self.message = ''
+
+    def __repr__(self):
+        s = 'RunResult({0}, success={1}, wall_time={2:.2f}'.format(
+            os.path.join(self.model_ws, self.namefile), self.success,
+            self.wall_time)
+        if self.timed_out:
+            s += ', timed_out=True'
+        return s + ')'
+
+
+def run_models(jobs, n_workers=4, timeout=None,
+               normal_msg='normal termination', cargs=None, log_ext='stdout',
+               silent=True):
+    """
+    Run several models with a pool of worker threads.  Every run is a
+    separate process started with subprocess.Popen; its stdout and stderr
+    are written to a log file in the model workspace, and the worker
+    thread waits for the process to end.
+
+    Parameters
+    ----------
+    jobs : list of tuples
+        (exe_name, namefile, model_ws) for every run.  A fourth item with
+        command line arguments for that run may be added.
+    n_workers : int
+        Maximum number of models that run at the same time (default is 4).
+    timeout : float
+        Maximum wall time of a run in seconds.  Runs that take longer are
+        stopped and are not successful.  Default is None (no timeout).
+    normal_msg : str or list of strings
+        Normal termination message used to determine if a run terminated
+        normally. (default is 'normal termination')
+    cargs : str or list of strings
+        additional command line arguments to pass to the executables.
+        Default is None
+    log_ext : str
+        Extension of the log files.  The log file of a run is the namefile
+        with this extension, in the model workspace. (default is 'stdout')
+    silent : boolean
+        Report every finished run to the screen if False (default is True).
+
+    Returns
+    -------
+    results : list of RunResult
+        The results in the order of jobs.
+
+    Examples
+    --------
+
+    >>> import flopy
+    >>> jobs = [('mf2005', 'model.nam', ws) for ws in ['r001', 'r002']]
+    >>> results = flopy.run_models(jobs, n_workers=2, timeout=3600.)
+    >>> failed = [r.model_ws for r in results if not r.success]
+
+    """
+    if isinstance(normal_msg, str):
+        normal_msg = [normal_msg]
+    normal_msg = [msg.lower() for msg in normal_msg]
+
+    q = Queue.Queue()
+    results = []
+    for i, job in enumerate(jobs):
+        exe_name, namefile, model_ws = job[:3]
+        run_cargs = cargs
+        if len(job) > 3:
+            run_cargs = job[3]
+        logfile = os.path.join(model_ws, '{0}.{1}'.format(
+            os.path.splitext(namefile)[0], log_ext))
+        results.append(RunResult(exe_name, namefile, model_ws, logfile))
+        q.put((results[-1], run_cargs))
+
+    def worker():
+        while True:
+            try:
+                result, run_cargs = q.get_nowait()
+            except Queue.Empty:
+                return
+            _run_job(result, run_cargs, timeout, normal_msg)
+            if not silent:
+                print(result)
+
+    threads = [threading.Thread(target=worker)
+               for i in range(min(n_workers, len(results)))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def _run_job(result, cargs, timeout, normal_msg):
+    """
+    Run a single job of run_models and fill in its RunResult.
+
+    """
+    argv = [result.exe_name, result.namefile]
+    if cargs is not None:
+        if isinstance(cargs, str):
+            cargs = [cargs]
+        argv.extend(cargs)
+    t0 = time.time()
+    try:
+        if which(result.exe_name) is None:
+            raise Exception(
+                'The program {} does not exist or is not executable.'.format(
+                    result.exe_name))
+        if not os.path.isfile(os.path.join(result.model_ws,
+                                           result.namefile)):
+            raise Exception(
+                'The namefile for this model does not exists: {}'.format(
+                    result.namefile))
+        with open(result.logfile, 'wb') as f:
+            proc = sp.Popen(argv, stdout=f, stderr=sp.STDOUT,
+                            cwd=result.model_ws)
+
+            def stop():
+                result.timed_out = True
+                proc.kill()
+
+            timer = None
+            if timeout is not None:
+                timer = threading.Timer(timeout, stop)
+                timer.daemon = True
+                timer.start()
+            result.returncode = proc.wait()
+            if timer is not None:
+                timer.cancel()
+    except Exception as e:
+        result.wall_time = time.time() - t0
+        result.message = str(e)
+        return
+    result.wall_time = time.time() - t0
+
+    # find the termination message in the output
+    last = ''
+    with open(result.logfile, 'rb') as f:
+        for line in f:
+            line = line.decode('utf-8', 'replace').strip()
+            if line == '':
+                continue
+            last = line
+            if any(msg in line.lower() for msg in normal_msg):
+                result.message = line
+                result.success = True
+    if not result.success:
+        result.message = last
+    if result.timed_out:
+        result.success = False
+        result.message = 'stopped after {0} seconds: {1}'.format(
+            timeout, result.message)
@@ -0,0 +1,253 @@
+"""
+mbase_async module
+  This module contains an asyncio based version of mbase.run_model, so
+  one python process can supervise many model runs.  It is only imported
+  by flopy for python 3.5 and later.
+
+"""
+import os
+import re
+import asyncio
+from datetime import datetime
+from .mbase import which
+
+# stdout lines of MODFLOW, SEAWAT and MT3D with the stress period and time
+# step that is solved, and with the outer and inner solver iterations
+_timestep_re = re.compile(r'stress period:?\s*(\d+)\s*,?\s*time step:?\s*'
+                          r'(\d+)', re.IGNORECASE)
+_iteration_re = re.compile(r'outer iter(?:\.|ation)?:?\s*(\d+)\s*,?\s*'
+                           r'inner iter(?:\.|ation)?:?\s*(\d+)',
+                           re.IGNORECASE)
+
+
+class AsyncModelRun(object):
+    """
+    A model run started with asyncio.create_subprocess_exec.  The stdout
+    lines of the model are read with an async iterator.
+
+    Parameters
+    ----------
+    exe_name : str
+        Executable name (with path, if necessary) to run.
+    namefile : str
+        Namefile of model to run. The namefile must be the
+        filename of the namefile without the path.
+    model_ws : str
+        Path to the location of the namefile. (default is the
+        current working directory - './')
+    normal_msg : str or list of strings
+        Normal termination message used to determine if the
+        run terminated normally. (default is 'normal termination')
+    cargs : str or list of strings
+        additional command line arguments to pass to the executable.
+        Default is None
+    timestep_callback : function
+        Called as timestep_callback(kper, kstp) with zero-based stress
+        period and time step for every stdout line that reports the time
+        step that is solved.  Default is None
+    iteration_callback : function
+        Called as iteration_callback(outer, inner) with the outer and inner
+        iteration counts for every stdout line that reports solver
+        iterations.  Default is None
+
+    Attributes
+    ----------
+    success : boolean
+        True if the normal termination message was found in stdout.
+    returncode : int
+        Return code of the executable, None while it runs.
+    kper, kstp : int
+        Last zero-based stress period and time step that was reported.
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> import flopy
+    >>> async def watch(ws):
+    ...     run = flopy.AsyncModelRun('mf2005', 'model.nam', model_ws=ws)
+    ...     await run.start()
+    ...     async for line in run:
+    ...         print(ws, line)
+    ...     return await run.wait()
+    >>> loop = asyncio.get_event_loop()
+    >>> loop.run_until_complete(asyncio.gather(watch('r1'), watch('r2')))
+
+    """
+
+    def __init__(self, exe_name, namefile, model_ws='./',
+                 normal_msg='normal termination', cargs=None,
+                 timestep_callback=None, iteration_callback=None):
+        self.exe_name = exe_name
+        self.namefile = namefile
+        self.model_ws = model_ws
+        if isinstance(normal_msg, str):
+            normal_msg = [normal_msg]
+        self.normal_msg = [msg.lower() for msg in normal_msg]
+        if isinstance(cargs, str):
+            cargs = [cargs]
+        self.cargs = cargs
+        self.timestep_callback = timestep_callback
+        self.iteration_callback = iteration_callback
+        self.success = False
+        self.returncode = None
+        self.kper = None
+        self.kstp = None
+        self.proc = None
+
+    async def start(self):
+        """
+        Start the model executable.
+
+        """
+        exe = which(self.exe_name)
+        if exe is None:
+            import platform
+            if platform.system() in 'Windows':
+                if not self.exe_name.lower().endswith('.exe'):
+                    exe = which(self.exe_name + '.exe')
+        if exe is None:
+            s = 'The program {} does not exist or is not executable.'.format(
+                self.exe_name)
+            raise Exception(s)
+        if not os.path.isfile(os.path.join(self.model_ws, self.namefile)):
+            s = 'The namefile for this model does not exists: {}'.format(
+                self.namefile)
+            raise Exception(s)
+
+        argv = [self.exe_name, self.namefile]
+        if self.cargs is not None:
+            argv.extend(self.cargs)
+        self.proc = await asyncio.create_subprocess_exec(
+            *argv, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT, cwd=self.model_ws)
+        return self
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.proc is None:
+            await self.start()
+        line = await self.proc.stdout.readline()
+        if not line:
+            raise StopAsyncIteration
+        line = line.decode('utf-8', 'replace').rstrip('\r\n')
+        self._parse(line)
+        return line
+
+    def _parse(self, line):
+        """
+        Check a stdout line for normal termination and progress.
+
+        """
+        lower = line.lower()
+        for msg in self.normal_msg:
+            if msg in lower:
+                self.success = True
+        m = _timestep_re.search(line)
+        if m is not None:
+            self.kper = int(m.group(1)) - 1
+            self.kstp = int(m.group(2)) - 1
+            if self.timestep_callback is not None:
+                self.timestep_callback(self.kper, self.kstp)
+        m = _iteration_re.search(line)
+        if m is not None and self.iteration_callback is not None:
+            self.iteration_callback(int(m.group(1)), int(m.group(2)))
+
+    async def wait(self):
+        """
+        Read the remaining stdout lines and wait for the model to end.
+
+        Returns
+        -------
+        success : boolean
+
+        """
+        async for line in self:
+            pass
+        self.returncode = await self.proc.wait()
+        return self.success
+
+    def kill(self):
+        """
+        Stop the model executable.
+
+        """
+        if self.proc is not None and self.returncode is None:
+            self.proc.kill()
+
+
+async def run_model_async(exe_name, namefile, model_ws='./',
+                          silent=False, report=False,
+                          normal_msg='normal termination', cargs=None,
+                          timestep_callback=None, iteration_callback=None):
+    """
+    This coroutine will run the model using
+    asyncio.create_subprocess_exec.  The model's stdout is read without
+    blocking the event loop, so many models can run concurrently, e.g.
+    with asyncio.gather.
+
+    Parameters
+    ----------
+    exe_name : str
+        Executable name (with path, if necessary) to run.
+    namefile : str
+        Namefile of model to run. The namefile must be the
+        filename of the namefile without the path.
+    model_ws : str
+        Path to the location of the namefile. (default is the
+        current working directory - './')
+    silent : boolean
+        Echo run information to screen (default is False).
+    report : boolean, optional
+        Save stdout lines to a list (buff) which is returned
+        by the method . (default is False).
+    normal_msg : str or list of strings
+        Normal termination message used to determine if the
+        run terminated normally. (default is 'normal termination')
+    cargs : str or list of strings
+        additional command line arguments to pass to the executable.
+        Default is None
+    timestep_callback : function
+        Called as timestep_callback(kper, kstp) with zero-based stress
+        period and time step when the model reports a time step.
+        Default is None
+    iteration_callback : function
+        Called as iteration_callback(outer, inner) when the model reports
+        solver iterations.  Default is None
+
+    Returns
+    -------
+    (success, buff)
+    success : boolean
+    buff : list of lines of stdout
+
+    Examples
+    --------
+
+    >>> import asyncio
+    >>> import flopy
+    >>> runs = [flopy.run_model_async('mf2005', 'model.nam', model_ws=ws,
+    ...                               silent=True) for ws in ['r1', 'r2']]
+    >>> loop = asyncio.get_event_loop()
+    >>> results = loop.run_until_complete(asyncio.gather(*runs))
+
+    """
+    run = AsyncModelRun(exe_name, namefile, model_ws=model_ws,
+                        normal_msg=normal_msg, cargs=cargs,
+                        timestep_callback=timestep_callback,
+                        iteration_callback=iteration_callback)
+    await run.start()
+    buff = []
+    last = datetime.now()
+    async for line in run:
+        if not silent:
+            now = datetime.now()
+            print('(elapsed:{0})-->{1}'.format(
+                (now - last).total_seconds(), line))
+            last = now
+        if report:
+            buff.append(line)
+    success = await run.wait()
+    return success, buff
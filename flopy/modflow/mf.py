@@ -10,7 +10,7 @@ import inspect
 import flopy
 from ..mbase import BaseModel
 from ..pakbase import Package
-from ..utils import mfreadnam, SpatialReference
+from ..utils import mfreadnam, SpatialReference, ArrayCache
 from .mfpar import ModflowPar
 
 
@@ -425,7 +425,8 @@ class Modflow(BaseModel):
 
     @staticmethod
     def load(f, version='mf2005', exe_name='mf2005.exe', verbose=False,
-             model_ws='.', load_only=None, forgive=True, check=True):
+             model_ws='.', load_only=None, forgive=True, check=True,
+             lazy=False):
         """
         Load an existing model.
 
@@ -442,6 +443,14 @@ class Modflow(BaseModel):
 
         check : boolean
             Check model input for common errors. (default True)
+
+        lazy : boolean
+            Keep the text of the arrays read from text files and only parse
+            an array the first time it is used.  Parsed arrays are kept in
+            ml.array_cache, a size-limited least-recently-used cache.
+            Arrays that are not changed are written back by copying the
+            original text.  (default False)
+
         Returns
         -------
         ml : Modflow object
@@ -466,6 +475,8 @@ class Modflow(BaseModel):
                              format(modelname, 50 * '-'))
         ml = Modflow(modelname, version=version, exe_name=exe_name,
                      verbose=verbose, model_ws=model_ws)
+        if lazy:
+            ml.array_cache = ArrayCache()
 
         files_succesfully_loaded = []
         files_not_loaded = []
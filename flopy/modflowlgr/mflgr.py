@@ -168,13 +168,23 @@ class ModflowLgr(BaseModel):
         except:
             return None
 
-    def write_input(self, SelPackList=False, check=False):
+    def write_input(self, SelPackList=False, check=False, array_format=None,
+                    incremental=False, n_workers=1):
         """
         Write the input. Overrides BaseModels's write_input
 
         Parameters
         ----------
         SelPackList : False or list of packages
+        check : bool
+            run the model check before writing (default is False)
+        array_format : str
+            None or 'binary' (see BaseModel.write_input)
+        incremental : bool
+            only write changed packages (see BaseModel.write_input)
+        n_workers : int
+            the number of threads used to write the packages of each model
+            (see BaseModel.write_input)
 
         """
         if check:
@@ -188,11 +198,15 @@ class ModflowLgr(BaseModel):
         self.write_name_file()
 
         # write MODFLOW files for parent model
-        self.parent.write_input(SelPackList=SelPackList, check=check)
+        self.parent.write_input(SelPackList=SelPackList, check=check,
+                                array_format=array_format,
+                                incremental=incremental, n_workers=n_workers)
 
         # write MODFLOW files for the children models
         for child in self.children_models:
-            child.write_input(SelPackList=SelPackList, check=check)
+            child.write_input(SelPackList=SelPackList, check=check,
+                              array_format=array_format,
+                              incremental=incremental, n_workers=n_workers)
 
     def _padline(self, line, comment=None, line_len=79):
         if len(line) < line_len:
@@ -8,13 +8,55 @@ pakbase module
 from __future__ import print_function
 
 import os
+import numbers
+import hashlib
 import webbrowser as wb
 
 import numpy as np
 from numpy.lib.recfunctions import stack_arrays
 
 from .modflow.mfparbc import ModflowParBc as mfparbc
-from .utils import Util2d, Util3d, Transient2d, MfList, check
+from .utils import Util2d, Util3d, Transient2d, Transient3d, MfList, \
+    SpatialReference, check
+
+
+def _get_value_state(value):
+    """
+    get a token for value that changes when value is changed.  Objects
+    that can't be compared get a new token every time.
+    """
+    if isinstance(value, (Util2d, Util3d, Transient2d, Transient3d, MfList)):
+        return value._get_state()
+    elif isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            return object()
+        return value.dtype, value.shape, \
+               hashlib.md5(np.ascontiguousarray(value).tostring()).hexdigest()
+    elif isinstance(value, (list, tuple)):
+        return tuple([_get_value_state(v) for v in value])
+    elif isinstance(value, dict):
+        return tuple([(k, _get_value_state(v)) for k, v in value.items()])
+    elif isinstance(value, SpatialReference):
+        # the spatial reference is written as its repr
+        return repr(value)
+    elif value is None or isinstance(value, (numbers.Number, str, bytes,
+                                             type, np.dtype)):
+        return value
+    return object()
+
+
+def _get_value_files(value):
+    """
+    get the external files that were written for value
+    """
+    if isinstance(value, (Util2d, Util3d, Transient2d, Transient3d, MfList)):
+        return value._get_written_files()
+    elif isinstance(value, (list, tuple)):
+        return [fpth for v in value for fpth in _get_value_files(v)]
+    elif isinstance(value, dict):
+        return [fpth for v in value.values()
+                for fpth in _get_value_files(v)]
+    return []
 
 
 class Package(object):
@@ -160,6 +202,68 @@ class Package(object):
         from flopy import export
         return export.utils.package_helper(f, self, **kwargs)
 
+    @property
+    def dirty(self):
+        """
+        True if the package was changed since it was last written by
+        write_input (or was not written yet).  Changes to the package data
+        (Util2d, Util3d, Transient2d, MfList and other attributes), to the
+        model dimensions, array format and external path, and to the
+        package file are detected.
+
+        """
+        written = getattr(self, '_written_state', None)
+        if written is None:
+            return True
+        return written[0] != self._get_file_state() or \
+               written[1] != self._get_state()
+
+    def _set_written(self):
+        """
+        remember the state of the package after it was written
+        """
+        self._written_state = (self._get_file_state(), self._get_state())
+
+    def _get_file_state(self):
+        if not os.path.exists(self.fn_path):
+            return None
+        st = os.stat(self.fn_path)
+        return self.fn_path, st.st_mtime, st.st_size
+
+    def _get_state(self, workspace=True):
+        """
+        get a token that changes when the package data are changed.  The
+        path of the package file is left out if workspace is False.
+        """
+        model = self.parent
+        try:
+            dims = model.get_nrow_ncol_nlay_nper()
+        except:
+            dims = None
+        state = [dims, model.array_free_format, model.external_path,
+                 getattr(model, '_write_array_format', None)]
+        for key, value in sorted(vars(self).items()):
+            if key in ('parent', '_written_state'):
+                continue
+            if key == 'fn_path' and not workspace:
+                continue
+            state.append((key, _get_value_state(value)))
+        return tuple(state)
+
+    def _get_written_files(self):
+        """
+        get the package file and the external array and list files that
+        were written for the package
+        """
+        files = [self.fn_path]
+        for key, value in sorted(vars(self).items()):
+            if key == 'parent':
+                continue
+            for fpth in _get_value_files(value):
+                if fpth not in files:
+                    files.append(fpth)
+        return files
+
     @staticmethod
     def add_to_dtype(dtype, field_names, field_types):
         if not isinstance(field_names, list):
@@ -611,6 +715,70 @@ class Package(object):
         print('IMPLEMENTATION ERROR: write_file must be overloaded')
         return
 
+    @staticmethod
+    def _read_list_lines(lines, current):
+        """
+        Fill a recarray with the values in lines of list input.
+
+        The whitespace separated (free format) fields of a line are used if
+        the line has enough of them, otherwise fields that are 10
+        characters wide (fixed format) are used.  Fields beyond the number
+        of fields in current are ignored.  The lines are split into fields
+        as a single block and each column is cast to the type of the
+        corresponding field of current in one operation.  The lines are
+        only cast one at a time if that fails.
+
+        Parameters
+        ----------
+        lines : list of strings
+            The lines to read, one for each row of current.
+        current : numpy recarray
+            The array to fill.
+
+        """
+        names = current.dtype.names
+        nfield = len(names)
+        nlines = len(lines)
+        try:
+            text = ''.join(lines)
+            if not isinstance(text, bytes):
+                text = text.encode('ascii')
+            # number of free format fields in each line
+            c = np.frombuffer(text, dtype=np.uint8)
+            blank = c <= 32
+            start = ~blank
+            start[1:] &= blank[:-1]
+            iline = np.cumsum(c == 10)
+            counts = np.bincount(iline[start], minlength=nlines)[:nlines]
+            tokens = np.array(text.split(), dtype=bytes)
+            rows = np.zeros((nlines, nfield),
+                            dtype='S{}'.format(max(tokens.itemsize, 10)))
+            free = counts >= nfield
+            first = np.cumsum(counts) - counts
+            rows[free] = tokens[first[free, None] + np.arange(nfield)]
+            for ibnd in np.where(~free)[0]:
+                line = lines[ibnd]
+                rows[ibnd] = [line[istart:istart + 10]
+                              for istart in range(0, 10 * nfield, 10)]
+            for i, name in enumerate(names):
+                if current.dtype[name].kind in 'fiu':
+                    current[name] = rows[:, i].astype(current.dtype[name])
+                else:
+                    current[name] = [v.strip().decode() for v in rows[:, i]]
+        except:
+            for ibnd, line in enumerate(lines):
+                try:
+                    t = line.strip().split()
+                    current[ibnd] = tuple(t[:nfield])
+                except:
+                    t = []
+                    for ivar in range(nfield):
+                        istart = ivar * 10
+                        istop = istart + 10
+                        t.append(line[istart:istop])
+                    current[ibnd] = tuple(t[:nfield])
+        return
+
     @staticmethod
     def load(model, pack_type, f, nper=None, pop_key_list=None, check=True,
              unitnumber=None, ext_unit_dict=None):
@@ -727,49 +895,42 @@ class Package(object):
             elif itmp > 0:
                 current = pack_type.get_empty(itmp, aux_names=aux_names,
                                               structured=model.structured)
-                for ibnd in range(itmp):
-                    line = f.readline()
-                    if "open/close" in line.lower():
-                        # need to strip out existing path seps and
-                        # replace current-system path seps
-                        raw = line.strip().split()
-                        fname = raw[1]
-                        if '/' in fname:
-                            raw = fname.split('/')
-                        elif '\\' in fname:
-                            raw = fname.split('\\')
-                        else:
-                            raw = [fname]
-                        fname = os.path.join(*raw)
-                        oc_filename = os.path.join(model.model_ws, fname)
-                        assert os.path.exists(
-                            oc_filename), "Package.load() error: open/close filename " + \
-                                          oc_filename + " not found"
-                        try:
-                            current = np.genfromtxt(oc_filename,
-                                                    dtype=current.dtype)
-                            current = current.view(np.recarray)
-                        except Exception as e:
-                            raise Exception(
-                                "Package.load() error loading open/close file " + oc_filename + \
-                                " :" + str(e))
-                        assert current.shape[
-                                   0] == itmp, "Package.load() error: open/close rec array from file " + \
-                                               oc_filename + " shape (" + str(
-                            current.shape) + \
-                                               ") does not match itmp: {0:d}".format(
-                                                   itmp)
-                        break
+                line = f.readline()
+                if "open/close" in line.lower():
+                    # need to strip out existing path seps and
+                    # replace current-system path seps
+                    raw = line.strip().split()
+                    fname = raw[1]
+                    if '/' in fname:
+                        raw = fname.split('/')
+                    elif '\\' in fname:
+                        raw = fname.split('\\')
+                    else:
+                        raw = [fname]
+                    fname = os.path.join(*raw)
+                    oc_filename = os.path.join(model.model_ws, fname)
+                    assert os.path.exists(
+                        oc_filename), "Package.load() error: open/close filename " + \
+                                      oc_filename + " not found"
                     try:
-                        t = line.strip().split()
-                        current[ibnd] = tuple(t[:len(current.dtype.names)])
-                    except:
-                        t = []
-                        for ivar in range(len(current.dtype.names)):
-                            istart = ivar * 10
-                            istop = istart + 10
-                            t.append(line[istart:istop])
-                        current[ibnd] = tuple(t[:len(current.dtype.names)])
+                        current = np.genfromtxt(oc_filename,
+                                                dtype=current.dtype)
+                        current = current.view(np.recarray)
+                    except Exception as e:
+                        raise Exception(
+                            "Package.load() error loading open/close file " + oc_filename + \
+                            " :" + str(e))
+                    assert current.shape[
+                               0] == itmp, "Package.load() error: open/close rec array from file " + \
+                                           oc_filename + " shape (" + str(
+                        current.shape) + \
+                                           ") does not match itmp: {0:d}".format(
+                                               itmp)
+                else:
+                    lines = [line]
+                    for ibnd in range(itmp - 1):
+                        lines.append(f.readline())
+                    Package._read_list_lines(lines, current)
 
                 # convert indices to zero-based
                 if model.structured:
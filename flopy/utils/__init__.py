@@ -21,8 +21,9 @@
 
     """
 from .mfreadnam import parsenamefile
-from .util_array import Util3d, Util2d, Transient2d, Transient3d, read1d
-from .util_list import MfList
+from .util_array import Util3d, Util2d, Transient2d, Transient3d, read1d, \
+    ArrayCache
+from .util_list import MfList, Sparse4d
 from .binaryfile import BinaryHeader, HeadFile, UcnFile, CellBudgetFile
 from .formattedfile import FormattedHeadFile
 from .modpathfile import PathlineFile, EndpointFile
@@ -35,7 +36,8 @@ from .mflistfile import MfListBudget, MfusgListBudget, SwtListBudget, \
 from .check import check, get_neighbors
 from .utils_def import FlopyBinaryData, totim_to_datetime
 from .flopy_io import read_fixed_var, write_fixed_var
-from .zonbud import ZoneBudget, read_zbarray, write_zbarray
+from .zonbud import ZoneBudget, read_zbarray, write_zbarray, \
+    get_zonebudgets
 from .mfgrdfile import MfGrdFile
 from .postprocessing import get_transmissivities
 from .sfroutputfile import SfrFile
@@ -8,6 +8,8 @@ important classes that can be accessed by the user.
 
 """
 from __future__ import print_function
+import os
+import struct
 import numpy as np
 import warnings
 from collections import OrderedDict
@@ -221,6 +223,87 @@ def get_headfile_precision(filename):
     return result
 
 
+def _index_sidecar_key(obj):
+    """
+    Return the key that identifies the index of a binary file.  The key
+    includes the file size and modification time so that a stale index
+    is never used.
+
+    """
+    stat = os.stat(obj.filename)
+    text = getattr(obj, 'text', b'')
+    if isinstance(text, bytes):
+        text = text.decode()
+    return '{}|{}|{}|{}|{!r}'.format(obj.__class__.__name__, obj.precision,
+                                     text, stat.st_size, stat.st_mtime)
+
+
+def _read_index_sidecar(obj, attributes):
+    """
+    Set the index attributes of obj from the sidecar file of obj.filename.
+
+    Parameters
+    ----------
+    obj : BinaryLayerFile or CellBudgetFile
+    attributes : dict
+        Dictionary of attribute names and their storage kind ('scalar',
+        'array', 'list', or 'tuplelist').
+
+    Returns
+    -------
+    success : bool
+        True if the sidecar exists, matches the file, and was loaded.
+
+    """
+    fname = obj.filename + '.idx'
+    if not os.path.isfile(fname):
+        return False
+    try:
+        with open(fname, 'rb') as f:
+            npz = np.load(f, allow_pickle=False)
+            if str(npz['key'][()]) != _index_sidecar_key(obj):
+                return False
+            values = {}
+            for name, kind in attributes.items():
+                v = npz[name]
+                if kind == 'scalar':
+                    v = v[()]
+                elif kind == 'list':
+                    v = list(v)
+                elif kind == 'tuplelist':
+                    v = [tuple(t) for t in v]
+                values[name] = v
+    except Exception as e:
+        if obj.verbose:
+            print('could not read index file {}: {}'.format(fname, e))
+        return False
+    for name, v in values.items():
+        setattr(obj, name, v)
+    return True
+
+
+def _write_index_sidecar(obj, attributes):
+    """
+    Write the index attributes of obj to the sidecar file of obj.filename.
+    Failure to write the sidecar (for example, in a read-only directory)
+    is not an error.
+
+    """
+    fname = obj.filename + '.idx'
+    arrays = {'key': np.array(_index_sidecar_key(obj))}
+    for name in attributes:
+        arrays[name] = np.asarray(getattr(obj, name))
+    try:
+        with open(fname, 'wb') as f:
+            np.savez(f, **arrays)
+    except Exception as e:
+        if obj.verbose:
+            print('could not write index file {}: {}'.format(fname, e))
+        if os.path.isfile(fname):
+            os.remove(fname)
+    return
+
+
 class BinaryLayerFile(LayerFile):
     """
     The BinaryLayerFile class is the super class from which specific derived
@@ -228,15 +311,40 @@ class BinaryLayerFile(LayerFile):
 
     """
 
+    _index_attributes = {'nrow': 'scalar', 'ncol': 'scalar',
+                         'nlay': 'scalar', 'totalbytes': 'scalar',
+                         'databytes': 'scalar', 'recordarray': 'array',
+                         'iposarray': 'array', 'times': 'list',
+                         'kstpkper': 'tuplelist'}
+
     def __init__(self, filename, precision, verbose, kwargs):
+        self.memmap = kwargs.pop('memmap', False)
+        self.cache_index = kwargs.pop('cache_index', False)
+        self.mmap = None
         super(BinaryLayerFile, self).__init__(filename, precision, verbose,
                                               kwargs)
+        if self.memmap:
+            self.mmap = np.memmap(self.filename, dtype=np.uint8, mode='r')
         return
 
     def _build_index(self):
         """
         Build the recordarray and iposarray, which maps the header information
-        to the position in the binary file.
+        to the position in the binary file.  If cache_index is True, the
+        index is loaded from (or saved to) a sidecar file.
+
+        """
+        if self.cache_index:
+            if _read_index_sidecar(self, self._index_attributes):
+                return
+        self._scan_index()
+        if self.cache_index:
+            _write_index_sidecar(self, self._index_attributes)
+        return
+
+    def _scan_index(self):
+        """
+        Read through the file header by header to build the index.
 
         """
         header = self._get_header()
@@ -248,19 +356,38 @@ class BinaryLayerFile(LayerFile):
             s = 'Possible error. ncol ({}) * nrow ({}) > 10,000,000 '
             s = s.format(self.ncol, self.nrow)
             warnings.warn(s)
-        self.file.seek(0, 2)
-        self.totalbytes = self.file.tell()
-        self.file.seek(0, 0)
         self.databytes = np.int64(header['ncol']) * \
                          np.int64(header['nrow']) * \
                          np.int64(self.realtype(1).nbytes)
-        ipos = 0
-        while ipos < self.totalbytes:
+        headers, iposarray = self._scan_records(0)
+
+        # self.recordarray contains a recordarray of all the headers.
+        self.recordarray = np.array(headers, dtype=self.header_dtype)
+        self.iposarray = np.array(iposarray)
+        self.nlay = np.max(self.recordarray['ilay'])
+        return
+
+    def _scan_records(self, ipos):
+        """
+        Read the headers of the complete records from offset ipos to the
+        end of the file, and add their times and kstpkper.  Returns the
+        headers and the positions of the data.  A record at the end of the
+        file that was not completely written yet is left out.
+
+        """
+        headers = []
+        iposarray = []
+        self.file.seek(0, 2)
+        self.totalbytes = self.file.tell()
+        self.file.seek(ipos, 0)
+        hbytes = self.header_dtype.itemsize
+        while ipos + hbytes + self.databytes <= self.totalbytes:
             header = self._get_header()
-            self.recordarray.append(header)
+            headers.append(header)
             if self.text.upper() not in header['text']:
+                ipos = self.file.tell()
                 continue
-            if ipos == 0:
+            if len(self.times) == 0:
                 self.times.append(header['totim'])
                 kstpkper = (header['kstp'], header['kper'])
                 self.kstpkper.append(kstpkper)
@@ -271,20 +398,173 @@ class BinaryLayerFile(LayerFile):
                     kstpkper = (header['kstp'], header['kper'])
                     self.kstpkper.append(kstpkper)
             ipos = self.file.tell()
-            self.iposarray.append(ipos)
+            iposarray.append(ipos)
             self.file.seek(self.databytes, 1)
             ipos = self.file.tell()
+        self._ipos_end = ipos
+        return headers, iposarray
 
-        # self.recordarray contains a recordarray of all the headers.
-        self.recordarray = np.array(self.recordarray, dtype=self.header_dtype)
-        self.iposarray = np.array(self.iposarray)
+    def refresh(self):
+        """
+        Add the records that were written to the file since the index was
+        built, e.g. while the model is still running.  The file is read
+        from the end of the last complete record on, so the headers that
+        were read before are not read again.
+
+        Returns
+        -------
+        n : int
+            The number of new records.
+
+        Examples
+        --------
+        >>> import time
+        >>> import flopy
+        >>> hdobj = flopy.utils.HeadFile('test.hds')
+        >>> while True:
+        ...     if hdobj.refresh() > 0:
+        ...         print(hdobj.get_times()[-1], hdobj.get_data().max())
+        ...     time.sleep(10.)
+
+        """
+        ipos = getattr(self, '_ipos_end', None)
+        if ipos is None:
+            # the index was read from the sidecar file
+            ipos = int(self.iposarray[-1] + self.databytes)
+        headers, iposarray = self._scan_records(ipos)
+        if len(headers) == 0:
+            return 0
+        self.recordarray = np.concatenate(
+            (self.recordarray, np.array(headers, dtype=self.header_dtype)))
+        self.iposarray = np.concatenate((self.iposarray,
+                                         np.array(iposarray)))
         self.nlay = np.max(self.recordarray['ilay'])
-        return
+        if self.mmap is not None:
+            self.mmap = np.memmap(self.filename, dtype=np.uint8, mode='r')
+        return len(headers)
 
     def _read_data(self):
         return binaryread(self.file, self.realtype,
                           shape=(self.nrow, self.ncol))
 
+    def _get_record_view(self, irec):
+        """
+        Return a read-only (nrow, ncol) view of the data for record irec
+        in the memory-mapped file.
+
+        """
+        return np.ndarray(shape=(self.nrow, self.ncol), dtype=self.realtype,
+                          buffer=self.mmap, offset=int(self.iposarray[irec]))
+
+    def _get_strided_view(self, irecs):
+        """
+        Return a read-only (len(irecs), nrow, ncol) view of the memory-mapped
+        file if the data for records irecs are evenly spaced in the file.
+        None is returned if the records cannot be represented by a single
+        strided view.
+
+        """
+        ipos = np.asarray(self.iposarray[irecs], dtype=np.int64)
+        if ipos.shape[0] == 0:
+            return None
+        if ipos.shape[0] > 1:
+            stride = np.diff(ipos)
+            if stride[0] <= 0 or not np.all(stride == stride[0]):
+                return None
+            stride = int(stride[0])
+        else:
+            stride = int(self.databytes)
+        itemsize = self.realtype(1).nbytes
+        return np.ndarray(shape=(ipos.shape[0], self.nrow, self.ncol),
+                          dtype=self.realtype, buffer=self.mmap,
+                          offset=int(ipos[0]),
+                          strides=(stride, self.ncol * itemsize, itemsize))
+
+    def _get_data_array(self, totim=0):
+        """
+        Get the three dimensional data array for the specified totim value.
+        If the file is memory-mapped and the layers for totim are stored
+        in order a zero-copy view of the file is returned.
+
+        """
+        if self.mmap is None:
+            return super(BinaryLayerFile, self)._get_data_array(totim)
+
+        if totim > 0.:
+            keyindices = np.where((self.recordarray['totim'] == totim))[0]
+            if len(keyindices) == 0:
+                msg = 'totim value ({}) not found in file...'.format(totim)
+                raise Exception(msg)
+        else:
+            raise Exception('Data not found...')
+
+        ilay = self.recordarray['ilay'][keyindices]
+        if np.array_equal(ilay, np.arange(1, self.nlay + 1)):
+            data = self._get_strided_view(keyindices)
+            if data is not None:
+                return data
+
+        # layers are missing or out of order - copy from the mapped file
+        data = np.empty((self.nlay, self.nrow, self.ncol),
+                        dtype=self.realtype)
+        data[:, :, :] = np.nan
+        for idx, k in zip(keyindices, ilay):
+            data[k - 1, :, :] = self._get_record_view(idx)
+        return data
+
+    def get_alldata(self, mflay=None, nodata=-9999):
+        """
+        Get all of the data from the file.
+
+        Parameters
+        ----------
+        mflay : integer
+           MODFLOW zero-based layer number to return.  If None, then all
+           all layers will be included. (Default is None.)
+
+        nodata : float
+           The nodata value in the data array.  All array values that have the
+           nodata value will be assigned np.nan.  If nodata is None, values
+           are not replaced and, for memory-mapped files with a regular
+           record layout, a zero-copy view of the file is returned.
+
+        Returns
+        ----------
+        data : numpy array
+            Array has size (ntimes, nlay, nrow, ncol) if mflay is None or it
+            has size (ntimes, nrow, ncol) if mlay is specified.
+
+        """
+        if self.mmap is None:
+            return super(BinaryLayerFile, self).get_alldata(mflay=mflay,
+                                                            nodata=nodata)
+        ntimes = len(self.times)
+        nrecords = self.recordarray.shape[0]
+        ilay = np.tile(np.arange(1, self.nlay + 1), ntimes)
+        rv = None
+        if nrecords == ntimes * self.nlay and \
+                np.array_equal(self.recordarray['ilay'], ilay):
+            rv = self._get_strided_view(np.arange(nrecords))
+        if rv is None:
+            return super(BinaryLayerFile, self).get_alldata(mflay=mflay,
+                                                            nodata=nodata)
+        rv = rv.reshape((ntimes, self.nlay, self.nrow, self.ncol))
+        if mflay is not None:
+            rv = rv[:, mflay, :, :]
+        if nodata is not None:
+            rv = np.array(rv)
+            rv[rv == nodata] = np.nan
+        return rv
+
+    def close(self):
+        """
+        Close the file handle and release the memory map.
+
+        """
+        self.mmap = None
+        super(BinaryLayerFile, self).close()
+        return
+
     def _get_header(self):
         """
         Read the file header
@@ -293,7 +573,7 @@ class BinaryLayerFile(LayerFile):
         header = binaryread(self.file, self.header_dtype, (1,))
         return header[0]
 
-    def get_ts(self, idx):
+    def get_ts(self, idx, totim_range=None):
         """
         Get a time series from the binary file.
 
@@ -303,6 +583,10 @@ class BinaryLayerFile(LayerFile):
             idx can be (layer, row, column) or it can be a list in the form
             [(layer, row, column), (layer, row, column), ...].  The layer,
             row, and column values must be zero based.
+        totim_range : tuple of floats
+            Optional (tmin, tmax) simulation time window.  Only times with
+            tmin <= totim <= tmax are returned.  Either value can be None to
+            leave that side of the window open.  (Default is None.)
 
         Returns
         ----------
@@ -319,35 +603,68 @@ class BinaryLayerFile(LayerFile):
         The layer, row, and column values must be zero-based, and must be
         within the following ranges: 0 <= k < nlay; 0 <= i < nrow; 0 <= j < ncol
 
+        The cells are grouped by layer and each record in the file is read
+        at most once.  For each record only the block of values spanning
+        the requested cells in that layer is read and the values are
+        gathered with fancy indexing.
+
         Examples
         --------
 
+        >>> import flopy.utils.binaryfile as bf
+        >>> hdobj = bf.HeadFile('model.hds')
+        >>> ts = hdobj.get_ts([(0, 10, 10), (2, 5, 7)],
+        ...                   totim_range=(100., 365.))
+
         """
         kijlist = self._build_kijlist(idx)
         nstation = self._get_nstation(idx, kijlist)
 
         # Initialize result array and put times in first column
         result = self._init_result(nstation)
-
-        istat = 1
-        for k, i, j in kijlist:
-            recordlist = []
-            ioffset = (i * self.ncol + j) * self.realtype(1).nbytes
-            for irec, header in enumerate(self.recordarray):
-                ilay = header[
-                           'ilay'] - 1  # change ilay from header to zero-based
-                if ilay != k:
-                    continue
-                ipos = np.long(self.iposarray[irec])
-
-                # Calculate offset necessary to reach intended cell
-                self.file.seek(ipos + np.long(ioffset), 0)
-
-                # Find the time index and then put value into result in the
-                # correct location.
-                itim = np.where(result[:, 0] == header['totim'])[0]
-                result[itim, istat] = binaryread(self.file, self.realtype)
-            istat += 1
+        if totim_range is not None:
+            tmin, tmax = totim_range
+            keep = np.ones(result.shape[0], dtype=bool)
+            if tmin is not None:
+                keep &= result[:, 0] >= tmin
+            if tmax is not None:
+                keep &= result[:, 0] <= tmax
+            result = result[keep, :]
+
+        # map each totim in the result to its row
+        itimdict = {}
+        for itim, totim in enumerate(result[:, 0]):
+            itimdict.setdefault(totim, []).append(itim)
+
+        # group the stations by layer
+        kij = np.array(kijlist, dtype=np.int64).reshape(-1, 3)
+        nodes = kij[:, 1] * self.ncol + kij[:, 2]
+        layers = {}
+        for k in np.unique(kij[:, 0]):
+            istat = np.where(kij[:, 0] == k)[0]
+            n0 = nodes[istat].min()
+            n1 = nodes[istat].max() + 1
+            layers[k] = (istat + 1, nodes[istat] - n0, n0, n1)
+
+        itemsize = self.realtype(1).nbytes
+        ilays = self.recordarray['ilay'] - 1
+        totims = self.recordarray['totim']
+        for irec in range(self.recordarray.shape[0]):
+            k = ilays[irec]
+            if k not in layers:
+                continue
+            itim = itimdict.get(totims[irec])
+            if itim is None:
+                continue
+            icol, ioffset, n0, n1 = layers[k]
+            if self.mmap is not None:
+                v = self._get_record_view(irec).ravel()[n0:n1]
+            else:
+                ipos = int(self.iposarray[irec]) + int(n0) * itemsize
+                self.file.seek(ipos, 0)
+                v = binaryread(self.file, self.realtype, shape=(n1 - n0,))
+                v = v.ravel()
+            result[np.ix_(itim, icol)] = v[ioffset]
         return result
 
 
@@ -365,6 +682,15 @@ class HeadFile(BinaryLayerFile):
         'auto', 'single' or 'double'.  Default is 'auto'.
     verbose : bool
         Write information to the screen.  Default is False.
+    memmap : bool
+        Access the data through a read-only numpy memory map of the file
+        instead of reading each record into a new array.  get_data and
+        get_alldata return zero-copy views of the file when the records
+        are stored in order.  Default is False.
+    cache_index : bool
+        Save the record index to a sidecar file (filename + '.idx') and
+        reuse it the next time the file is opened, as long as the size and
+        modification time of the file have not changed.  Default is False.
 
     Attributes
     ----------
@@ -399,6 +725,9 @@ class HeadFile(BinaryLayerFile):
     >>> ddnobj.list_records()
     >>> rec = ddnobj.get_data(totim=100.)
 
+    >>> hdobj = bf.HeadFile('model.hds', memmap=True)
+    >>> heads = hdobj.get_alldata(nodata=None)
+
 
     """
 
@@ -432,6 +761,15 @@ class UcnFile(BinaryLayerFile):
         'auto', 'single' or 'double'.  Default is 'auto'.
     verbose : bool
         Write information to the screen.  Default is False.
+    memmap : bool
+        Access the data through a read-only numpy memory map of the file
+        instead of reading each record into a new array.  get_data and
+        get_alldata return zero-copy views of the file when the records
+        are stored in order.  Default is False.
+    cache_index : bool
+        Save the record index to a sidecar file (filename + '.idx') and
+        reuse it the next time the file is opened, as long as the size and
+        modification time of the file have not changed.  Default is False.
 
     Attributes
     ----------
@@ -492,6 +830,10 @@ class CellBudgetFile(object):
         'single' or 'double'.  Default is 'single'.
     verbose : bool
         Write information to the screen.  Default is False.
+    cache_index : bool
+        Save the record index to a sidecar file (filename + '.idx') and
+        reuse it the next time the file is opened, as long as the size and
+        modification time of the file have not changed.  Default is False.
 
     Attributes
     ----------
@@ -515,6 +857,17 @@ class CellBudgetFile(object):
 
     """
 
+    _index_attributes = {'nrow': 'scalar', 'ncol': 'scalar',
+                         'nlay': 'scalar', 'nper': 'scalar',
+                         'nrecords': 'scalar', 'totalbytes': 'scalar',
+                         'databytes': 'scalar', 'recordarray': 'array',
+                         'iposarray': 'array', 'times': 'list',
+                         'kstpkper': 'tuplelist', 'textlist': 'list',
+                         'imethlist': 'list', 'paknamlist': 'list'}
+
+    # size of the buffered reads used to scan the record headers
+    _chunksize = 4 * 2 ** 20
+
     def __init__(self, filename, precision='single', verbose=False, **kwargs):
         self.filename = filename
         self.precision = precision
@@ -560,6 +913,7 @@ class CellBudgetFile(object):
             self.sr = self.dis.parent.sr
         if 'sr' in kwargs.keys():
             self.sr = kwargs.pop('sr')
+        self.cache_index = kwargs.pop('cache_index', False)
         if len(kwargs.keys()) > 0:
             args = ','.join(kwargs.keys())
             raise Exception('LayerFile error: unrecognized kwargs: ' + args)
@@ -578,6 +932,22 @@ class CellBudgetFile(object):
         #                      dtype=self.realtype)
         return
 
+    def __getstate__(self):
+        """
+        Return the state for pickling.  The file handle and model objects
+        are not pickled; an unpickled object opens its own file handle.
+        """
+        state = self.__dict__.copy()
+        state['file'] = None
+        state.pop('model', None)
+        state['dis'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.file = open(self.filename, 'rb')
+        return
+
     def _totim_from_kstpkper(self, kstpkper):
         if self.dis is None:
             return 0.0
@@ -602,7 +972,25 @@ class CellBudgetFile(object):
     def _build_index(self):
         """
         Build the ordered dictionary, which maps the header information
-        to the position in the binary file.
+        to the position in the binary file.  If cache_index is True, the
+        index is loaded from (or saved to) a sidecar file.
+        """
+        if self.cache_index:
+            if _read_index_sidecar(self, self._index_attributes):
+                self.recorddict = OrderedDict(
+                    zip(self.recordarray.tolist(), self.iposarray.tolist()))
+                return
+        self._scan_index()
+        if self.cache_index:
+            _write_index_sidecar(self, self._index_attributes)
+        return
+
+    def _scan_index(self):
+        """
+        Read through the file and build the index.  The file is read in
+        large buffered chunks and the raw header bytes of every record are
+        collected and decoded with the structured header dtype in a single
+        step once the whole file has been scanned.
         """
         header = self._get_header()
         self.nrow = header["nrow"]
@@ -625,31 +1013,18 @@ class CellBudgetFile(object):
                          np.int64(header['nrow']) * \
                          np.int64(header['nlay']) * \
                          np.int64(self.realtype(1).nbytes)
-        self.recorddict = OrderedDict()
-        ipos = 0
-        while ipos < self.totalbytes:
-            header = self._get_header()
-            #if self.verbose:
-            #    print(header)
-            self.nrecords += 1
-            totim = header['totim']
-            if totim == 0:
-                totim = self._totim_from_kstpkper(
-                    (header["kstp"] - 1, header["kper"] - 1))
-                header["totim"] = totim
-            if totim > 0 and totim not in self.times:
-                self.times.append(totim)
-            kstpkper = (header['kstp'], header['kper'])
-            if kstpkper not in self.kstpkper:
-                self.kstpkper.append(kstpkper)
-            if header['text'] not in self.textlist:
-                self.textlist.append(header['text'])
-                self.imethlist.append(header['imeth'])
-            if header['paknam'] not in self.paknamlist:
-                self.paknamlist.append(header['paknam'])
-            ipos = self.file.tell()
 
-            if self.verbose:
+        headers, iposlist = self._scan_headers(0)
+
+        # decode all of the headers at once
+        self.recordarray = np.frombuffer(b''.join(headers),
+                                         dtype=self.header_dtype).copy()
+        self.iposarray = np.array(iposlist, dtype=np.int64)
+        self.nrecords = self.recordarray.shape[0]
+        self._set_index_lists()
+
+        if self.verbose:
+            for header, ipos in zip(self.recordarray, self.iposarray):
                 for itxt in ['kstp', 'kper', 'text', 'ncol', 'nrow', 'nlay',
                              'imeth', 'delt', 'pertim', 'totim', 'modelnam',
                              'paknam', 'modelnam2', 'paknam2']:
@@ -658,102 +1033,174 @@ class CellBudgetFile(object):
                         s = s.decode()
                     print(itxt + ': ' + str(s))
                 print('file position: ', ipos)
-                if int(header['imeth']) != 5 and \
-                                int(header['imeth']) != 6 and \
-                                int(header['imeth']) != 7:
-                    print('')
-
-            # store record and byte position mapping
-            self.recorddict[
-                tuple(header)] = ipos  # store the position right after header2
-            self.recordarray.append(header)
-            self.iposarray.append(
-                ipos)  # store the position right after header2
-
-            # skip over the data to the next record and set ipos
-            self._skip_record(header)
-            ipos = self.file.tell()
+                print('')
 
-        # convert to numpy arrays
-        self.recordarray = np.array(self.recordarray, dtype=self.header_dtype)
-        self.iposarray = np.array(self.iposarray, dtype=np.int64)
+        # store record and byte position mapping
+        self.recorddict = OrderedDict(zip(self.recordarray.tolist(),
+                                          self.iposarray.tolist()))
         self.nper = self.recordarray["kper"].max()
         return
 
-    def _skip_record(self, header):
+    def _scan_headers(self, ipos):
         """
-        Skip over this record, not counting header and header2.
+        Scan the record headers from byte position ipos to the end of the
+        file.
+
+        Returns
+        -------
+        headers : list of bytes
+            Raw header for each record, padded to header_dtype.itemsize.
+        iposlist : list of ints
+            Byte position right after header2 for each record.
 
         """
-        nlay = abs(header['nlay'])
-        nrow = header['nrow']
-        ncol = header['ncol']
-        imeth = header['imeth']
-        if imeth == 0:
-            nbytes = (nrow * ncol * nlay * self.realtype(1).nbytes)
-        elif imeth == 1:
-            nbytes = (nrow * ncol * nlay * self.realtype(1).nbytes)
-        elif imeth == 2:
-            nlist = binaryread(self.file, np.int32)[0]
-            nbytes = nlist * (np.int32(1).nbytes + self.realtype(1).nbytes)
-        elif imeth == 3:
-            nbytes = (nrow * ncol * self.realtype(1).nbytes)
-            nbytes += (nrow * ncol * np.int32(1).nbytes)
-        elif imeth == 4:
-            nbytes = (nrow * ncol * self.realtype(1).nbytes)
-        elif imeth == 5:
-            nauxp1 = binaryread(self.file, np.int32)[0]
-            naux = nauxp1 - 1
-            for i in range(naux):
-                temp = binaryread(self.file, str, charlen=16)
-            nlist = binaryread(self.file, np.int32)[0]
-            if self.verbose:
-                print('naux: ', naux)
-                print('nlist: ', nlist)
-                print('')
-            nbytes = nlist * (np.int32(1).nbytes + self.realtype(1).nbytes +
-                              naux * self.realtype(1).nbytes)
-        elif imeth == 6:
-            # read rest of list data
-            nauxp1 = binaryread(self.file, np.int32)[0]
-            naux = nauxp1 - 1
-            for i in range(naux):
-                temp = binaryread(self.file, str, charlen=16)
-            nlist = binaryread(self.file, np.int32)[0]
-            if self.verbose:
-                print('naux: ', naux)
-                print('nlist: ', nlist)
-                print('')
-            nbytes = nlist * (
-                np.int32(1).nbytes * 2 + self.realtype(1).nbytes +
-                naux * self.realtype(1).nbytes)
-        else:
-            raise Exception('invalid method code ' + str(imeth))
-        if nbytes != 0:
-            self.file.seek(nbytes, 1)
+        realsize = self.realtype(1).nbytes
+        intsize = np.int32(1).nbytes
+        h1size = self.header1_dtype.itemsize
+        h20size = self.header2_dtype0.itemsize
+        namsize = self.header2_dtype.itemsize - h20size
+        h1struct = struct.Struct('=2i16s3i')
+        istruct = struct.Struct('=i')
+        h2empty = b'\x00' * (h20size + namsize)
+        namempty = b'\x00' * namsize
+
+        # buffered reads of the file
+        chunksize = self._chunksize
+        buf = b''
+        boff = 0
+        recsize = 0
+
+        def getbuf(pos, nbytes):
+            """
+            Return the buffer and the offset into it for nbytes of the
+            file starting at pos.  Large records are skipped over and only
+            the bytes that are needed are read.
+            """
+            if pos < boff or pos + nbytes > boff + len(buf):
+                if recsize < chunksize // 16:
+                    nread = max(nbytes, chunksize)
+                else:
+                    nread = max(nbytes, 512)
+                self.file.seek(pos, 0)
+                return self.file.read(nread), pos
+            return buf, boff
+
+        headers = []
+        iposlist = []
+        while ipos < self.totalbytes:
+            buf, boff = getbuf(ipos, h1size + h20size + namsize +
+                               2 * intsize)
+            o = ipos - boff
+            if len(buf) - o < h1size:
+                break
+            kstp, kper, text, ncol, nrow, nlay = h1struct.unpack_from(buf, o)
+            h1 = buf[o:o + h1size]
+            p = ipos + h1size
+            if nlay < 0:
+                o = p - boff
+                if len(buf) - o < h20size:
+                    break
+                imeth = istruct.unpack_from(buf, o)[0]
+                h2 = buf[o:o + h20size]
+                p += h20size
+                if imeth == 6:
+                    o = p - boff
+                    if len(buf) - o < namsize:
+                        break
+                    h2 += buf[o:o + namsize]
+                    p += namsize
+                else:
+                    h2 += namempty
+            else:
+                imeth = 0
+                h2 = h2empty
+
+            # determine the size of the data
+            nlay = abs(nlay)
+            if imeth == 0 or imeth == 1:
+                nbytes = nrow * ncol * nlay * realsize
+            elif imeth == 2:
+                buf, boff = getbuf(p, intsize)
+                if len(buf) - (p - boff) < intsize:
+                    break
+                nlist = istruct.unpack_from(buf, p - boff)[0]
+                nbytes = intsize + nlist * (intsize + realsize)
+            elif imeth == 3:
+                nbytes = nrow * ncol * (realsize + intsize)
+            elif imeth == 4:
+                nbytes = nrow * ncol * realsize
+            elif imeth == 5 or imeth == 6:
+                buf, boff = getbuf(p, intsize)
+                if len(buf) - (p - boff) < intsize:
+                    break
+                naux = istruct.unpack_from(buf, p - boff)[0] - 1
+                nhead = intsize + naux * 16
+                buf, boff = getbuf(p + nhead, intsize)
+                if len(buf) - (p + nhead - boff) < intsize:
+                    break
+                nlist = istruct.unpack_from(buf, p + nhead - boff)[0]
+                nhead += intsize
+                if imeth == 5:
+                    nbytes = nhead + nlist * (intsize + realsize +
+                                              naux * realsize)
+                else:
+                    nbytes = nhead + nlist * (2 * intsize + realsize +
+                                              naux * realsize)
+            else:
+                raise Exception('invalid method code ' + str(imeth))
+            headers.append(h1 + h2)
+            iposlist.append(p)
+            recsize = p + nbytes - ipos
+            ipos = p + nbytes
+        return headers, iposlist
+
+    def _set_index_lists(self):
+        """
+        Set totim for records without a time and build the lists of
+        unique times, kstpkper, text, and package names from recordarray.
+        Items are in the order in which they first appear in the file.
+        """
+        rec = self.recordarray
+        for idx in np.where(rec['totim'] == 0)[0]:
+            rec['totim'][idx] = self._totim_from_kstpkper(
+                (rec['kstp'][idx] - 1, rec['kper'][idx] - 1))
+
+        def first(a):
+            return np.sort(np.unique(a, return_index=True)[1])
+
+        totim = rec['totim']
+        idx = first(totim)
+        self.times = [t for t in totim[idx] if t > 0]
+        kk = rec['kstp'].astype(np.int64) * (2 ** 32) + rec['kper']
+        idx = first(kk)
+        self.kstpkper = list(zip(rec['kstp'][idx], rec['kper'][idx]))
+        idx = first(rec['text'])
+        self.textlist = list(rec['text'][idx])
+        self.imethlist = list(rec['imeth'][idx])
+        idx = first(rec['paknam'])
+        self.paknamlist = list(rec['paknam'][idx])
         return
 
     def _get_header(self):
         """
         Read the file header
         """
-        header1 = binaryread(self.file, self.header1_dtype, (1,))
-        nlay = header1['nlay']
-        if nlay < 0:
+        h1size = self.header1_dtype.itemsize
+        h20size = self.header2_dtype0.itemsize
+        namsize = self.header2_dtype.itemsize - h20size
+        h1 = self.file.read(h1size)
+        header1 = np.frombuffer(h1, dtype=self.header1_dtype)
+        if header1['nlay'][0] < 0:
             # read everything except for pakname
-            header2 = binaryread(self.file, self.header2_dtype0, (1,))
-            # convert to dtype with pakname
-            header2 = header2.astype(self.header2_dtype)
-            if int(header2['imeth']) == 6:
-                header2['modelnam'] = binaryread(self.file, str, charlen=16)
-                header2['paknam'] = binaryread(self.file, str, charlen=16)
-                header2['modelnam2'] = binaryread(self.file, str, charlen=16)
-                header2['paknam2'] = binaryread(self.file, str, charlen=16)
+            h2 = self.file.read(h20size)
+            header2 = np.frombuffer(h2, dtype=self.header2_dtype0)
+            if int(header2['imeth'][0]) == 6:
+                h2 += self.file.read(namsize)
+            else:
+                h2 += b'\x00' * namsize
         else:
-            header2 = np.array([(0, 0., 0., 0., '', '', '', '')],
-                               dtype=self.header2_dtype)
-        fullheader = join_struct_arrays([header1, header2])
-        return fullheader[0]
+            h2 = b'\x00' * (h20size + namsize)
+        return np.frombuffer(h1 + h2, dtype=self.header_dtype)[0]
 
     def _find_text(self, text):
         """
@@ -1029,6 +1476,82 @@ class CellBudgetFile(object):
 
         return recordlist
 
+    def iter_records(self, text=None, paknam=None, kstpkper_range=None,
+                     totim_range=None, full3D=False):
+        """
+        Iterate over the records in the budget file in file order.  Only
+        one record is held in memory at a time and the file is read
+        sequentially, so this is suited to processing large budget files.
+
+        Parameters
+        ----------
+        text : str
+            The text identifier for the records to return.  Examples include
+            'RIVER LEAKAGE', 'STORAGE', 'FLOW RIGHT FACE', etc.  If None, all
+            records are returned.  (Default is None.)
+        paknam : str
+            The package name for the records to return.  (Default is None.)
+        kstpkper_range : tuple of tuples
+            The first and last (kstp, kper) to return, for example
+            ((0, 0), (9, 2)).  The kstp and kper values are zero based and
+            the range is inclusive.  Either value can be None to leave that
+            side of the range open.  (Default is None.)
+        totim_range : tuple of floats
+            The first and last simulation time (tmin, tmax) to return.  The
+            range is inclusive and either value can be None.
+            (Default is None.)
+        full3D : boolean
+            If true, then return the records as three dimensional numpy
+            arrays, even for those list-style records writen as part of a
+            'COMPACT BUDGET' MODFLOW budget file.  (Default is False.)
+
+        Returns
+        ----------
+        out : generator of (header, data) tuples
+            header is the record from recordarray and data is the record
+            returned by get_record().
+
+        Examples
+        --------
+
+        >>> import flopy.utils.binaryfile as bf
+        >>> cbb = bf.CellBudgetFile('mymodel.cbb')
+        >>> for header, data in cbb.iter_records(text='RIVER LEAKAGE'):
+        ...     print(header['kstp'], header['kper'], data['q'].sum())
+
+        """
+        select = np.ones(self.recordarray.shape[0], dtype=bool)
+        if text is not None:
+            text16 = self._find_text(text)
+            select &= self.recordarray['text'] == text16
+        if paknam is not None:
+            paknam16 = self._find_paknam(paknam)
+            select &= self.recordarray['paknam'] == paknam16
+        if kstpkper_range is not None:
+            # compare (kper, kstp) pairs using a single one-based key
+            kk = self.recordarray['kper'].astype(np.int64) * (2 ** 32) + \
+                 self.recordarray['kstp']
+            kstpkper0, kstpkper1 = kstpkper_range
+            if kstpkper0 is not None:
+                select &= kk >= (kstpkper0[1] + 1) * (2 ** 32) + \
+                          kstpkper0[0] + 1
+            if kstpkper1 is not None:
+                select &= kk <= (kstpkper1[1] + 1) * (2 ** 32) + \
+                          kstpkper1[0] + 1
+        if totim_range is not None:
+            tmin, tmax = totim_range
+            if tmin is not None:
+                select &= self.recordarray['totim'] >= tmin
+            if tmax is not None:
+                select &= self.recordarray['totim'] <= tmax
+
+        # records are returned in the order they are stored in the file
+        indices = np.where(select)[0]
+        isort = np.argsort(self.iposarray[indices], kind='mergesort')
+        indices = indices[isort]
+        for idx in indices:
+            yield self.recordarray[idx], self.get_record(idx, full3D=full3D)
+
     def get_record(self, idx, full3D=False):
         """
         Get a single data record from the budget file.
@@ -433,7 +433,8 @@ class LayerFile(object):
 
         nodata : float
            The nodata value in the data array.  All array values that have the
-           nodata value will be assigned np.nan.
+           nodata value will be assigned np.nan.  If nodata is None, values
+           are not replaced.
 
         Returns
         ----------
@@ -456,7 +457,8 @@ class LayerFile(object):
             h = self.get_data(totim=totim, mflay=mflay)
             rv.append(h)
         rv = np.array(rv)
-        rv[rv == nodata] = np.nan
+        if nodata is not None:
+            rv[rv == nodata] = np.nan
         return rv
 
     def _read_data(self):
@@ -1,6 +1,7 @@
 """
 Module for input/output utilities
 """
+import os
 import numpy as np
 
 def _fmt_string(array, float_format='{}'):
@@ -23,6 +24,16 @@ def _fmt_string(array, float_format='{}'):
                             "in dtype:" + vtype)
     return fmt_string
 
+def _unlink(fname):
+    """
+    Remove the file fname if it exists.  Files are removed before they are
+    written again, so a file that is shared with other workspaces through
+    a hard link (see BaseModel.write_ensemble) is replaced instead of
+    being changed in every workspace.
+    """
+    if os.path.lexists(fname):
+        os.remove(fname)
+
 def _pop_item(line, dtype=str):
     if len(line) > 0:
         if dtype == str:
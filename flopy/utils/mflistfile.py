@@ -6,6 +6,7 @@ recarrays, which can then be easily plotted.
 """
 
 import collections
+import mmap
 import os
 import re
 import sys
@@ -15,6 +16,30 @@ import numpy as np
 from ..utils.utils_def import totim_to_datetime
 
 
+def _decode(b):
+    """
+    bytes read from a list file to str
+    """
+    if sys.version_info[0] == 2:
+        return b
+    return b.decode('ascii', 'replace')
+
+
+def _get_lines(mm, pos, n):
+    """
+    Get up to n complete lines of the mmap mm from offset pos on.  Returns
+    the lines and the offset after the last of them.
+    """
+    lines = []
+    while len(lines) < n:
+        eol = mm.find(b'\n', pos)
+        if eol < 0:
+            break
+        lines.append(_decode(mm[pos:eol + 1]))
+        pos = eol + 1
+    return lines, pos
+
+
 class ListBudget(object):
     """
     MODFLOW family list file handling
@@ -47,10 +72,7 @@ class ListBudget(object):
         # Set up file reading
         assert os.path.exists(file_name)
         self.file_name = file_name
-        if sys.version_info[0] == 2:
-            self.f = open(file_name, 'r')
-        elif sys.version_info[0] == 3:
-            self.f = open(file_name, 'r', encoding='ascii', errors='replace')
+        self.f = open(file_name, 'rb')
 
         self.tssp_lines = 0
 
@@ -65,6 +87,7 @@ class ListBudget(object):
         self.idx_map = []
         self.entries = []
         self.null_entries = []
+        self._offset = 0
 
         self.time_line_idx = 20
         if timeunit.upper() == 'SECONDS':
@@ -102,6 +125,35 @@ class ListBudget(object):
     def set_budget_key(self):
         raise Exception('Must be overridden...')
 
+    def refresh(self):
+        """
+        Read the budgets that were written to the list file since it was
+        last read, e.g. while the model is still running.  The file is read
+        from the end of the last complete budget on, so the budgets that
+        were read before are not parsed again.
+
+        Returns
+        -------
+        n : int
+            The number of new budgets.
+
+        Examples
+        --------
+        >>> import time
+        >>> mf_list = MfListBudget("my_model.list")
+        >>> while True:
+        ...     if mf_list.refresh() > 0:
+        ...         inc = mf_list.get_incremental()
+        ...         print(inc['totim'][-1], inc['PERCENT_DISCREPANCY'][-1])
+        ...     time.sleep(10.)
+
+        """
+        n = len(self.idx_map)
+        with open(self.file_name, 'rb') as f:
+            self._add_blocks(self._read_blocks(f, self._offset))
+        self._isvalid = len(self.idx_map) > 0
+        return len(self.idx_map) - n
+
     def isvalid(self):
         """
         Get a boolean indicating if budget data are available in the file.
@@ -444,59 +496,151 @@ class ListBudget(object):
             df_flux.columns = cols
             df_vol.columns = cols
             return df_flux, df_vol
-    def _build_index(self, maxentries):
-        self.idx_map = self._get_index(maxentries)
+
+    def _load(self, maxentries=None):
+        self._add_blocks(self._read_blocks(self.f, 0, maxentries))
         return
 
-    def _get_index(self, maxentries):
-        # --parse through the file looking for matches and parsing ts and sp
-        idxs = []
-        l_count = 1
-        while True:
-            seekpoint = self.f.tell()
-            line = self.f.readline()
-            if line == '':
-                break
-            if self.budgetkey in line:
-                for l in range(self.tssp_lines):
-                    line = self.f.readline()
-                try:
-                    ts, sp = self._get_ts_sp(line)
-                except:
-                    print('unable to cast ts,sp on line number', l_count,
-                          ' line: ', line)
-                    break
-                # print('info found for timestep stress period',ts,sp)
+    def _read_blocks(self, f, pos, maxentries=None):
+        """
+        Get the budget blocks (see _scan) of the open list file f from
+        offset pos on.
+
+        """
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # an empty file can't be mapped
+            return []
+        try:
+            return list(self._scan(mm, pos, maxentries))
+        finally:
+            mm.close()
 
-                idxs.append([ts, sp, seekpoint])
+    def _add_blocks(self, blocks):
+        """
+        Add the budget blocks found by _scan to the index and to the
+        incremental and cumulative recarrays.
 
-                if maxentries and len(idxs) >= maxentries:
-                    break
+        """
+        if len(blocks) == 0:
+            return
 
-        return idxs
+        # the budget entries of the first block are used for all blocks
+        if len(self.entries) == 0:
+            if blocks[0][3] is None:
+                raise Exception('unable to read budget information from '
+                                'first entry in list file')
+            self.entries = list(blocks[0][3].keys())
+            null_entries = collections.OrderedDict()
+            for entry in self.entries:
+                null_entries[entry] = np.NaN
+            self.null_entries = [null_entries, null_entries]
+
+        idx_map = []
+        incs, cums, totim = [], [], []
+        for ts, sp, seekpoint, tinc, tcum, tt, end in blocks:
+            idx_map.append([ts, sp, seekpoint])
+            if tinc is None:
+                tinc, tcum = self.null_entries
+            incs.append(tinc)
+            cums.append(tcum)
+            totim.append(tt)
+        self.idx_map.extend(idx_map)
+        self._offset = blocks[-1][-1]
 
-    def _seek_to_string(self, s):
+        # get kstp and kper
+        idx_array = np.array(idx_map)
+
+        # build dtype for recarray
+        dtype_tups = [('totim', np.float32), ("time_step", np.int32),
+                      ("stress_period", np.int32)]
+        for entry in self.entries:
+            dtype_tups.append((entry, np.float32))
+        dtype = np.dtype(dtype_tups)
+
+        # create recarray
+        nentries = len(blocks)
+        inc = np.recarray(shape=(nentries,), dtype=dtype)
+        cum = np.recarray(shape=(nentries,), dtype=dtype)
+
+        # fill each column of the recarray
+        for entry in self.entries:
+            inc[entry] = [tinc[entry] for tinc in incs]
+            cum[entry] = [tcum[entry] for tcum in cums]
+
+        # file the totim, time_step, and stress_period columns for the
+        # incremental and cumulative recarrays (zero-based kstp,kper)
+        inc['totim'] = np.array(totim)[:]
+        inc["time_step"] = idx_array[:, 0] - 1
+        inc["stress_period"] = idx_array[:, 1] - 1
+
+        cum['totim'] = np.array(totim)[:]
+        cum["time_step"] = idx_array[:, 0] - 1
+        cum["stress_period"] = idx_array[:, 1] - 1
+
+        if len(self.idx_map) > nentries:
+            inc = np.concatenate((self.inc, inc)).view(np.recarray)
+            cum = np.concatenate((self.cum, cum)).view(np.recarray)
+        self.inc = inc
+        self.cum = cum
+        return
+
+    def _scan(self, mm, pos, maxentries=None):
         """
-        Parameters
-        ----------
-        s : str
-            Seek through the file to the next occurrence of s.  Return the
-            seek location when found.
+        Find and parse the budget blocks in the list file in one forward
+        pass, starting at offset pos of the mmap mm.  The budget key, the
+        end of the budget and the time summary are located with mmap.find,
+        so the lines in between (e.g. solver output) are not read by python.
 
-        Returns
-        -------
-        seekpoint : int
-            Next location of the string
+        Yields (ts, sp, seekpoint, incdict, cumdict, totim, end) for every
+        complete block, with the offset seekpoint of the line with the
+        budget key and the offset end after the time summary.  incdict and
+        cumdict are None if the budget could not be parsed.
 
         """
-        while True:
-            seekpoint = self.f.tell()
-            line = self.f.readline()
-            if line == '':
-                break
-            if s in line:
-                break
-        return seekpoint
+        key = self.budgetkey.encode('ascii')
+        nblocks = 0
+        while not maxentries or nblocks < maxentries:
+            i = mm.find(key, pos)
+            if i < 0:
+                return
+            seekpoint = mm.rfind(b'\n', 0, i) + 1
+            lines, eol = _get_lines(mm, seekpoint, self.tssp_lines + 1)
+            if len(lines) < self.tssp_lines + 1:
+                return
+            try:
+                ts, sp = self._get_ts_sp(lines[-1])
+            except:
+                print('unable to cast ts,sp at offset', seekpoint,
+                      ' line: ', lines[-1])
+                return
+
+            # the budget ends with the percent discrepancy line
+            i = mm.find(b'PERCENT DISCREPANCY', eol)
+            if i < 0:
+                return
+            pos = mm.find(b'\n', i)
+            if pos < 0:
+                return
+            pos += 1
+            lines = _decode(mm[seekpoint:pos]).splitlines()
+            tinc, tcum = self._parse_sp(lines, ts, sp)
+
+            # the time summary follows the budget
+            i = mm.find(b'TIME SUMMARY AT END', pos)
+            if i < 0:
+                return
+            i = mm.rfind(b'\n', 0, i) + 1
+            lines, eol = _get_lines(mm, i, 10)
+            times = self._parse_totim(lines, ts, sp)
+            if times is None:
+                return
+            tslen, sptim, totim, nlines = times
+            pos = i + sum([len(line) for line in lines[:nlines]])
+
+            nblocks += 1
+            yield ts, sp, seekpoint, tinc, tcum, totim, pos
 
     def _get_ts_sp(self, line):
         """
@@ -523,124 +667,36 @@ class ListBudget(object):
 
         return ts, sp
 
-    def _set_entries(self):
-        if len(self.idx_map) < 1:
-            return None, None
-        if len(self.entries) > 0:
-            raise Exception('entries already set:' + str(self.entries))
-        if not self.idx_map:
-            raise Exception('must call build_index before call set_entries')
-        try:
-            incdict, cumdict = self._get_sp(self.idx_map[0][0],
-                                            self.idx_map[0][1],
-                                            self.idx_map[0][2])
-        except:
-            raise Exception('unable to read budget information from first '
-                            'entry in list file')
-        self.entries = incdict.keys()
-        null_entries = collections.OrderedDict()
-        incdict = collections.OrderedDict()
-        cumdict = collections.OrderedDict()
-        for entry in self.entries:
-            incdict[entry] = []
-            cumdict[entry] = []
-            null_entries[entry] = np.NaN
-        self.null_entries = [null_entries, null_entries]
-        return incdict, cumdict
-
-    def _load(self, maxentries=None):
-        self._build_index(maxentries)
-        incdict, cumdict = self._set_entries()
-        if incdict is None and cumdict is None:
-            return
-        totim = []
-        for ts, sp, seekpoint in self.idx_map:
-            tinc, tcum = self._get_sp(ts, sp, seekpoint)
-            for entry in self.entries:
-                incdict[entry].append(tinc[entry])
-                cumdict[entry].append(tcum[entry])
-
-            # Get the time for this record
-            seekpoint = self._seek_to_string('TIME SUMMARY AT END')
-            tslen, sptim, tt = self._get_totim(ts, sp, seekpoint)
-            totim.append(tt)
-
-        # get kstp and kper
-        idx_array = np.array(self.idx_map)
-
-        # build dtype for recarray
-        dtype_tups = [('totim', np.float32), ("time_step", np.int32),
-                      ("stress_period", np.int32)]
-        for entry in self.entries:
-            dtype_tups.append((entry, np.float32))
-        dtype = np.dtype(dtype_tups)
-
-        # create recarray
-        nentries = len(incdict[entry])
-        self.inc = np.recarray(shape=(nentries,), dtype=dtype)
-        self.cum = np.recarray(shape=(nentries,), dtype=dtype)
-
-        # fill each column of the recarray
-        for entry in self.entries:
-            self.inc[entry] = incdict[entry]
-            self.cum[entry] = cumdict[entry]
-
-        # file the totim, time_step, and stress_period columns for the
-        # incremental and cumulative recarrays (zero-based kstp,kper)
-        self.inc['totim'] = np.array(totim)[:]
-        self.inc["time_step"] = idx_array[:, 0] - 1
-        self.inc["stress_period"] = idx_array[:, 1] - 1
-
-        self.cum['totim'] = np.array(totim)[:]
-        self.cum["time_step"] = idx_array[:, 0] - 1
-        self.cum["stress_period"] = idx_array[:, 1] - 1
-
-        return
-
-    def _get_sp(self, ts, sp, seekpoint):
-        self.f.seek(seekpoint)
-        # --read to the start of the "in" budget information
-        while True:
-            line = self.f.readline()
-            if line == '':
-                print(
-                        'end of file found while seeking budget information for ts,sp',
-                        ts, sp)
-                return self.null_entries
-
-            # --if there are two '=' in this line, then it is a budget line
-            if len(re.findall('=', line)) == 2:
-                break
+    def _parse_sp(self, lines, ts, sp):
+        """
+        Parse the lines of a budget block.  Returns the incremental and
+        cumulative budget dictionaries, or None, None if the budget could
+        not be parsed.
 
+        """
         tag = 'IN'
         incdict = collections.OrderedDict()
         cumdict = collections.OrderedDict()
-        while True:
-
-            if line == '':
-                # raise Exception('end of file found while seeking budget information')
-                print(
-                        'end of file found while seeking budget information for ts,sp',
-                        ts, sp)
-                return self.null_entries
+        for line in lines:
+            # --if there are two '=' in this line, then it is a budget line
             if len(re.findall('=', line)) == 2:
                 try:
                     entry, flux, cumu = self._parse_budget_line(line)
-                except e:
+                except:
                     print('error parsing budget line in ts,sp', ts, sp)
-                    return self.null_entries
+                    return None, None
                 if flux is None:
                     print(
                             'error casting in flux for', entry,
                             ' to float in ts,sp',
                             ts, sp)
-                    return self.null_entries
+                    return None, None
                 if cumu is None:
                     print(
                             'error casting in cumu for', entry,
                             ' to float in ts,sp',
                             ts, sp)
-                    return self.null_entries
+                    return None, None
                 if entry.endswith(tag.upper()):
                     if ' - ' in entry.upper():
                         key = entry.replace(' ', '')
@@ -652,13 +708,10 @@ class ListBudget(object):
                     key = '{}_{}'.format(entry.replace(' ', '_'), tag)
                 incdict[key] = flux
                 cumdict[key] = cumu
-            else:
-                if 'OUT:' in line.upper():
-                    tag = 'OUT'
-            line = self.f.readline()
-            if entry.upper() == 'PERCENT DISCREPANCY':
-                break
-
+                if entry.upper() == 'PERCENT DISCREPANCY':
+                    break
+            elif len(incdict) > 0 and 'OUT:' in line.upper():
+                tag = 'OUT'
         return incdict, cumdict
 
     def _parse_budget_line(self, line):
@@ -693,38 +746,36 @@ class ListBudget(object):
                 flux = np.NaN
         return entry, flux, cumu
 
-    def _get_totim(self, ts, sp, seekpoint):
-        self.f.seek(seekpoint)
-        # --read header lines
-        ihead = 0
+    def _parse_totim(self, lines, ts, sp):
+        """
+        Parse the time step length, the stress period time and the total
+        time from the lines of a time summary.  Returns None if the lines
+        end before the total time.
+
+        """
+        # --skip header lines
+        ihead = 1
         while True:
-            line = self.f.readline()
+            if ihead >= len(lines):
+                return None
+            line = lines[ihead]
             ihead += 1
-            if line == '':
-                print(
-                        'end of file found while seeking time information for ts,sp',
-                        ts, sp)
-                return np.NaN, np.NaN, np.Nan
-            elif ihead == 2 and 'SECONDS     MINUTES      HOURS       DAYS        YEARS' not in line:
+            if ihead == 2 and 'SECONDS     MINUTES      HOURS       DAYS        YEARS' not in line:
+                ihead -= 1
                 break
             elif '-----------------------------------------------------------' in line:
-                line = self.f.readline()
                 break
-        tslen = self._parse_time_line(line)
-        if tslen == None:
-            print('error parsing tslen for ts,sp', ts, sp)
-            return np.NaN, np.NaN, np.Nan
-
-        sptim = self._parse_time_line(self.f.readline())
-        if sptim == None:
-            print('error parsing sptim for ts,sp', ts, sp)
-            return np.NaN, np.NaN, np.Nan
-
-        totim = self._parse_time_line(self.f.readline())
-        if totim == None:
-            print('error parsing totim for ts,sp', ts, sp)
-            return np.NaN, np.NaN, np.Nan
-        return tslen, sptim, totim
+        if ihead + 3 > len(lines):
+            return None
+        times = []
+        for line, name in zip(lines[ihead:ihead + 3],
+                              ['tslen', 'sptim', 'totim']):
+            tval = self._parse_time_line(line)
+            if tval is None:
+                print('error parsing {} for ts,sp'.format(name), ts, sp)
+                tval = np.NaN
+            times.append(tval)
+        return times[0], times[1], times[2], ihead + 3
 
     def _parse_time_line(self, line):
         if line == '':
@@ -9,11 +9,27 @@ from __future__ import division, print_function
 # from future.utils import with_metaclass
 
 import os
+import re
 import shutil
 import copy
+import hashlib
 import numbers
+import weakref
+import threading
+import itertools
+import collections
 import numpy as np
 from ..utils.binaryfile import BinaryHeader
+from ..utils.util_list import Sparse4d
+from ..utils.flopy_io import _unlink
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+# Util2d versions, a new one is taken every time a Util2d is changed
+_versions = itertools.count(1)
 
 
 class ArrayFormat(object):
@@ -727,6 +743,19 @@ class Util3d(object):
             s += u2d.get_file_entry()
         return s
 
+    def _get_state(self):
+        """
+        get a token that changes when any of the layers is changed
+        """
+        return tuple([u2d._get_state() for u2d in self.util_2ds])
+
+    def _get_written_files(self):
+        """
+        get the external files written for the layers
+        """
+        return [fpth for u2d in self.util_2ds
+                for fpth in u2d._get_written_files()]
+
     def get_value(self):
         value = []
         for u2d in self.util_2ds:
@@ -746,7 +775,7 @@ class Util3d(object):
             a = np.empty((self.shape), dtype=self.dtype)
             # for i,u2d in self.uds:
             for i, u2d in enumerate(self.util_2ds):
-                a[i] = u2d.array
+                a[i] = u2d._get_effective_array()
         else:
             # unstructured case
             nodes = ncol.sum()
@@ -754,7 +783,7 @@ class Util3d(object):
             istart = 0
             for i, u2d in enumerate(self.util_2ds):
                 istop = istart + ncol[i]
-                a[istart:istop] = u2d.array
+                a[istart:istop] = u2d._get_effective_array()
                 istart = istop
         return a
 
@@ -1007,7 +1036,7 @@ class Transient3d(object):
         for kper in range(self.model.nper):
             u3d = self[kper]
             for k in range(self.shape[0]):
-                arr[kper, k, :, :] = u3d[k].array
+                arr[kper, k, :, :] = u3d[k]._get_effective_array()
         return arr
 
     def get_kper_entry(self, kper):
@@ -1029,6 +1058,21 @@ class Transient3d(object):
         else:
             return -1, ''
 
+    def _get_state(self):
+        """
+        get a token that changes when the arrays of any stress period are
+        changed
+        """
+        return tuple([(kper, u3d._get_state()) for kper, u3d in
+                      sorted(self.transient_3ds.items())])
+
+    def _get_written_files(self):
+        """
+        get the external files written for the stress periods
+        """
+        return [fpth for kper, u3d in sorted(self.transient_3ds.items())
+                for fpth in u3d._get_written_files()]
+
     def build_transient_sequence(self):
         """
         parse self.__value into a dict{kper:Util3d}
@@ -1214,6 +1258,24 @@ class Transient2d(object):
             kper_dict[kper] = arr.copy()
         return kper_dict
 
+    @staticmethod
+    def sparse4d_to_kper_dict(s4d):
+        assert s4d.ndim == 4
+        kper_dict = {}
+        nnode = s4d.shape[1] * s4d.shape[2] * s4d.shape[3]
+        for kper in range(s4d.shape[0]):
+            node, values = s4d.get_kper(kper)
+            idx = ~np.isnan(values)
+            node, values = node[idx], values[idx]
+            if values.shape[0] == 0:
+                continue
+            elif values.shape[0] < nnode:
+                raise Exception("masked value found in array")
+            arr = np.zeros(s4d.shape[1:], dtype=np.float32)
+            arr.ravel()[node] = values
+            kper_dict[kper] = arr
+        return kper_dict
+
     @classmethod
     def from_4d(cls, model, pak_name, m4ds):
         """construct a Transient2d instance from a
@@ -1222,7 +1284,7 @@ class Transient2d(object):
         ----------
             model : flopy.mbase derived type
             pak_name : str package name (e.g. RCH)
-            m4ds : dict(name,(masked) 4d numpy.ndarray)
+            m4ds : dict(name,(masked) 4d numpy.ndarray or Sparse4d)
                 each ndarray must have shape (nper,1,nrow,ncol).
                 if an entire (nrow,ncol) slice is np.NaN, then
                 that kper is skipped.
@@ -1242,11 +1304,14 @@ class Transient2d(object):
         assert m4d.shape[1] == 1
         assert m4d.shape[2] == model.nrow
         assert m4d.shape[3] == model.ncol
-        m4d = m4d.astype(np.float32)
-        kper_dict = Transient2d.masked4d_array_to_kper_dict(m4d)
+        if isinstance(m4d, Sparse4d):
+            kper_dict = Transient2d.sparse4d_to_kper_dict(m4d)
+        else:
+            m4d = m4d.astype(np.float32)
+            kper_dict = Transient2d.masked4d_array_to_kper_dict(m4d)
         return cls(model=model, shape=(model.nrow, model.ncol),
                    value=kper_dict,
-                   dtype=m4d.dtype.type, name=name)
+                   dtype=np.float32, name=name)
 
     def __setattr__(self, key, value):
         if hasattr(self, "transient_2ds") and key == "cnstnt":
@@ -1461,7 +1526,7 @@ class Transient2d(object):
                        dtype=self.dtype)
         for kper in range(self.model.nper):
             u2d = self[kper]
-            arr[kper, 0, :, :] = u2d.array
+            arr[kper, 0, :, :] = u2d._get_effective_array()
         return arr
 
     def export(self, f, **kwargs):
@@ -1480,6 +1545,21 @@ class Transient2d(object):
         else:
             return (-1, '')
 
+    def _get_state(self):
+        """
+        get a token that changes when the array of any stress period is
+        changed
+        """
+        return tuple([(kper, u2d._get_state()) for kper, u2d in
+                      sorted(self.transient_2ds.items())])
+
+    def _get_written_files(self):
+        """
+        get the external files written for the stress periods
+        """
+        return [fpth for kper, u2d in sorted(self.transient_2ds.items())
+                for fpth in u2d._get_written_files()]
+
     def build_transient_sequence(self):
         """
         parse self.__value into a dict{kper:Util2d}
@@ -1542,6 +1622,182 @@ class Transient2d(object):
         return u2d
 
 
+class ArrayCache(object):
+    """
+    Size-limited, least-recently-used cache for the arrays of lazily loaded
+    Util2d instances.
+
+    Parameters
+    ----------
+    maxsize : int
+        the maximum total size of the cached arrays in bytes.  When a new
+        array is added, the least recently used arrays are removed until
+        the total size is below maxsize (the default is 2**28, 256 MB).
+
+    Attributes
+    ----------
+    nbytes : int
+        the total size of the cached arrays in bytes
+
+    Methods
+    -------
+    get(key) : numpy.ndarray
+        get the cached array for key or None if it is not cached
+    put(key, array) : None
+        add an array to the cache
+    clear() : None
+        remove all arrays from the cache
+
+    See Also
+    --------
+
+    Notes
+    -----
+    The cache is shared by all of the lazily loaded Util2d instances of a
+    model (model.array_cache).  An array that is removed from the cache is
+    parsed again the next time it is used.
+
+    Examples
+    --------
+    >>> import flopy
+    >>> ml = flopy.modflow.Modflow.load('test.nam', lazy=True)
+    >>> ml.array_cache.maxsize = 2 ** 30
+
+    """
+
+    def __init__(self, maxsize=2 ** 28):
+        self.nbytes = 0
+        self._arrays = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+
+    def __len__(self):
+        return len(self._arrays)
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        with self._lock:
+            self._maxsize = maxsize
+            self._trim()
+
+    def _trim(self):
+        # remove the least recently used arrays, but keep the newest one
+        while self.nbytes > self._maxsize and len(self._arrays) > 1:
+            key, old = self._arrays.popitem(last=False)
+            self.nbytes -= old.nbytes
+
+    def get(self, key):
+        with self._lock:
+            array = self._arrays.pop(key, None)
+            if array is not None:
+                # move to the most recently used position
+                self._arrays[key] = array
+            return array
+
+    def put(self, key, array):
+        with self._lock:
+            old = self._arrays.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._arrays[key] = array
+            self.nbytes += array.nbytes
+            self._trim()
+
+    def clear(self):
+        with self._lock:
+            self._arrays.clear()
+            self.nbytes = 0
+
+
+class _LazyText(object):
+    """
+    the location of the text of a lazily loaded Util2d array in the file
+    it was read from and the format it was read with.  The text is read
+    again from the file when it is needed.  The text is only kept in
+    memory if it was not read from a file that can be read again, or if
+    the file is about to be overwritten (see release).
+    """
+
+    # lazy texts by the file they were read from
+    _sources = {}
+    _lock = threading.Lock()
+
+    def __init__(self, lines, file_in, offset, fmtin, cache):
+        self.fmtin = fmtin
+        self.cache = cache
+        # format of the Util2d instance when it was loaded
+        self.format = None
+        self.nlines = len(lines)
+        self.offset = offset
+        self.fname = None
+        self.__text = None
+        name = getattr(file_in, 'name', None)
+        if offset is not None and isinstance(name, str) and \
+                os.path.isfile(name):
+            self.fname = os.path.normcase(os.path.abspath(name))
+            self.stat = self._stat(self.fname)
+            with self._lock:
+                self._sources.setdefault(self.fname,
+                                         weakref.WeakSet()).add(self)
+        else:
+            self.__text = ''.join(lines)
+
+    @staticmethod
+    def _stat(fname):
+        st = os.stat(fname)
+        return st.st_mtime, st.st_size
+
+    @property
+    def text(self):
+        text = self.__text
+        if text is not None:
+            return text
+        if self._stat(self.fname) != self.stat:
+            raise Exception('Util2d lazy array error: {0} was changed after '
+                            'the array was loaded'.format(self.fname))
+        with open(self.fname, 'r') as f:
+            f.seek(self.offset)
+            return ''.join([f.readline() for i in range(self.nlines)])
+
+    @classmethod
+    def release(cls, fname):
+        """
+        keep the text of the arrays read lazily from the file fname in
+        memory, so fname can be overwritten
+        """
+        fname = os.path.normcase(os.path.abspath(fname))
+        with cls._lock:
+            lazy = cls._sources.pop(fname, None)
+        if lazy is None:
+            return
+        for text in list(lazy):
+            if text.__text is None:
+                text.__text = text.text
+
+    def get_array(self, shape, dtype, cnstnt=1):
+        # arrays with a multiplier are cached separately
+        key = self if cnstnt == 1 else (self, cnstnt)
+        array = self.cache.get(key)
+        if array is None:
+            if cnstnt == 1:
+                array = Util2d.load_txt(shape, StringIO(self.text), dtype,
+                                        self.fmtin)
+                if array.dtype != dtype:
+                    array = array.astype(dtype)
+                # cached arrays are shared, so they must not be changed in
+                # place
+                array.flags.writeable = False
+            else:
+                array = Util2d._apply_cnstnt(self.get_array(shape, dtype),
+                                             cnstnt, dtype)
+            self.cache.put(key, array)
+        return array
+
+
 class Util2d(object):
     """
     Util2d class for handling 2-D model arrays
@@ -1624,6 +1880,10 @@ class Util2d(object):
 
     """
 
+    # attributes that only hold things built from the others
+    _cache_attributes = ('_Util2d__effective_array', '_Util2d__written',
+                         '_Util2d__version', '_Util2d__value_built')
+
     def __init__(self, model, shape, dtype, value, name, fmtin=None,
                  cnstnt=1.0, iprn=-1, ext_filename=None, locat=None, bin=False,
                  how=None, array_free_format=None):
@@ -1674,6 +1934,7 @@ class Util2d(object):
         self.dtype = dtype
         self.name = name
         self.locat = locat
+        self.__lazy = None
         self.parse_value(value)
         if self.vtype == str:
             fmtin = "(FREE)"
@@ -1840,6 +2101,8 @@ class Util2d(object):
                                    array_free_format=self.format.array_free_format)
 
     def get_value(self):
+        if self.__lazy is not None:
+            return self._array.copy()
         return copy.deepcopy(self.__value)
 
     # overloads, tries to avoid creating arrays if possible
@@ -1869,20 +2132,25 @@ class Util2d(object):
     def __eq__(self, other):
         if not isinstance(other, Util2d):
             return False
-        if not np.array_equal(other.array, self.array):
+        if not np.array_equal(other._get_effective_array(),
+                              self._get_effective_array()):
             return False
         if other.cnstnt != self.cnstnt:
             return False
         return True
 
     def __getitem__(self, k):
+        # the values are taken from the read-only effective array, so only
+        # the parts of it that are returned are copied
+        a = self._get_effective_array()
+        value = None
         if isinstance(k, int):
             if len(self.shape) == 1:
-                return self.array[k]
+                value = a[k]
             elif self.shape[0] == 1:
-                return self.array[0, k]
+                value = a[0, k]
             elif self.shape[1] == 1:
-                return self.array[k, 0]
+                value = a[k, 0]
             else:
                 raise Exception(
                     "Util2d.__getitem__() error: an integer was passed, " +
@@ -1890,11 +2158,14 @@ class Util2d(object):
         else:
             if isinstance(k, tuple):
                 if len(k) == 2:
-                    return self.array[k[0], k[1]]
+                    value = a[k[0], k[1]]
                 if len(k) == 1:
-                    return self.array[k]
+                    value = a[k]
             else:
-                return self.array[(k,)]
+                value = a[(k,)]
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+        return value
 
     def __setitem__(self, k, value):
         """
@@ -1904,6 +2175,7 @@ class Util2d(object):
         a[k] = value
         a = a.astype(self.dtype)
         self.__value = a
+        self.__lazy = None
         if self.__value_built is not None:
             self.__value_built = None
 
@@ -1919,18 +2191,26 @@ class Util2d(object):
             self._how = value
         else:
             super(Util2d, self).__setattr__(key, value)
+        # any other change can change the array, so it is built again the
+        # next time it is used, files written before are written again and
+        # the instance gets a new version
+        if key not in self._cache_attributes:
+            super(Util2d, self).__setattr__('_Util2d__effective_array', None)
+            super(Util2d, self).__setattr__('_Util2d__written', None)
+            super(Util2d, self).__setattr__('_Util2d__version',
+                                            next(_versions))
 
     def all(self):
-        return self.array.all()
+        return self._get_effective_array().all()
 
     def __len__(self):
         return self.shape[0]
 
     def sum(self):
-        return self.array.sum()
+        return self._get_effective_array().sum()
 
     def unique(self):
-        return np.unique(self.array)
+        return np.unique(self._get_effective_array())
 
     @property
     def format(self):
@@ -1944,6 +2224,8 @@ class Util2d(object):
 
     @property
     def vtype(self):
+        if self.__lazy is not None:
+            return np.ndarray
         return type(self.__value)
 
     @property
@@ -2073,6 +2355,9 @@ class Util2d(object):
         else:
             how = self._how
 
+        if how != "constant" and self._write_binary():
+            return self._get_binary_entry()
+
         if not self.format.array_free_format and self.format.free:
             print("Util2d {0}: can't be free format...resetting".format(
                 self.name))
@@ -2096,6 +2381,8 @@ class Util2d(object):
         if how == "internal":
             assert not self.format.binary, "Util2d error: 'how' is internal, but" + \
                                            "format is binary"
+            if self._is_unchanged_lazy():
+                return self._get_lazy_internal_entry()
             cr = self.get_internal_cr()
             return cr + self.string
 
@@ -2106,14 +2393,22 @@ class Util2d(object):
 
             # write a file if needed
             if self.vtype != str:
-                if self.format.binary:
-                    self.write_bin(self.shape, self.python_file_path,
+                python_file_path = self.python_file_path
+                fortran = self.format.fortran
+                digest = self._get_digest()
+                if getattr(self.model, '_write_incremental', False) and \
+                        self._is_written(python_file_path, fortran, digest):
+                    pass
+                elif self.format.binary:
+                    self.write_bin(self.shape, python_file_path,
                                    self._array,
                                    bintype="head")
+                    self._set_written(python_file_path, fortran, digest)
                 else:
-                    self.write_txt(self.shape, self.python_file_path,
+                    self.write_txt(self.shape, python_file_path,
                                    self._array,
-                                   fortran_format=self.format.fortran)
+                                   fortran_format=fortran)
+                    self._set_written(python_file_path, fortran, digest)
 
             elif self.__value != self.python_file_path:
                 if os.path.exists(self.python_file_path):
@@ -2155,6 +2450,119 @@ class Util2d(object):
             raise Exception("Util2d.get_file_entry() error: " + \
                             "unrecognized 'how':{0}".format(how))
 
+    def _get_state(self):
+        """
+        get a token that changes when the instance is changed.  An ndarray
+        value can be changed in place, so the token includes the contents
+        of the array.
+        """
+        if self.__lazy is None and self.vtype == np.ndarray:
+            return self.__version, self.format.fortran, self._get_digest()
+        return self.__version, self.format.fortran
+
+    def _get_digest(self):
+        """
+        get a hash of the contents of the array (without the multiplier)
+        """
+        return hashlib.md5(
+            np.ascontiguousarray(self._array).tostring()).hexdigest()
+
+    def _get_written_files(self):
+        """
+        get the external file the array was last written to (the file
+        copied to python_file_path for arrays read from a file)
+        """
+        if self.__written is not None:
+            return [self.__written[0]]
+        if self.vtype == str and os.path.exists(self.python_file_path):
+            return [self.python_file_path]
+        return []
+
+    def _set_written(self, python_file_path, fortran, digest):
+        """
+        remember that the array with the contents digest (see _get_digest)
+        was written to python_file_path with the fortran format
+        """
+        st = os.stat(python_file_path)
+        self.__written = (python_file_path, fortran, digest, st.st_mtime,
+                          st.st_size)
+
+    def _is_written(self, python_file_path, fortran, digest):
+        """
+        True if the array with the contents digest was written to
+        python_file_path with the fortran format, and the file was not
+        changed since
+        """
+        if self.__written is None or not os.path.exists(python_file_path):
+            return False
+        st = os.stat(python_file_path)
+        return self.__written == (python_file_path, fortran, digest,
+                                  st.st_mtime, st.st_size)
+
+    def _write_binary(self):
+        """
+        True if the model is being written with array_format='binary' and
+        the array can be read by MODFLOW from a binary file (2-D real arrays)
+        """
+        if getattr(self.model, '_write_array_format', None) != 'binary':
+            return False
+        if self.model.array_format != 'modflow':
+            return False
+        return len(self.shape) == 2 and self.dtype == np.float32
+
+    def _get_binary_entry(self):
+        """
+        write the array to a MODFLOW binary file next to the external text
+        file name (extension .bin) and get the control record.  The file is
+        only written again if the array was changed since it was written.
+        """
+        filename = os.path.splitext(self.filename)[0] + '.bin'
+        model_file_path = os.path.join(
+            os.path.dirname(self.model_file_path), filename)
+        python_file_path = os.path.join(
+            os.path.dirname(self.python_file_path), filename)
+
+        digest = self._get_digest()
+        if not self._is_written(python_file_path, '(BINARY)', digest):
+            self.write_bin(self.shape, python_file_path,
+                           self._array.astype(np.float32, copy=False),
+                           bintype="head")
+            self._set_written(python_file_path, '(BINARY)', digest)
+
+        if self.format.array_free_format:
+            cr = 'OPEN/CLOSE  {0:>30s} {1:15.6G} {2:>10s} {3:2.0f} ' \
+                 '{4:<30s}\n'.format(model_file_path, self.cnstnt,
+                                     '(BINARY)', self.iprn, self.name)
+        else:
+            locat = self.model.next_ext_unit()
+            self.model.add_external(model_file_path, locat, True)
+            cr = '{0:>10.0f}{1:>10.5G}{2:>19s}{3:>10.0f} #{4}\n' \
+                .format(-locat, self.cnstnt, '(BINARY)', self.iprn,
+                        self.name)
+        return cr
+
+    def _is_unchanged_lazy(self):
+        """
+        True if the array was loaded lazily and neither the array nor its
+        format have been changed since
+        """
+        if self.__lazy is None or not self.format.array_free_format:
+            return False
+        return self.__lazy.format == (self.format.fortran, self.format.free,
+                                      self.format.binary)
+
+    def _get_lazy_internal_entry(self):
+        """
+        get the internal control record and the original text of a lazily
+        loaded array, so the array is written without being parsed
+        """
+        cr = 'INTERNAL {0:15.6G} {1:>10s} {2:2.0f} #{3:<30s}\n' \
+            .format(self.cnstnt, self.__lazy.fmtin, self.iprn, self.name)
+        text = self.__lazy.text
+        if not text.endswith('\n'):
+            text += '\n'
+        return cr + text
+
     @property
     def string(self):
         """
@@ -2187,16 +2595,61 @@ class Util2d(object):
             model - with the effects of the control record multiplier applied.
 
         """
+        if self.__lazy is None and self.vtype == np.ndarray:
+            return Util2d._apply_cnstnt(self._array, self._get_cnstnt(),
+                                        self.dtype, copy=True)
+        return self._get_effective_array().copy()
+
+    def _get_effective_array(self):
+        """
+        get the array representation of value attribute with the effects of
+        the control record multiplier applied as a read-only array, without
+        a copy if possible.  Arrays loaded from a file or built from a
+        constant are built once, until the Util2d instance is changed.  An
+        array built from an ndarray value is built again on every call (or
+        is a read-only view of the value if no change is needed), so changes
+        made to the value in place are always seen.
+        """
+        cnstnt = self._get_cnstnt()
+        if self.__lazy is not None:
+            return self.__lazy.get_array(self.shape, self.dtype, cnstnt)
+        if self.vtype == np.ndarray:
+            return Util2d._apply_cnstnt(self._array, cnstnt, self.dtype)
+        if self.__effective_array is None:
+            self.__effective_array = Util2d._apply_cnstnt(self._array,
+                                                          cnstnt, self.dtype)
+        return self.__effective_array
+
+    def _get_cnstnt(self):
+        # the multiplier applied to the array, a multiplier of 0.0 is
+        # ignored
         if isinstance(self.cnstnt, int):
-            cnstnt = self.cnstnt
+            return self.cnstnt
+        if self.cnstnt == 0.0:
+            return 1.0
+        return self.cnstnt
+
+    @staticmethod
+    def _apply_cnstnt(a, cnstnt, dtype, copy=False):
+        """
+        return a multiplied by cnstnt and cast to dtype.  The array is
+        read-only, and a read-only view of a if no change is needed, unless
+        copy is True; then it is always a new array that can be changed.
+        """
+        if cnstnt != 1:
+            b = a * cnstnt
         else:
-            if self.cnstnt == 0.0:
-                cnstnt = 1.0
-            else:
-                cnstnt = self.cnstnt
-        # return a copy of self._array since it is being
-        # multiplied
-        return (self._array * cnstnt).astype(self.dtype)
+            b = a
+        if b.dtype != dtype:
+            b = b.astype(dtype)
+        if copy:
+            if b is a:
+                b = a.copy()
+            return b
+        if b is a:
+            b = a.view()
+        b.flags.writeable = False
+        return b
 
     @property
     def _array(self):
@@ -2209,7 +2662,9 @@ class Util2d(object):
             in the control record.  To get the array as the model sees it (with the multiplier applied),
             use the Util2d.array method.
         """
-        if self.vtype == str:
+        if self.__lazy is not None:
+            return self.__lazy.get_array(self.shape, self.dtype)
+        elif self.vtype == str:
             if self.__value_built is None:
                 file_in = open(self.__value, 'r')
 
@@ -2271,68 +2726,219 @@ class Util2d(object):
         made static to support the load functionality 
         this routine now supports fixed format arrays where the numbers
         may touch.
+
+        The lines are read in blocks and the values are cast to dtype
+        with a single numpy call.  Fixed-width fields are split with a
+        numpy view of the block, so only the lines that belong to the
+        array are read from file_in.
         """
-        # file_in = open(self.__value,'r')
-        # file_in = open(filename,'r')
-        # nrow,ncol = self.shape
         nrow, ncol = shape
         npl, fmt, width, decimal = ArrayFormat.decode_fortran_descriptor(fmtin)
-        data = np.zeros((nrow * ncol), dtype=dtype) + np.NaN
-        d = 0
         if not hasattr(file_in, 'read'):
             file_in = open(file_in, 'r')
-        while True:
-            line = file_in.readline()
-            if line in [None, ''] or d == nrow * ncol:
-                break
-            if npl == 'free':
-                raw = line.strip('\n').split()
-                if len(raw) == 1 and ',' in line:
-                    raw = raw[0].split(',')
-                elif ',' in line:
-                    raw = line.replace(',','').strip('\n').split()
+        n = nrow * ncol
+        if npl == 'free':
+            raw = Util2d._read_txt_free(file_in, n)
+        else:
+            raw = Util2d._read_txt_fixed(file_in, n, npl, width)
+        if len(raw) < n:
+            raise Exception('Util2d.load_txt() error: only {0} of {1} '
+                            'values found'.format(len(raw), n))
+        raw = raw[:n]
+        try:
+            if npl != 'free':
+                # numpy casts byte strings much faster than unicode strings
+                data = raw.astype(dtype)
+            elif np.dtype(dtype).kind in 'fiu':
+                data = Util2d._parse_free(raw, dtype)
             else:
-                # split line using number of values in the line
-                rawlist = []
-                istart = 0
-                istop = width
-                for i in range(npl):
-                    txtval = line[istart:istop]
-                    if txtval.strip() != '':
-                        rawlist.append(txtval)
-                    else:
-                        break
-                    istart = istop
-                    istop += width
-                raw = rawlist
-
+                data = np.array(raw).astype(dtype)
+        except:
             for a in raw:
+                if isinstance(a, bytes):
+                    a = a.decode()
                 try:
-                    data[d] = dtype(a)
+                    dtype(a)
                 except:
                     raise Exception('Util2d:unable to cast value: ' +
                                     str(a) + ' to type:' + str(dtype))
-                if d == (nrow * ncol) - 1:
-                    assert len(data) == (nrow * ncol)
-                    data.resize(nrow, ncol)
-                    return data
-                d += 1
-                #        file_in.close()
-        if np.isnan(np.sum(data)):
-            raise Exception("Util2d.load_txt() error: np.NaN in data array")
-        data.resize(nrow, ncol)
-        return data
+            raise
+        return data.reshape(nrow, ncol)
+
+    @staticmethod
+    def _parse_free(raw, dtype):
+        """
+        convert the free format values (strings) in raw to an array of
+        dtype with a single numpy call.  Values are parsed as 64 bit
+        numbers and cast to dtype, like float() and int() followed by a
+        cast.  A ValueError is raised if a value can't be converted.
+        """
+        if np.dtype(dtype).kind == 'f':
+            ptype = np.float64
+        else:
+            ptype = np.int64
+        return np.array(raw, dtype=ptype).astype(dtype, copy=False)
+
+    @staticmethod
+    def _encode(s):
+        """
+        return the string s as ascii bytes, one byte per character
+        """
+        if isinstance(s, bytes):
+            return s
+        return s.encode('ascii', 'replace')
+
+    @staticmethod
+    def _read_txt_free(file_in, n):
+        """
+        read the values of a free format array from file_in as a list of
+        strings.  Lines are read until at least n values have been found.
+        """
+        raw = []
+        while len(raw) < n:
+            line = file_in.readline()
+            if line in [None, '']:
+                break
+            raw.extend(Util2d._split_free(line))
+        return raw
+
+    @staticmethod
+    def _read_lines_free(file_in, n):
+        """
+        read the lines of a free format array with n values from file_in
+        without parsing the values.  The values are counted with numpy, a
+        block of lines at a time.
+        """
+        lines = []
+        nread = 0
+        while nread < n:
+            try:
+                pos = file_in.tell()
+            except (IOError, OSError):
+                pos = None
+            line = file_in.readline()
+            if line in [None, '']:
+                break
+            # estimate the number of lines from the values in the first one,
+            # lines can only be read ahead if file_in can go back
+            nvalues = Util2d._count_free_values([line])[0]
+            if pos is None or nvalues == 0:
+                nlines = 1
+            else:
+                nlines = -(-(n - nread) // nvalues)
+            block = [line]
+            for i in range(nlines - 1):
+                line = file_in.readline()
+                if line in [None, '']:
+                    break
+                block.append(line)
+            counts = np.cumsum(Util2d._count_free_values(block))
+            nkeep = np.searchsorted(counts, n - nread) + 1
+            if nkeep < len(block):
+                # too many lines were read, go back and keep the lines
+                # up to the last value of the array
+                nlines = nkeep
+                block = block[:nlines]
+                file_in.seek(pos)
+                for i in range(nlines):
+                    file_in.readline()
+                counts = counts[:nlines]
+            lines.extend(block)
+            nread += counts[-1]
+            if len(block) < nlines:
+                break
+        return lines
+
+    @staticmethod
+    def _count_free_values(lines):
+        """
+        count the free format values in each of the lines
+        """
+        text = ''.join(lines)
+        codes = np.frombuffer(Util2d._encode(text), dtype=np.uint8)
+        # a value starts where a non-blank character follows a blank one
+        nonblank = codes > 32
+        start = nonblank.copy()
+        start[1:] &= ~nonblank[:-1]
+        # line number of the start of each value
+        newline = np.flatnonzero(codes == 10)
+        iline = np.searchsorted(newline, np.flatnonzero(start))
+        counts = np.bincount(iline, minlength=len(lines) + 1)[:len(lines)]
+        if ',' in text:
+            # lines with commas are counted the way _read_txt_free splits them
+            for i, line in enumerate(lines):
+                if ',' in line:
+                    counts[i] = len(Util2d._split_free(line))
+        return counts
+
+    @staticmethod
+    def _split_free(line):
+        if ',' in line:
+            values = line.strip('\n').split()
+            if len(values) == 1:
+                return values[0].split(',')
+            return line.replace(',', '').strip('\n').split()
+        return line.split()
+
+    @staticmethod
+    def _read_txt_fixed(file_in, n, npl, width, lines_read=None):
+        """
+        read the values of a fixed format array with npl fields of width
+        characters per line from file_in as a numpy array of byte strings.
+        Values in a line after the first blank field are ignored.  If
+        lines_read is a list, the lines are appended to it.
+        """
+        nchar = npl * width
+        blocks = []
+        nread = 0
+        while nread < n:
+            # a line holds at most npl values, so this never reads past
+            # the end of the array
+            nlines = -(-(n - nread) // npl)
+            lines = []
+            for i in range(nlines):
+                line = file_in.readline()
+                if line in [None, '']:
+                    break
+                if lines_read is not None:
+                    lines_read.append(line)
+                lines.append(line.rstrip('\r\n').ljust(nchar)[:nchar])
+            if len(lines) == 0:
+                break
+            buf = Util2d._encode(''.join(lines))
+            fields = np.frombuffer(buf, dtype='S{0}'.format(width))
+            fields = fields.reshape(len(lines), npl)
+            # blank fields contain only whitespace and control characters
+            codes = np.frombuffer(buf, dtype=np.uint8)
+            nonblank = (codes > 32).reshape(len(lines), npl, width).any(axis=2)
+            valid = np.cumprod(nonblank, axis=1).astype(bool)
+            values = fields[valid]
+            blocks.append(values)
+            nread += values.size
+            if len(lines) < nlines:
+                break
+        if len(blocks) == 0:
+            return np.array([], dtype='S{0}'.format(width))
+        return np.concatenate(blocks)
 
     @staticmethod
     def write_txt(shape, file_out, data, fortran_format="(FREE)",
                   python_format=None):
-        if fortran_format.upper() == '(FREE)' and python_format is None:
+        if not hasattr(file_out, "write"):
+            _LazyText.release(file_out)
+            _unlink(file_out)
+        if fortran_format.upper() == '(FREE)' and python_format is None \
+                and np.ndim(data) == 1:
             np.savetxt(file_out, data,
                        ArrayFormat.get_default_numpy_fmt(data.dtype),
                        delimiter='')
             return
         if not hasattr(file_out, "write"):
-            file_out = open(file_out, 'w')
+            with open(file_out, 'w') as f:
+                Util2d.write_txt(shape, f, data,
+                                 fortran_format=fortran_format,
+                                 python_format=python_format)
+            return
         file_out.write(
             Util2d.array2string(shape, data, fortran_format=fortran_format,
                                 python_format=python_format))
@@ -2347,6 +2953,11 @@ class Util2d(object):
         made static to support the load functionality
         this routine now supports fixed format arrays where the numbers
         may touch.
+
+        integer arrays in (FREE) and I formats are built for the whole
+        array at once with numpy, other formats are written with one
+        python format call per row.  The result is the same as formatting
+        each value with the python format.
         """
         if len(shape) == 2:
             nrow, ncol = shape
@@ -2357,7 +2968,13 @@ class Util2d(object):
         if python_format is None:
             column_length, fmt, width, decimal = \
                 ArrayFormat.decode_fortran_descriptor(fortran_format)
-            if decimal is None:
+            if column_length == 'free':
+                column_length = ncol
+                if data.dtype.kind in 'iub':
+                    output_fmt = '{0:10d}'
+                else:
+                    output_fmt = '{0:15.6E}'
+            elif decimal is None:
                 output_fmt = '{0}0:{1}{2}{3}'.format('{', width, 'd', '}')
             else:
                 output_fmt = '{0}0:{1}.{2}{3}{4}'.format('{', width, decimal,
@@ -2373,26 +2990,120 @@ class Util2d(object):
                                 + '  python_format should be a list with\n'
                                 + '   [column_length, fmt]\n'
                                 + '    e.g., [10, {0:10.2e}]')
-        if ncol % column_length == 0:
-            linereturnflag = False
-        else:
-            linereturnflag = True
-        # write the array to a string
-        s = ""
+        if data.shape[0] < nrow or data.shape[1] < ncol:
+            return Util2d._array2string_values(nrow, ncol, data,
+                                               column_length, output_fmt)
+        values = data[:nrow, :ncol].ravel()
+        try:
+            m = re.match(r'^\{0:(\d+)d\}$', output_fmt)
+            if m is not None and values.size > 0 and \
+                    (values.dtype.kind == 'i' or
+                     (values.dtype.kind == 'u' and values.dtype.itemsize < 8)):
+                fields = Util2d._int_fields(values, int(m.group(1)))
+                if fields is not None:
+                    return Util2d._join_fields(fields, nrow, ncol,
+                                               column_length)
+            # a single format call for all values of a row
+            template = Util2d._row_template(ncol, column_length,
+                                            '{' + output_fmt[2:])
+            if not output_fmt.startswith('{0:') or \
+                    template.count('{') != ncol:
+                raise ValueError('not a single value format')
+            values = values.tolist()
+            return ''.join([template.format(*values[i:i + ncol])
+                            for i in range(0, len(values), ncol)])
+        except Exception:
+            # write value by value to report the value that fails
+            return Util2d._array2string_values(nrow, ncol, data,
+                                               column_length, output_fmt)
+
+    @staticmethod
+    def _array2string_values(nrow, ncol, data, column_length, output_fmt):
+        """
+        return the string representation of data formatting one value at
+        a time
+        """
+        s = []
         for i in range(nrow):
-            icol = 0
             for j in range(ncol):
                 try:
-                    s = s + output_fmt.format(data[i, j])
+                    s.append(output_fmt.format(data[i, j]))
                 except Exception as e:
                     raise Exception("error writing array value" + \
                                     "{0} at r,c [{1},{2}]\n{3}".format(
                                         data[i, j], i, j, str(e)))
                 if (j + 1) % column_length == 0.0 and (j != 0 or ncol == 1):
-                    s += '\n'
-            if linereturnflag:
-                s += '\n'
-        return s
+                    s.append('\n')
+            if ncol % column_length != 0:
+                s.append('\n')
+        return ''.join(s)
+
+    @staticmethod
+    def _row_template(ncol, column_length, field):
+        """
+        return the text of one array row with field for every value and
+        the line breaks for column_length values per line
+        """
+        s = []
+        for j in range(ncol):
+            s.append(field)
+            if (j + 1) % column_length == 0.0 and (j != 0 or ncol == 1):
+                s.append('\n')
+        if ncol % column_length != 0:
+            s.append('\n')
+        return ''.join(s)
+
+    @staticmethod
+    def _join_fields(fields, nrow, ncol, column_length):
+        """
+        join the (nrow * ncol, width) byte array of formatted values into
+        lines of column_length values
+        """
+        width = fields.shape[1]
+        fields = fields.reshape(nrow, ncol * width)
+        # the values of a row are split in the same lines for every row
+        lines = Util2d._row_template(ncol, column_length, 'x').split('\n')
+        rows = np.empty((nrow, ncol * width + len(lines) - 1),
+                        dtype=np.uint8)
+        rows.fill(ord('\n'))
+        pos = 0
+        j = 0
+        for line in lines:
+            n = len(line) * width
+            rows[:, pos:pos + n] = fields[:, j:j + n]
+            pos += n + 1
+            j += n
+        return rows.tostring().decode('ascii')
+
+    @staticmethod
+    def _int_fields(values, width):
+        """
+        return the (len(values), width) byte array of the integer values
+        right aligned in fields of width characters, None if a value does
+        not fit in width
+        """
+        neg = values < 0
+        mag = np.abs(values.astype(np.int64)).astype(np.uint64)
+        # number of digits of every value
+        ndigits = np.ones(values.shape, dtype=np.int64)
+        k = 10
+        while k <= int(mag.max()):
+            ndigits += mag >= np.uint64(k)
+            k *= 10
+        if np.any(ndigits + neg > width):
+            return None
+        fields = np.zeros((values.size, width), dtype=np.uint8)
+        ten = np.uint64(10)
+        for j in range(width - 1, width - 1 - ndigits.max(), -1):
+            q = mag // ten
+            fields[:, j] = mag - q * ten
+            mag = q
+        fields += ord('0')
+        # leading zeros are blank
+        fields[np.arange(width) < width - ndigits[:, None]] = ord(' ')
+        isneg = np.where(neg)[0]
+        fields[isneg, width - ndigits[isneg] - 1] = ord('-')
+        return fields
 
     @staticmethod
     def load_bin(shape, file_in, dtype, bintype=None):
@@ -2411,7 +3122,12 @@ class Util2d(object):
     @staticmethod
     def write_bin(shape, file_out, data, bintype=None, header_data=None):
         if not hasattr(file_out, 'write'):
-            file_out = open(file_out, 'wb')
+            _LazyText.release(file_out)
+            _unlink(file_out)
+            with open(file_out, 'wb') as f:
+                Util2d.write_bin(shape, f, data, bintype=bintype,
+                                 header_data=header_data)
+            return
         dtype = data.dtype
         if dtype.kind != 'i':
             if bintype is not None:
@@ -2505,10 +3221,13 @@ class Util2d(object):
         external and internal record types must be fully loaded
         if you are using fixed format record types,make sure 
         ext_unit_dict has been initialized from the NAM file
+        if model.array_cache is set (Modflow.load(lazy=True)), text arrays
+        are read without being parsed (see Util2d._load_lazy)
         """
         if shape == (0, 0):
             raise IndexError('No information on model grid dimensions. '
                              'Need nrow, ncol to load a Util2d array.')
+        lazy = getattr(model, 'array_cache', None) is not None
         curr_unit = None
         if ext_unit_dict is not None:
             # determine the current file's unit number
@@ -2546,6 +3265,15 @@ class Util2d(object):
             # load_txt(shape, file_in, dtype, fmtin):
             assert os.path.exists(fname), "Util2d.load() error: open/close " + \
                                           "file " + str(fname) + " not found"
+            if lazy and str('binary') not in str(cr_dict['fmtin'].lower()):
+                f = open(fname, 'r')
+                u2d = Util2d._load_lazy(model, shape, dtype, f,
+                                        cr_dict['fmtin'], name,
+                                        iprn=cr_dict['iprn'],
+                                        cnstnt=cr_dict['cnstnt'],
+                                        array_free_format=array_free_format)
+                f.close()
+                return u2d
             if str('binary') not in str(cr_dict['fmtin'].lower()):
                 f = open(fname, 'r')
                 data = Util2d.load_txt(shape=shape,
@@ -2562,6 +3290,13 @@ class Util2d(object):
                          array_free_format=array_free_format)
 
 
+        elif cr_dict['type'] == 'internal' and lazy:
+            u2d = Util2d._load_lazy(model, shape, dtype, f_handle,
+                                    cr_dict['fmtin'], name,
+                                    iprn=cr_dict['iprn'],
+                                    cnstnt=cr_dict['cnstnt'], locat=None,
+                                    array_free_format=array_free_format)
+
         elif cr_dict['type'] == 'internal':
             data = Util2d.load_txt(shape, f_handle, dtype, cr_dict['fmtin'])
             u2d = Util2d(model, shape, dtype, data, name=name,
@@ -2569,6 +3304,17 @@ class Util2d(object):
                          cnstnt=cr_dict['cnstnt'], locat=None,
                          array_free_format=array_free_format)
 
+        elif cr_dict['type'] == 'external' and lazy and \
+                str('binary') not in str(cr_dict['fmtin'].lower()):
+            assert cr_dict['nunit'] in list(ext_unit_dict.keys())
+            u2d = Util2d._load_lazy(model, shape, dtype,
+                                    ext_unit_dict[cr_dict['nunit']].filehandle,
+                                    cr_dict['fmtin'], name,
+                                    iprn=cr_dict['iprn'],
+                                    cnstnt=cr_dict['cnstnt'],
+                                    array_free_format=array_free_format)
+            model.pop_key_list.append(cr_dict['nunit'])
+
         elif cr_dict['type'] == 'external':
             if str('binary') not in str(cr_dict['fmtin'].lower()):
                 assert cr_dict['nunit'] in list(ext_unit_dict.keys())
@@ -2599,6 +3345,41 @@ class Util2d(object):
 
         return u2d
 
+    @staticmethod
+    def _load_lazy(model, shape, dtype, file_in, fmtin, name, **kwargs):
+        """
+        read a text array from file_in without parsing the values.  The
+        position of the text in the file is kept and the text is parsed the
+        first time the array is used.  Parsed arrays are kept in
+        model.array_cache.  If neither the array nor its format are changed,
+        the text is written back unchanged.
+        """
+        nrow, ncol = shape
+        n = nrow * ncol
+        try:
+            offset = file_in.tell()
+        except (AttributeError, IOError, OSError):
+            offset = None
+        npl, fmt, width, decimal = ArrayFormat.decode_fortran_descriptor(fmtin)
+        if npl == 'free':
+            lines = Util2d._read_lines_free(file_in, n)
+            nvalues = Util2d._count_free_values(lines).sum()
+        else:
+            lines = []
+            nvalues = len(Util2d._read_txt_fixed(file_in, n, npl, width,
+                                                 lines_read=lines))
+        if nvalues < n:
+            raise Exception('Util2d.load_txt() error: only {0} of {1} '
+                            'values found'.format(nvalues, n))
+        u2d = Util2d(model, shape, dtype, 0, name=name, fmtin="(FREE)",
+                     **kwargs)
+        u2d.__lazy = _LazyText(lines, file_in, offset, fmtin,
+                               model.array_cache)
+        u2d.__lazy.format = (u2d.format.fortran, u2d.format.free,
+                             u2d.format.binary)
+        u2d._decide_how()
+        return u2d
+
     @staticmethod
     def parse_control_record(line, current_unit=None, dtype=np.float32,
                              ext_unit_dict=None, array_format=None):
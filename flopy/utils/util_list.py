@@ -10,8 +10,10 @@ util_list module.  Contains the mflist class.
 from __future__ import division, print_function
 
 import os
+import hashlib
 import warnings
 import numpy as np
+from ..utils.flopy_io import _unlink
 
 
 class MfList(object):
@@ -45,12 +47,18 @@ class MfList(object):
 
     Notes
     -----
+    When the data are written, a stress period with the same contents as
+    the previous stress period is written with itmp = -1 (reuse the data
+    from the last stress period).
 
     Examples
     --------
 
     """
 
+    # number of records formatted with each write to the output file
+    _chunksize = 2 ** 16
+
     def __init__(self, package, data=None, dtype=None, model=None,
                  list_free_format=None):
 
@@ -80,6 +88,7 @@ class MfList(object):
             self.__dtype = dtype
         self.__vtype = {}
         self.__data = {}
+        self.__written = {}
         if data is not None:
             self.__cast_data(data)
         self.list_free_format = list_free_format
@@ -351,6 +360,48 @@ class MfList(object):
                             str(e))
         self.__vtype[kper] = np.recarray
 
+    @staticmethod
+    def __is_same(d, last):
+        # True if the recarray d has the same contents as the recarray last
+        if last is None or d.dtype.hasobject or d.shape != last.shape:
+            return False
+        return d is last or np.array_equal(d, last)
+
+    @staticmethod
+    def __get_digest(d):
+        # a hash of the contents of the recarray d
+        return hashlib.md5(np.ascontiguousarray(d).tostring()).hexdigest()
+
+    def _get_state(self):
+        """
+        get a token that changes when the data of any stress period are
+        changed.  The recarrays can be changed in place, so the token is
+        built from the contents of the recarrays.
+        """
+        digests = {}
+        state = [self.list_free_format]
+        for kper in sorted(self.__data.keys()):
+            d = self.__data[kper]
+            if self.__vtype[kper] == np.recarray:
+                if d.dtype.hasobject:
+                    # no digest, so the data are always taken as changed
+                    return object()
+                if id(d) not in digests:
+                    digests[id(d)] = self.__get_digest(d)
+                state.append((kper, d.shape, digests[id(d)]))
+            elif self.__vtype[kper] == str and os.path.exists(d):
+                state.append((kper, d, os.path.getmtime(d)))
+            else:
+                state.append((kper, d))
+        return tuple(state)
+
+    def _get_written_files(self):
+        """
+        get the external files the stress period data were written to
+        """
+        return [fpth for fpth in sorted(self.__written.keys())
+                if os.path.exists(fpth)]
+
     def add_record(self, kper, index, values):
         # Add a record to possible already set list for a given kper
         # index is a list of k,i,j or nodes.
@@ -470,6 +521,7 @@ class MfList(object):
                 single_per = [single_per]
             loop_over_kpers = single_per
 
+        last_data = None
         for kper in loop_over_kpers:
             # Fill missing early kpers with 0
             if (kper < first):
@@ -485,8 +537,19 @@ class MfList(object):
                     itmp = self.get_itmp(kper)
                 if (kper_vtype == np.recarray):
                     itmp = kper_data.shape[0]
+                    # reuse the data of the last stress period if it has
+                    # the same contents
+                    if single_per is None and \
+                            self.__is_same(kper_data, last_data):
+                        itmp = -1
+                        kper_vtype = int
+                    last_data = kper_data
                 elif (kper_vtype == int) or (kper_vtype is None):
                     itmp = kper_data
+                    if itmp == 0:
+                        last_data = None
+                else:
+                    last_data = None
             # Fill late missing kpers with -1
             else:
                 itmp = -1
@@ -507,35 +570,60 @@ class MfList(object):
                     py_filepath = os.path.join(py_filepath, filename)
                     model_filepath = os.path.join(self.model.external_path,
                                                   filename)
-                    self.__tofile(py_filepath, kper_data)
+                    self.__write_external(py_filepath, kper_data)
                     kper_vtype = str
                     kper_data = model_filepath
 
             if (kper_vtype == np.recarray):
-                name = f.name
-                f.close()
-                f = open(name, 'ab+')
-                # print(f)
                 self.__tofile(f, kper_data)
-                f.close()
-                f = open(name, 'a')
-                # print(f)
             elif (kper_vtype == str):
                 f.write("         open/close " + kper_data + '\n')
 
+    def __write_external(self, py_filepath, data):
+        # Write the recarray (data) to the external file py_filepath, unless
+        # the model is written incrementally and the file was written from
+        # the same data and was not changed since
+        written = None
+        if not data.dtype.hasobject:
+            written = (self.__get_digest(data), self.fmt_string)
+            if getattr(self.model, '_write_incremental', False) and \
+                    os.path.exists(py_filepath):
+                st = os.stat(py_filepath)
+                if self.__written.get(py_filepath) == \
+                        written + (st.st_mtime, st.st_size):
+                    return
+        self.__tofile(py_filepath, data)
+        if written is not None:
+            st = os.stat(py_filepath)
+            self.__written[py_filepath] = written + (st.st_mtime, st.st_size)
+
     def __tofile(self, f, data):
         # Write the recarray (data) to the file (or file handle) f
         assert isinstance(data, np.recarray), "MfList.__tofile() data arg " + \
                                               "not a recarray"
 
-        # Add one to the kij indices
-        lnames = [name.lower() for name in self.dtype.names]
-        # --make copy of data for multiple calls
-        d = np.recarray.copy(data)
-        for idx in ['k', 'i', 'j', 'node']:
-            if (idx in lnames):
-                d[idx] += 1
-        np.savetxt(f, d, fmt=self.fmt_string, delimiter='')
+        if not hasattr(f, 'write'):
+            _unlink(f)
+            with open(f, 'w') as fout:
+                self.__tofile(fout, data)
+            return
+
+        # The records are written in chunks, and each chunk is formatted
+        # with a single string formatting operation on the values of all of
+        # its fields.  One is added to the kij indices of the values, so
+        # data is not copied or changed.
+        names = data.dtype.names
+        nfield = len(names)
+        fmt = self.fmt_string + '\n'
+        for i0 in range(0, data.shape[0], self._chunksize):
+            chunk = data[i0:i0 + self._chunksize]
+            values = [None] * (chunk.shape[0] * nfield)
+            for i, name in enumerate(names):
+                v = chunk[name]
+                if name.lower() in ['k', 'i', 'j', 'node']:
+                    v = v + 1
+                values[i::nfield] = v.tolist()
+            f.write(fmt * chunk.shape[0] % tuple(values))
 
     def check_kij(self):
         names = self.dtype.names
@@ -851,92 +939,163 @@ class MfList(object):
         i0 = 3
         if 'inode' in self.dtype.names:
             raise NotImplementedError()
+        names = [name for name in self.dtype.names[i0:]
+                 if not self.dtype.fields[name][0] == object]
+        shape = (self.model.nlay, self.model.nrow, self.model.ncol)
         arrays = {}
-        for name in self.dtype.names[i0:]:
-            if not self.dtype.fields[name][0] == object:
-                arr = np.zeros((self.model.nlay, self.model.nrow, self.model.ncol))
-                arrays[name] = arr.copy()
+        for name in names:
+            arrays[name] = np.zeros(shape)
+
+        sarr = self.__get_kper_data(kper)
+        # if there are no entries for this kper, (maybe) mask and return
+        if sarr is None:
+            if mask:
+                for name, arr in arrays.items():
+                    arrays[name][:] = np.NaN
+            return arrays
+
+        nodes, values = self.__aggregate(sarr, names)
+        for name, arr in arrays.items():
+            if mask:
+                arr[:] = np.NaN
+            arr.ravel()[nodes] = values[name]
+            if mask:
+                arr = np.ma.masked_where(np.isnan(arr), arr)
+            arrays[name] = arr
+        return arrays
 
+    def __get_kper_data(self, kper):
+        """
+        Get the recarray in effect for stress period kper.  None is returned
+        if there are no entries for kper.
+
+        """
         # if this kper is not found
         if kper not in self.data.keys():
             kpers = list(self.data.keys())
             kpers.sort()
-            # if this kper is before the first entry,
-            # (maybe) mask and return
-            if kper < kpers[0]:
-                if mask:
-                    for name, arr in arrays.items():
-                        arrays[name][:] = np.NaN
-                return arrays
+            # if this kper is before the first entry
+            if len(kpers) == 0 or kper < kpers[0]:
+                return None
             # find the last kper
             else:
                 kper = self.__find_last_kper(kper)
 
         sarr = self.data[kper]
+        if self.vtype[kper] == str:
+            sarr = self.__fromfile(sarr)
 
         if np.isscalar(sarr):
             # if there are no entries for this kper
             if sarr == 0:
-                if mask:
-                    for name, arr in arrays.items():
-                        arrays[name][:] = np.NaN
-                return arrays
+                return None
             else:
                 raise Exception("MfList: something bad happened")
+        return sarr
 
-        for name, arr in arrays.items():
-            cnt = np.zeros((self.model.nlay, self.model.nrow, self.model.ncol),
-                           dtype=np.float)
-            for rec in sarr:
-                arr[rec['k'], rec['i'], rec['j']] += rec[name]
-                cnt[rec['k'], rec['i'], rec['j']] += 1.
+    def __aggregate(self, sarr, names):
+        """
+        Combine the entries of recarray sarr that are in the same cell.
+        Values of cond and flux are added and all other values are averaged.
+
+        Returns
+        -------
+        nodes : numpy.ndarray
+            sorted zero-based node numbers (k * nrow * ncol + i * ncol + j)
+            of the cells with entries
+        values : dict of numpy.ndarrays
+            combined values for each of the names
+
+        """
+        nrow, ncol = self.model.nrow, self.model.ncol
+        node = (sarr['k'].astype(np.int64) * nrow +
+                sarr['i']) * ncol + sarr['j']
+        # inverse holds every index of nodes, so the counts have the same
+        # length as nodes (minlength=0 is not accepted by older numpy)
+        nodes, inverse = np.unique(node, return_inverse=True)
+        cnt = np.bincount(inverse)
+        values = {}
+        for name in names:
+            v = np.bincount(inverse, weights=sarr[name].astype(np.float64))
+            # older numpy returns integers for empty weights
+            v = v.astype(np.float64, copy=False)
             # average keys that should not be added
             if name != 'cond' and name != 'flux':
-                idx = cnt > 0.
-                arr[idx] /= cnt[idx]
-            if mask:
-                arr = np.ma.masked_where(cnt == 0., arr)
-                arr[cnt == 0.] = np.NaN
+                v /= cnt
+            values[name] = v
+        return nodes, values
 
-            arrays[name] = arr.copy()
-        # elif mask:
-        #     for name, arr in arrays.items():
-        #         arrays[name][:] = np.NaN
-        return arrays
+    @property
+    def sparse_4D_arrays(self):
+        """
+        Stress period data for all stress periods as sparse 4-D arrays.
+        Unlike masked_4D_arrays, only the cells with entries are stored.
+
+        Returns
+        -------
+        out : dict of Sparse4d
+            Dictionary of Sparse4d instances with shape
+            (nper, nlay, nrow, ncol).  The dictionary keys are the MfList
+            dtype names for the stress period data ('cond', 'flux', 'bhead',
+            etc.).
+
+        Examples
+        --------
+        >>> import flopy
+        >>> ml = flopy.modflow.Modflow.load('test.nam')
+        >>> s4d = ml.wel.stress_period_data.sparse_4D_arrays['flux']
+        >>> kper, node, flux = s4d.kper, s4d.node, s4d.values
+
+        """
+        i0 = 3
+        if 'inode' in self.dtype.names:
+            raise NotImplementedError()
+        names = [name for name in self.dtype.names[i0:]
+                 if not self.dtype.fields[name][0] == object]
+        shape = (self.model.nper, self.model.nlay, self.model.nrow,
+                 self.model.ncol)
+
+        kpers, nodes, values = [], [], dict([(name, []) for name in names])
+        aggregated = {}
+        for kper in range(self.model.nper):
+            sarr = self.__get_kper_data(kper)
+            if sarr is None:
+                continue
+            # stress periods that share a recarray are only combined once
+            key = id(sarr)
+            if key not in aggregated:
+                aggregated[key] = (sarr, self.__aggregate(sarr, names))
+            node, v = aggregated[key][1]
+            kpers.append(np.repeat(np.int64(kper), node.shape[0]))
+            nodes.append(node)
+            for name in names:
+                values[name].append(v[name])
+
+        if len(kpers) > 0:
+            kper = np.concatenate(kpers)
+            node = np.concatenate(nodes)
+        else:
+            kper = np.zeros(0, dtype=np.int64)
+            node = np.zeros(0, dtype=np.int64)
+        s4ds = {}
+        for name in names:
+            if len(kpers) > 0:
+                v = np.concatenate(values[name])
+            else:
+                v = np.zeros(0, dtype=np.float64)
+            s4ds[name] = Sparse4d(shape, kper, node, v)
+        return s4ds
 
     @property
     def masked_4D_arrays(self):
-        # get the first kper
-        arrays = self.to_array(kper=0, mask=True)
-
-        # initialize these big arrays
         m4ds = {}
-        for name, array in arrays.items():
-            m4d = np.zeros((self.model.nper, self.model.nlay,
-                            self.model.nrow, self.model.ncol))
-            m4d[0, :, :, :] = array
-            m4ds[name] = m4d
-        for kper in range(1, self.model.nper):
-            arrays = self.to_array(kper=kper, mask=True)
-            for name, array in arrays.items():
-                m4ds[name][kper, :, :, :] = array
+        for name, s4d in self.sparse_4D_arrays.items():
+            m4ds[name] = s4d.todense()
         return m4ds
 
     def masked_4D_arrays_itr(self):
-        # get the first kper
-        arrays = self.to_array(kper=0, mask=True)
-
-        # initialize these big arrays
-        for name, array in arrays.items():
-            m4d = np.zeros((self.model.nper, self.model.nlay,
-                            self.model.nrow, self.model.ncol))
-            m4d[0, :, :, :] = array
-            for kper in range(1, self.model.nper):
-                arrays = self.to_array(kper=kper, mask=True)
-                for tname, array in arrays.items():
-                    if tname == name:
-                        m4d[kper, :, :, :] = array
-            yield name, m4d
+        for name, s4d in self.sparse_4D_arrays.items():
+            yield name, s4d.todense()
 
     @property
     def array(self):
@@ -950,7 +1109,7 @@ class MfList(object):
         ----------
             model : mbase dervied type
             pak_name : str package name (e.g GHB)
-            m4ds : {attibute name:4d masked numpy.ndarray}
+            m4ds : {attibute name:4d masked numpy.ndarray or Sparse4d}
         Returns
         -------
             MfList instance
@@ -967,18 +1126,27 @@ class MfList(object):
         ----------
             dtype : numpy dtype
 
-            m4ds : dict {name:masked numpy 4-dim ndarray}
+            m4ds : dict {name:masked numpy 4-dim ndarray or Sparse4d}
         Returns
         -------
             dict {kper:recarray}
         """
         assert isinstance(m4ds, dict)
         for name, m4d in m4ds.items():
-            assert isinstance(m4d, np.ndarray)
+            assert isinstance(m4d, (np.ndarray, Sparse4d))
             assert name in dtype.names
             assert m4d.ndim == 4
         keys = list(m4ds.keys())
 
+        # sparse arrays are converted without creating the 4-dim arrays
+        if any([isinstance(m4d, Sparse4d) for m4d in m4ds.values()]):
+            s4ds = {}
+            for name, m4d in m4ds.items():
+                if not isinstance(m4d, Sparse4d):
+                    m4d = Sparse4d.from_dense(m4d)
+                s4ds[name] = m4d.dropna()
+            return MfList.__sparse_to_stress_period_data(dtype, s4ds)
+
         for i1, key1 in enumerate(keys):
             a1 = np.isnan(m4ds[key1])
             for i2, key2 in enumerate(keys[i1:]):
@@ -1009,3 +1177,184 @@ class MfList(object):
                 spd[n] = v
             sp_data[kper] = spd
         return sp_data
+
+    @staticmethod
+    def __sparse_to_stress_period_data(dtype, s4ds):
+        keys = list(s4ds.keys())
+        s0 = s4ds[keys[0]]
+        for key in keys[1:]:
+            s = s4ds[key]
+            if s.shape != s0.shape or not np.array_equal(s.kper, s0.kper) \
+                    or not np.array_equal(s.node, s0.node):
+                raise Exception("Transient2d error: masking not equal" + \
+                                " for {0} and {1}".format(keys[0], key))
+
+        sp_data = {}
+        for kper in range(s0.shape[0]):
+            node, v = s0.get_kper(kper)
+            spd = np.zeros(node.shape[0], dtype=dtype).view(np.recarray)
+            spd["k"], spd["i"], spd["j"] = np.unravel_index(node,
+                                                            s0.shape[1:])
+            for name, s4d in s4ds.items():
+                spd[name] = s4d.get_kper(kper)[1]
+            sp_data[kper] = spd
+        return sp_data
+
+
+class Sparse4d(object):
+    """
+    COO-style sparse representation of a 4-dim (nper, nlay, nrow, ncol)
+    array.  Only the stress period, node and value of each active cell are
+    stored; all other cells are masked (np.NaN when converted to a dense
+    array).
+
+    Parameters
+    ----------
+    shape : tuple
+        shape of the dense array (nper, nlay, nrow, ncol)
+    kper : numpy.ndarray
+        zero-based stress period of each entry
+    node : numpy.ndarray
+        zero-based node number (k * nrow * ncol + i * ncol + j) of each entry
+    values : numpy.ndarray
+        value of each entry
+
+    Attributes
+    ----------
+    nnz : int
+        number of stored entries
+
+    Methods
+    -------
+    get_kper(kper) : tuple
+        node numbers and values of the entries for stress period kper
+    todense() : numpy.ndarray
+        4-dim array with np.NaN for cells without an entry
+
+    See Also
+    --------
+
+    Notes
+    -----
+    Entries are sorted by stress period and node.  Indexing with a stress
+    period (s4d[kper]) returns a dense 3-dim array for that stress period.
+
+    Examples
+    --------
+    >>> import flopy
+    >>> ml = flopy.modflow.Modflow.load('test.nam')
+    >>> s4d = ml.wel.stress_period_data.sparse_4D_arrays['flux']
+    >>> flux = s4d[0]
+
+    """
+
+    ndim = 4
+
+    def __init__(self, shape, kper, node, values):
+        assert len(shape) == 4
+        self.shape = tuple([int(n) for n in shape])
+        kper = np.asarray(kper, dtype=np.int64).ravel()
+        node = np.asarray(node, dtype=np.int64).ravel()
+        values = np.asarray(values).ravel()
+        assert kper.shape == node.shape == values.shape
+        # sort the entries by stress period and node
+        if np.any(np.diff(kper * np.prod(self.shape[1:]) + node) < 0):
+            idx = np.lexsort((node, kper))
+            kper, node, values = kper[idx], node[idx], values[idx]
+        self.kper = kper
+        self.node = node
+        self.values = values
+        self.__offsets = np.searchsorted(kper, np.arange(self.shape[0] + 1))
+
+    @classmethod
+    def from_dense(cls, m4d):
+        """
+        construct a Sparse4d instance from a (masked) 4-dim array.  Masked
+        and np.NaN values are not stored.
+
+        """
+        assert m4d.ndim == 4
+        if isinstance(m4d, np.ma.MaskedArray):
+            m4d = m4d.astype(np.float64).filled(np.NaN)
+        a = m4d.reshape(m4d.shape[0], -1)
+        kper, node = np.nonzero(~np.isnan(a))
+        return cls(m4d.shape, kper, node, a[kper, node])
+
+    @property
+    def nnz(self):
+        return self.values.shape[0]
+
+    @property
+    def k(self):
+        return self.node // (self.shape[2] * self.shape[3])
+
+    @property
+    def i(self):
+        return (self.node // self.shape[3]) % self.shape[2]
+
+    @property
+    def j(self):
+        return self.node % self.shape[3]
+
+    def dropna(self):
+        """
+        return a Sparse4d instance without the entries that are np.NaN
+
+        """
+        isnan = np.isnan(self.values)
+        if not np.any(isnan):
+            return self
+        idx = ~isnan
+        return Sparse4d(self.shape, self.kper[idx], self.node[idx],
+                        self.values[idx])
+
+    def get_kper(self, kper):
+        """
+        get the node numbers and values of the entries for a stress period
+
+        Parameters
+        ----------
+        kper : int
+            zero-based stress period
+
+        Returns
+        -------
+        node : numpy.ndarray
+        values : numpy.ndarray
+
+        """
+        i0, i1 = self.__offsets[kper], self.__offsets[kper + 1]
+        return self.node[i0:i1], self.values[i0:i1]
+
+    def __getitem__(self, kper):
+        if not isinstance(kper, (int, np.integer)):
+            raise NotImplementedError("Sparse4d only supports indexing " + \
+                                      "with a stress period")
+        if kper < 0:
+            kper += self.shape[0]
+        arr = np.empty(self.shape[1:])
+        arr[:] = np.NaN
+        node, values = self.get_kper(kper)
+        arr.ravel()[node] = values
+        return arr
+
+    def todense(self):
+        """
+        convert to a 4-dim numpy array with np.NaN for cells without an
+        entry
+
+        """
+        arr = np.empty(self.shape)
+        arr[:] = np.NaN
+        arr.reshape(self.shape[0], -1)[self.kper, self.node] = self.values
+        return arr
+
+    def min(self):
+        if self.nnz == 0:
+            return np.NaN
+        return np.nanmin(self.values)
+
+    def max(self):
+        if self.nnz == 0:
+            return np.NaN
+        return np.nanmax(self.values)
@@ -31,6 +31,14 @@ class ZoneBudget(object):
         NOTE: When using this option in conjunction with a list of zones,
         the zone(s) passed may either be all strings (aliases), all
         integers, or mixed.
+    n_workers : int
+        The number of processes used to compute the budgets.  The time
+        steps are split into n_workers contiguous slices, and each process
+        opens its own handle to the cell budget file and computes the
+        budgets for its slice.  The results are identical to those
+        computed with n_workers=1.  On Windows, scripts that use
+        n_workers > 1 must protect their main code with
+        if __name__ == '__main__'.  (Default is 1.)
 
     Example usage:
 
@@ -39,11 +47,27 @@ class ZoneBudget(object):
     >>> zb = ZoneBudget('zonebudtest.cbc', zon, kstpkper=(0, 0))
     >>> zb.to_csv('zonebudtest.csv')
     >>> zb_mgd = zb * 7.48052 / 1000000
+    >>> zb = ZoneBudget('zonebudtest.cbc', zon, n_workers=4)
     """
 
     def __init__(self, cbc_file, z, kstpkper=None, totim=None, aliases=None,
-                 **kwargs):
+                 n_workers=1, **kwargs):
+        self._setup(cbc_file, z, kstpkper=kstpkper, totim=totim,
+                    aliases=aliases, **kwargs)
 
+        # Build budget record array
+        steps = self._get_steps()
+        if n_workers > 1 and len(steps) > 1:
+            array_list = self._compute_budget_parallel(steps, n_workers)
+        else:
+            array_list = _compute_budget_steps((self, steps))
+        self._budget = np.concatenate(array_list, axis=0)
+        return
+
+    def _setup(self, cbc_file, z, kstpkper=None, totim=None, aliases=None,
+               **kwargs):
+        # Check the input and set up the zones and record names. The
+        # budgets are not computed.
         if 'verbose' in kwargs.keys():
             verbose = kwargs.pop('verbose')
         else:
@@ -169,6 +193,9 @@ class ZoneBudget(object):
         self._iflow_from_recnames, self._iflow_to_recnames = self._get_internal_flow_record_names()
         self._zonefieldnames = list(self._zonefieldnamedict.values())
 
+        # Zone-face topology used to accumulate the flows for every step
+        self._build_topology()
+
         # All record names in the cell-by-cell budget binary file
         self.record_names = [n.strip().decode("utf-8") for n in
                              self.cbc.get_unique_record_names()]
@@ -193,19 +220,75 @@ class ZoneBudget(object):
         # head cells or face flow terms
         self.ssst_record_names = [n for n in self.record_names
                                   if n not in internal_flow_terms]
+        return
 
-        # Build budget record array
-        array_list = []
+    def _get_steps(self):
+        # List of (kstpkper, totim) tuples for the budgets to compute
         if self.kstpkper is not None:
-            for kk in self.kstpkper:
-                recordarray = self._compute_budget(kstpkper=kk)
-                array_list.append(recordarray)
-        elif self.totim is not None:
-            for t in self.totim:
-                recordarray = self._compute_budget(totim=t)
-                array_list.append(recordarray)
-        self._budget = np.concatenate(array_list, axis=0)
-        return
+            return [(kk, None) for kk in self.kstpkper]
+        return [(None, t) for t in self.totim]
+
+    def _read_records(self, kstpkper=None, totim=None):
+        """
+        Read all of the records for a time step from the cell budget file.
+        Returns a dictionary of record name and a list of the records with
+        that name.
+        """
+        rec = self.cbc.recordarray
+        if kstpkper is not None:
+            idx = np.where((rec['kstp'] == kstpkper[0] + 1) &
+                           (rec['kper'] == kstpkper[1] + 1))[0]
+        else:
+            idx = np.where(rec['totim'] == totim)[0]
+        records = OrderedDict()
+        for i in idx:
+            name = rec['text'][i].strip().decode('utf-8')
+            records.setdefault(name, []).append(self.cbc.get_record(i))
+        return records
+
+    def _get_data(self, recname, kstpkper=None, totim=None, records=None,
+                  full3D=False):
+        """
+        Get the list of records named recname for a time step from records,
+        a dictionary of the records that have already been read for the
+        time step, or from the cell budget file if records is None.
+        """
+        if records is None:
+            return self.cbc.get_data(text=recname, kstpkper=kstpkper,
+                                     totim=totim, full3D=full3D)
+        data = records.get(recname, [])
+        if full3D:
+            data = [self.cbc.create3D(d, self.nlay, self.nrow, self.ncol)
+                    if isinstance(d, np.recarray) else d for d in data]
+        return data
+
+    def __getstate__(self):
+        """
+        Return the state for pickling.  The model objects are not pickled.
+        """
+        state = self.__dict__.copy()
+        state.pop('model', None)
+        state['dis'] = None
+        return state
+
+    def _compute_budget_parallel(self, steps, n_workers):
+        """
+        Compute the budgets for a list of (kstpkper, totim) steps using a
+        pool of n_workers processes.  Each process computes the budgets
+        for a contiguous slice of steps and the resulting record arrays
+        are returned in the same order as steps.
+        """
+        import multiprocessing as mp
+        n_workers = min(n_workers, len(steps))
+        chunks = np.array_split(np.arange(len(steps)), n_workers)
+        args = [(self, [steps[i] for i in chunk]) for chunk in chunks]
+        pool = mp.Pool(n_workers)
+        try:
+            results = pool.map(_compute_budget_steps, args)
+        finally:
+            pool.close()
+            pool.join()
+        return [recordarray for result in results for recordarray in result]
 
     def get_model_shape(self):
         return self.nlay, self.nrow, self.ncol
@@ -395,10 +478,12 @@ class ZoneBudget(object):
         result.cbc = self.cbc
         return result
 
-    def _compute_budget(self, kstpkper=None, totim=None):
+    def _compute_budget(self, kstpkper=None, totim=None, records=None):
         """
         Creates a budget for the specified zone array. This function only supports the
-        use of a single time step/stress period or time.
+        use of a single time step/stress period or time.  If records is
+        passed, it is a dictionary of the records that have already been
+        read for the time step (see _read_records).
         """
         # Initialize the budget record array
         recordarray = self._initialize_recordarray(kstpkper=kstpkper,
@@ -413,43 +498,49 @@ class ZoneBudget(object):
 
         if 'CONSTANT HEAD' in reclist:
             reclist.remove('CONSTANT HEAD')
-            chd = self.cbc.get_data(text='CONSTANT HEAD', full3D=True,
-                                    kstpkper=kstpkper, totim=totim)[0]
+            chd = self._get_data('CONSTANT HEAD', kstpkper, totim, records,
+                                 full3D=True)[0]
             ich = np.zeros(self.cbc_shape, self.int_type)
             ich[chd != 0] = 1
         if 'FLOW RIGHT FACE' in reclist:
             reclist.remove('FLOW RIGHT FACE')
             recordarray = self._accumulate_flow_frf(recordarray,
                                                     'FLOW RIGHT FACE', ich,
-                                                    kstpkper, totim)
+                                                    kstpkper, totim,
+                                                    records)
         if 'FLOW FRONT FACE' in reclist:
             reclist.remove('FLOW FRONT FACE')
             recordarray = self._accumulate_flow_fff(recordarray,
                                                     'FLOW FRONT FACE', ich,
-                                                    kstpkper, totim)
+                                                    kstpkper, totim,
+                                                    records)
         if 'FLOW LOWER FACE' in reclist:
             reclist.remove('FLOW LOWER FACE')
             recordarray = self._accumulate_flow_flf(recordarray,
                                                     'FLOW LOWER FACE', ich,
-                                                    kstpkper, totim)
+                                                    kstpkper, totim,
+                                                    records)
         if 'SWIADDTOCH' in reclist:
             reclist.remove('SWIADDTOCH')
-            swichd = self.cbc.get_data(text='SWIADDTOCH', full3D=True,
-                                       kstpkper=kstpkper, totim=totim)[0]
+            swichd = self._get_data('SWIADDTOCH', kstpkper, totim, records,
+                                    full3D=True)[0]
             swiich = np.zeros(self.cbc_shape, self.int_type)
             swiich[swichd != 0] = 1
         if 'SWIADDTOFRF' in reclist:
             reclist.remove('SWIADDTOFRF')
             recordarray = self._accumulate_flow_frf(recordarray, 'SWIADDTOFRF',
-                                                    swiich, kstpkper, totim)
+                                                    swiich, kstpkper, totim,
+                                                    records)
         if 'SWIADDTOFFF' in reclist:
             reclist.remove('SWIADDTOFFF')
             recordarray = self._accumulate_flow_fff(recordarray, 'SWIADDTOFFF',
-                                                    swiich, kstpkper, totim)
+                                                    swiich, kstpkper, totim,
+                                                    records)
         if 'SWIADDTOFLF' in reclist:
             reclist.remove('SWIADDTOFLF')
             recordarray = self._accumulate_flow_flf(recordarray, 'SWIADDTOFLF',
-                                                    swiich, kstpkper, totim)
+                                                    swiich, kstpkper, totim,
+                                                    records)
 
         # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
         # ACCUMULATE THE FLOW BY ZONE
@@ -457,8 +548,7 @@ class ZoneBudget(object):
         for recname in reclist:
             imeth = self.imeth[recname]
 
-            data = self.cbc.get_data(text=recname, kstpkper=kstpkper,
-                                     totim=totim)
+            data = self._get_data(recname, kstpkper, totim, records)
             if len(data) == 0:
                 # Empty data, can occur during the first time step of a transient model when
                 # storage terms are zero and not in the cell-budget file.
@@ -472,12 +562,11 @@ class ZoneBudget(object):
                                   self.float_type)
                 qout = np.ma.zeros((self.nlay * self.nrow * self.ncol),
                                    self.float_type)
-                for [node, q] in zip(data['node'], data['q']):
-                    idx = node - 1
-                    if q > 0:
-                        qin.data[idx] += q
-                    elif q < 0:
-                        qout.data[idx] += q
+                q = data['q']
+                idx = np.where(q > 0)
+                np.add.at(qin.data, data['node'][idx] - 1, q[idx])
+                idx = np.where(q < 0)
+                np.add.at(qout.data, data['node'][idx] - 1, q[idx])
                 qin = np.ma.reshape(qin, (self.nlay, self.nrow, self.ncol))
                 qout = np.ma.reshape(qout, (self.nlay, self.nrow, self.ncol))
             elif imeth == 0 or imeth == 1:
@@ -490,8 +579,8 @@ class ZoneBudget(object):
                 # 1-LAYER ARRAY WITH LAYER INDICATOR ARRAY
                 rlay, rdata = data[0], data[1]
                 data = np.ma.zeros(self.cbc_shape, self.float_type)
-                for (r, c), l in np.ndenumerate(rlay):
-                    data[l - 1, r, c] = rdata[r, c]
+                r, c = np.indices(rlay.shape)
+                data[rlay - 1, r, c] = rdata
                 qin = np.ma.zeros(self.cbc_shape, self.float_type)
                 qout = np.ma.zeros(self.cbc_shape, self.float_type)
                 qin[data > 0] = data[data > 0]
@@ -612,7 +701,134 @@ class ZoneBudget(object):
         recordarray[colname][rowidx] += flux
         return recordarray
 
-    def _accumulate_flow_frf(self, recordarray, recname, ich, kstpkper, totim):
+    def _build_topology(self):
+        """
+        Precompute the cell faces between different zones and the zone-pair
+        bin of each face.  The topology only depends on the zone array, so
+        it is computed once and reused for every time step.
+
+        For each face direction ('frf', 'fff', 'flf') self._faces holds
+        the zero-based node numbers of the cells on either side of the
+        faces that separate different zones (ia, ib), where ib is the cell
+        to the right, front, or below ia, and the zone-pair bins for flow
+        from ia to ib and from ib to ia.
+        """
+        self._nzones = len(self.allzones)
+        self._izone_index = np.searchsorted(self.allzones,
+                                            self.izone.ravel())
+        nodes = np.arange(self.izone.size).reshape(self.cbc_shape)
+        faces = {'frf': (nodes[:, :, :-1], nodes[:, :, 1:]),
+                 'fff': (nodes[:, :-1, :], nodes[:, 1:, :]),
+                 'flf': (nodes[:-1, :, :], nodes[1:, :, :])}
+        self._faces = {}
+        for key, (ia, ib) in faces.items():
+            ia, ib = ia.ravel(), ib.ravel()
+            idx = np.where(self._izone_index[ia] != self._izone_index[ib])
+            ia, ib = ia[idx], ib[idx]
+            za, zb = self._izone_index[ia], self._izone_index[ib]
+            self._faces[key] = (ia, ib, za * self._nzones + zb,
+                                zb * self._nzones + za)
+        self._strides = {'frf': 1, 'fff': self.ncol,
+                         'flf': self.nrow * self.ncol}
+        self._ch_faces = OrderedDict()
+        return
+
+    def _get_ch_faces(self, ich):
+        """
+        Get the faces in each direction between a constant-head cell and a
+        cell that is not a constant-head cell.  The faces are cached for
+        each distinct set of constant-head cells.
+        """
+        ich = ich.ravel()
+        chnodes = np.where(ich == 1)[0]
+        key = chnodes.tostring()
+        if key in self._ch_faces:
+            return self._ch_faces[key]
+        lrc = np.unravel_index(chnodes, self.cbc_shape)
+        chfaces = {}
+        for axis, face in enumerate(['flf', 'fff', 'frf']):
+            stride = self._strides[face]
+            n = self.cbc_shape[axis]
+            # constant-head cell on the ib side and on the ia side of a face
+            ib = chnodes[lrc[axis] > 0]
+            ia = chnodes[lrc[axis] < n - 1]
+            ia = np.concatenate((ib - stride, ia))
+            ib = np.concatenate((ib, ia[ib.shape[0]:] + stride))
+            idx = np.where(ich[ia] != ich[ib])
+            ia, ib = ia[idx], ib[idx]
+            isort = np.argsort(ia, kind='mergesort')
+            chfaces[face] = (ia[isort], ib[isort])
+        if len(self._ch_faces) >= 4:
+            self._ch_faces.popitem(last=False)
+        self._ch_faces[key] = chfaces
+        return chfaces
+
+    def _accumulate_flow_faces(self, recordarray, recname, face, ich,
+                               kstpkper, totim, records=None):
+        """
+        Accumulate the flow between zones and to constant-head cells for
+        the face flow record recname in direction face ('frf', 'fff', or
+        'flf').  Positive face flows are from cell ia to cell ib.
+        """
+        ia, ib, bin_ab, bin_ba = self._faces[face]
+        chfaces = self._get_ch_faces(ich)
+        cha, chb = chfaces[face]
+        if ia.shape[0] == 0 and cha.shape[0] == 0:
+            return recordarray
+        data = self._get_data(recname, kstpkper, totim, records)[0]
+        data = np.asarray(data).ravel()
+        nbins = self._nzones * self._nzones
+        ich = ich.ravel()
+
+        # FLOW BETWEEN ZONES
+        # Don't include CH to CH flow (can occur if CHTOCH option is used)
+        q = data[ia]
+        keep = (ich[ia] != 1) | (ich[ib] != 1)
+        idx = np.where((q > 0) & keep)
+        fluxes = np.bincount(bin_ab[idx], weights=q[idx], minlength=nbins)
+        idx = np.where((q < 0) & keep)
+        fluxes -= np.bincount(bin_ba[idx], weights=q[idx], minlength=nbins)
+        fluxes = fluxes.reshape((self._nzones, self._nzones))
+        for ifz, itz in zip(*np.nonzero(fluxes)):
+            fz, tz = self.allzones[ifz], self.allzones[itz]
+            flux = fluxes[ifz, itz]
+            if tz != 0:
+                recordarray = self._update_record(recordarray,
+                                                  self._iflow_from_recnames[
+                                                      fz] + '_IN',
+                                                  self._zonefieldnamedict[tz],
+                                                  flux)
+            if fz != 0:
+                recordarray = self._update_record(recordarray,
+                                                  self._iflow_to_recnames[
+                                                      tz] + '_OUT',
+                                                  self._zonefieldnamedict[fz],
+                                                  flux)
+
+        # FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
+        q = data[cha]
+        zb = self._izone_index[chb]
+        idx = np.where(q > 0)
+        chout = np.bincount(zb[idx], weights=q[idx], minlength=self._nzones)
+        idx = np.where(q < 0)
+        chin = -np.bincount(zb[idx], weights=q[idx], minlength=self._nzones)
+        for iz, z in enumerate(self.allzones):
+            if z == 0:
+                continue
+            if chout[iz] != 0:
+                recordarray = self._update_record(recordarray,
+                                                  'CONSTANT_HEAD_OUT',
+                                                  self._zonefieldnamedict[z],
+                                                  chout[iz])
+            if chin[iz] != 0:
+                recordarray = self._update_record(recordarray,
+                                                  'CONSTANT_HEAD_IN',
+                                                  self._zonefieldnamedict[z],
+                                                  chin[iz])
+        return recordarray
+
+    def _accumulate_flow_frf(self, recordarray, recname, ich, kstpkper, totim,
+                             records=None):
         """
         C
         C-----"FLOW RIGHT FACE"  COMPUTE FLOW BETWEEN ZONES ACROSS COLUMNS.
@@ -683,196 +899,11 @@ class ZoneBudget(object):
         395   CONTINUE
               RETURN
         """
-        if self.ncol >= 2:
-            data = \
-            self.cbc.get_data(text=recname, kstpkper=kstpkper, totim=totim)[0]
-
-            # "FLOW RIGHT FACE"  COMPUTE FLOW BETWEEN ZONES ACROSS COLUMNS.
-            # COMPUTE FLOW ONLY BETWEEN A ZONE AND A HIGHER ZONE -- FLOW FROM
-            # ZONE 4 TO 3 IS THE NEGATIVE OF FLOW FROM 3 TO 4.
-            # 1ST, CALCULATE FLOW BETWEEN NODE J,I,K AND J-1,I,K
-
-            l, r, c = np.where(self.izone[:, :, 1:] > self.izone[:, :, :-1])
-
-            # Adjust column values to account for the starting position of "nz"
-            c = np.copy(c) + 1
-
-            # Define the zone from which flow is coming
-            cl = c - 1
-            nzl = self.izone[l, r, cl]
-
-            # Define the zone to which flow is going
-            nz = self.izone[l, r, c]
-
-            # Get the face flow
-            q = data[l, r, cl]
-
-            # Get indices where flow face values are positive (flow out of higher zone)
-            # Don't include CH to CH flow (can occur if CHTOCH option is used)
-            # Create an interable tuple of (from zone, to zone, flux)
-            # Then group tuple by (from_zone, to_zone) and sum the flux values
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[l, r, cl] != 1)))
-            fluxes = sum_flux_tuples(nzl[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-
-            # Get indices where flow face values are negative (flow into higher zone)
-            # Don't include CH to CH flow (can occur if CHTOCH option is used)
-            # Create an interable tuple of (from zone, to zone, flux)
-            # Then group tuple by (from_zone, to_zone) and sum the flux values
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[l, r, cl] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nzl[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-
-            # FLOW BETWEEN NODE J,I,K AND J+1,I,K
-            l, r, c = np.where(self.izone[:, :, :-1] > self.izone[:, :, 1:])
-
-            # Define the zone from which flow is coming
-            nz = self.izone[l, r, c]
-
-            # Define the zone to which flow is going
-            cr = c + 1
-            nzr = self.izone[l, r, cr]
-
-            # Get the face flow
-            q = data[l, r, c]
-
-            # Get indices where flow face values are positive (flow out of higher zone)
-            # Don't include CH to CH flow (can occur if CHTOCH option is used)
-            # Create an interable tuple of (from zone, to zone, flux)
-            # Then group tuple by (from_zone, to_zone) and sum the flux values
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[l, r, cr] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nzr[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-
-            # Get indices where flow face values are negative (flow into higher zone)
-            # Don't include CH to CH flow (can occur if CHTOCH option is used)
-            # Create an interable tuple of (from zone, to zone, flux)
-            # Then group tuple by (from_zone, to_zone) and sum the flux values
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[l, r, cr] != 1)))
-            fluxes = sum_flux_tuples(nzr[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-
-            # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-            l, r, c = np.where(ich == 1)
-            l, r, c = l[c > 0], r[c > 0], c[c > 0]
-            cl = c - 1
-            nzl = self.izone[l, r, cl]
-            nz = self.izone[l, r, c]
-            q = data[l, r, cl]
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[l, r, cl] != 1)))
-            fluxes = sum_flux_tuples(nzl[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_OUT',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[l, r, cl] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nzl[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_IN',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-            l, r, c = np.where(ich == 1)
-            l, r, c = l[c < self.ncol - 1], r[c < self.ncol - 1], c[
-                c < self.ncol - 1]
-            nz = self.izone[l, r, c]
-            cr = c + 1
-            nzr = self.izone[l, r, cr]
-            q = data[l, r, c]
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[l, r, cr] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nzr[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_OUT',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[l, r, cr] != 1)))
-            fluxes = sum_flux_tuples(nzr[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_IN',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-        return recordarray
+        return self._accumulate_flow_faces(recordarray, recname, 'frf', ich,
+                                           kstpkper, totim, records)
 
-    def _accumulate_flow_fff(self, recordarray, recname, ich, kstpkper, totim):
+    def _accumulate_flow_fff(self, recordarray, recname, ich, kstpkper, totim,
+                             records=None):
         """
         C
         C-----"FLOW FRONT FACE"
@@ -941,159 +972,11 @@ class ZoneBudget(object):
         495   CONTINUE
               RETURN
         """
-        if self.nrow >= 2:
-            data = \
-            self.cbc.get_data(text=recname, kstpkper=kstpkper, totim=totim)[0]
-
-            # "FLOW FRONT FACE"
-            # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I-1,K
-            l, r, c = np.where(self.izone[:, 1:, :] < self.izone[:, :-1, :])
-            r = np.copy(r) + 1
-            ra = r - 1
-            nza = self.izone[l, ra, c]
-            nz = self.izone[l, r, c]
-            q = data[l, ra, c]
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[l, ra, c] != 1)))
-            fluxes = sum_flux_tuples(nza[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[l, ra, c] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nza[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-
-            # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I+1,K.
-            l, r, c = np.where(self.izone[:, :-1, :] < self.izone[:, 1:, :])
-            nz = self.izone[l, r, c]
-            rb = r + 1
-            nzb = self.izone[l, rb, c]
-            q = data[l, r, c]
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[l, rb, c] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nzb[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[l, rb, c] != 1)))
-            fluxes = sum_flux_tuples(nzb[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-
-            # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-            l, r, c = np.where(ich == 1)
-            l, r, c = l[r > 0], r[r > 0], c[r > 0]
-            ra = r - 1
-            nza = self.izone[l, ra, c]
-            nz = self.izone[l, r, c]
-            q = data[l, ra, c]
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[l, ra, c] != 1)))
-            fluxes = sum_flux_tuples(nza[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_OUT',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[l, ra, c] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nza[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_IN',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-            l, r, c = np.where(ich == 1)
-            l, r, c = l[r < self.nrow - 1], r[r < self.nrow - 1], c[
-                r < self.nrow - 1]
-            nz = self.izone[l, r, c]
-            rb = r + 1
-            nzb = self.izone[l, rb, c]
-            q = data[l, r, c]
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[l, rb, c] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nzb[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_OUT',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[l, rb, c] != 1)))
-            fluxes = sum_flux_tuples(nzb[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if fz != 0:
-                    recordarray, self._update_record(recordarray,
-                                                     'CONSTANT_HEAD_IN',
-                                                     self._zonefieldnamedict[
-                                                         fz], flux)
-        return recordarray
+        return self._accumulate_flow_faces(recordarray, recname, 'fff', ich,
+                                           kstpkper, totim, records)
 
-    def _accumulate_flow_flf(self, recordarray, recname, ich, kstpkper, totim):
+    def _accumulate_flow_flf(self, recordarray, recname, ich, kstpkper, totim,
+                             records=None):
         """
         C
         C-----"FLOW LOWER FACE"
@@ -1162,176 +1045,29 @@ class ZoneBudget(object):
         595   CONTINUE
               RETURN
         """
-        if self.nlay >= 2:
-            data = \
-            self.cbc.get_data(text=recname, kstpkper=kstpkper, totim=totim)[0]
-
-            # "FLOW LOWER FACE"
-            # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I,K-1
-            l, r, c = np.where(self.izone[1:, :, :] < self.izone[:-1, :, :])
-            l = np.copy(l) + 1
-            la = l - 1
-            nza = self.izone[la, r, c]
-            nz = self.izone[l, r, c]
-            q = data[la, r, c]
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[la, r, c] != 1)))
-            fluxes = sum_flux_tuples(nza[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[la, r, c] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nza[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-
-            # CALCULATE FLOW BETWEEN NODE J,I,K AND J,I,K+1
-            l, r, c = np.where(self.izone[:-1, :, :] < self.izone[1:, :, :])
-            nz = self.izone[l, r, c]
-            lb = l + 1
-            nzb = self.izone[lb, r, c]
-            q = data[l, r, c]
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[lb, r, c] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nzb[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[lb, r, c] != 1)))
-            fluxes = sum_flux_tuples(nzb[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_from_recnames[
-                                                          fz] + '_IN',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      self._iflow_to_recnames[
-                                                          tz] + '_OUT',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-
-            # CALCULATE FLOW TO CONSTANT-HEAD CELLS IN THIS DIRECTION
-            l, r, c = np.where(ich == 1)
-            l, r, c = l[l > 0], r[l > 0], c[l > 0]
-            la = l - 1
-            nza = self.izone[la, r, c]
-            nz = self.izone[l, r, c]
-            q = data[la, r, c]
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[la, r, c] != 1)))
-            fluxes = sum_flux_tuples(nza[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_OUT',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[la, r, c] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nza[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_IN',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-            l, r, c = np.where(ich == 1)
-            l, r, c = l[l < self.nlay - 1], r[l < self.nlay - 1], c[
-                l < self.nlay - 1]
-            nz = self.izone[l, r, c]
-            lb = l + 1
-            nzb = self.izone[lb, r, c]
-            q = data[l, r, c]
-            idx = np.where(
-                (q > 0) & ((ich[l, r, c] != 1) | (ich[lb, r, c] != 1)))
-            fluxes = sum_flux_tuples(nz[idx],
-                                     nzb[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if tz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_OUT',
-                                                      self._zonefieldnamedict[
-                                                          tz], flux)
-            idx = np.where(
-                (q < 0) & ((ich[l, r, c] != 1) | (ich[lb, r, c] != 1)))
-            fluxes = sum_flux_tuples(nzb[idx],
-                                     nz[idx],
-                                     np.abs(q[idx]))
-            for (fz, tz, flux) in fluxes:
-                if fz != 0:
-                    recordarray = self._update_record(recordarray,
-                                                      'CONSTANT_HEAD_IN',
-                                                      self._zonefieldnamedict[
-                                                          fz], flux)
-        return recordarray
+        return self._accumulate_flow_faces(recordarray, recname, 'flf', ich,
+                                           kstpkper, totim, records)
 
     def _accumulate_flow_ssst(self, recordarray, recname, qin, qout):
 
         # NOT AN INTERNAL FLOW TERM, SO MUST BE A SOURCE TERM OR STORAGE
         # ACCUMULATE THE FLOW BY ZONE
-        for z in self.allzones:
+        qin = np.bincount(self._izone_index,
+                          weights=np.ma.filled(qin, 0.).ravel(),
+                          minlength=self._nzones)
+        qout = np.bincount(self._izone_index,
+                           weights=np.ma.filled(qout, 0.).ravel(),
+                           minlength=self._nzones)
+        for iz, z in enumerate(self.allzones):
             if z != 0:
-                flux = np.abs(qin[(self.izone == z)].sum())
-                if type(flux) == np.ma.core.MaskedConstant:
-                    flux = 0.
+                flux = np.abs(qin[iz])
                 recordarray = self._update_record(recordarray,
                                                   '_'.join(
                                                       recname.split()) + '_IN',
                                                   self._zonefieldnamedict[z],
                                                   flux)
 
-                flux = np.abs(qout[(self.izone == z)].sum())
-                if type(flux) == np.ma.core.MaskedConstant:
-                    flux = 0.
+                flux = np.abs(qout[iz])
                 recordarray = self._update_record(recordarray,
                                                   '_'.join(
                                                       recname.split()) + '_OUT',
@@ -1426,6 +1162,85 @@ class ZoneBudget(object):
         return newobj
 
 
+def _compute_budget_steps(args):
+    # Compute the budget record arrays for a list of (kstpkper, totim)
+    # steps.  Module level so that it can be used by a multiprocessing pool.
+    zb, steps = args
+    return [zb._compute_budget(kstpkper=kk, totim=t) for kk, t in steps]
+
+
+def get_zonebudgets(cbc_file, zones, kstpkper=None, totim=None, aliases=None,
+                    **kwargs):
+    """
+    Compute the budgets for several zone arrays in a single pass over a
+    cell-by-cell budget file.  The records for each time step are read once
+    and the budgets for all of the zone arrays are accumulated from them.
+
+    Parameters
+    ----------
+    cbc_file : str or CellBudgetFile object
+        The file name or CellBudgetFile object for which budgets will be
+        computed.
+    zones : list of ndarrays
+        The zone arrays to be used.
+    kstpkper : tuple of ints
+        A tuple containing the time step and stress period (kstp, kper).
+        The kstp and kper values are zero based.
+    totim : float
+        The simulation time.
+    aliases : dict or list of dicts
+        A dictionary of zone aliases used for all of the zone arrays, or a
+        list with a dictionary (or None) for each zone array.
+    **kwargs : keyword arguments passed to ZoneBudget (verbose, model, dis
+        and sr).
+
+    Returns
+    -------
+    zbs : list of ZoneBudget objects
+        The ZoneBudget object for each zone array, in the order of zones.
+
+    Example usage:
+
+    >>> from flopy.utils.zonbud import get_zonebudgets
+    >>> zbs = get_zonebudgets('zonebudtest.cbc', [zon1, zon2])
+    >>> zbs[1].to_csv('zonebudtest_zon2.csv')
+    """
+    if isinstance(aliases, (list, tuple)):
+        if len(aliases) != len(zones):
+            raise Exception('The number of aliases ({}) does not match the '
+                            'number of zone arrays ({}).'.format(len(aliases),
+                                                                 len(zones)))
+    else:
+        aliases = [aliases] * len(zones)
+
+    verbose = kwargs.get('verbose', False)
+    if not isinstance(cbc_file, CellBudgetFile):
+        if isinstance(cbc_file, str) and os.path.isfile(cbc_file):
+            cbc_file = CellBudgetFile(cbc_file, verbose=verbose)
+        else:
+            raise Exception(
+                'Cannot load cell budget file: {}.'.format(cbc_file))
+
+    zbs = []
+    for z, alias in zip(zones, aliases):
+        zb = ZoneBudget.__new__(ZoneBudget)
+        zb._setup(cbc_file, z, kstpkper=kstpkper, totim=totim,
+                  aliases=alias, **kwargs.copy())
+        zbs.append(zb)
+    if len(zbs) == 0:
+        return zbs
+
+    array_lists = [[] for zb in zbs]
+    for kk, t in zbs[0]._get_steps():
+        records = zbs[0]._read_records(kstpkper=kk, totim=t)
+        for zb, array_list in zip(zbs, array_lists):
+            array_list.append(zb._compute_budget(kstpkper=kk, totim=t,
+                                                 records=records))
+    for zb, array_list in zip(zbs, array_lists):
+        zb._budget = np.concatenate(array_list, axis=0)
+    return zbs
+
+
 def _numpyvoid2numeric(a):
     # The budget record array has multiple dtypes and a slice returns
     # the flexible-type numpy.void which must be converted to a numeric